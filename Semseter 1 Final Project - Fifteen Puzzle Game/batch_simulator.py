@@ -0,0 +1,238 @@
+'''
+Bryan Dumond
+CS 5001 - Fall 2021
+Final Project - 15 Sliding Puzzle Game (Batch Simulator)
+
+Steps many boards in lockstep with NumPy, for analytics and bot
+evaluation. B boards of N cells are held in one (B, N) array of tile
+numbers (0 = blank) with a vector of blank cells next to it, and every
+step is a handful of whole-array operations no matter how big B is.
+
+Needs NumPy, which the game itself does not.
+'''
+
+import numpy as np
+
+import puzzle_state, state_rank
+
+
+'''
+Constants -- All constants used by the batch simulator stored here
+'''
+
+NO_MOVE = -1  # Pass this as a board's move to leave it where it is
+
+MAX_RANK_CELLS = 20  # 20! is the largest factorial that fits in an int64
+
+
+'''
+Classes - The batch of boards
+'''
+
+class BatchSimulator:
+    '''
+    Class --- A batch of boards of the same size. Moves are given per
+        board as the cell of the tile to slide into the blank, the same
+        way PuzzleState names them. A move is legal under the same rule
+        Board.check_valid_switch() uses: the cell shares a row with the
+        blank and sits one column away, or shares a column and sits one
+        row away. Illegal moves leave their board untouched.
+    '''
+
+    def __init__(self, states, columns):
+        '''
+        Attributes -- takes in the boards (a (B, N) array or a sequence of
+            tuples of tile numbers, 0 = blank) and the number (int) of
+            columns on each square board
+        '''
+        self.columns = columns
+        self.number = columns * columns
+        self.tiles = np.array(states, dtype = np.uint8).reshape(-1, self.number)
+        self.size = self.tiles.shape[0]
+        self.blank = np.argmax(self.tiles == puzzle_state.BLANK, axis = 1)
+        self.rows = np.arange(self.size)
+
+        self.goal = np.array(puzzle_state.goal_tiles(self.number),
+                             dtype = np.uint8)
+
+        # distance[tile, cell] -- Manhattan distance, 0 for the blank
+        cells = np.arange(self.number)
+        goals = np.concatenate(([self.number - 1], cells[:-1]))
+        self.distance = (
+            np.abs(goals[:, None] // columns - cells[None, :] // columns) +
+            np.abs(goals[:, None] % columns - cells[None, :] % columns))
+        self.distance[puzzle_state.BLANK, :] = 0
+
+        # Padded neighbour table for drawing random legal moves
+        table = puzzle_state.neighbour_table(columns)
+        self.neighbour_count = np.array([len(cells) for cells in table])
+        self.neighbours = np.full((self.number, 4), NO_MOVE)
+        for cell in range(self.number):
+            self.neighbours[cell, :len(table[cell])] = table[cell]
+
+    def legal(self, moves):
+        '''
+        Method -- Checks a vector of moves against every board's blank
+          Parameters -- moves -- (B,) array of cells (NO_MOVE allowed)
+          Returns -- (B,) boolean array, True where the move can be made
+        '''
+        moves = np.asarray(moves)
+        row_gap = np.abs(moves // self.columns - self.blank // self.columns)
+        column_gap = np.abs(moves % self.columns - self.blank % self.columns)
+
+        same_row = (row_gap == 0) & (column_gap == 1)
+        same_column = (column_gap == 0) & (row_gap == 1)
+        return (moves >= 0) & (moves < self.number) & (same_row | same_column)
+
+    def move(self, moves):
+        '''
+        Method -- Applies one move to every board at once
+          Parameters -- moves -- (B,) array of cells (NO_MOVE allowed)
+          Returns -- (B,) boolean array of which boards actually moved
+        '''
+        moves = np.asarray(moves)
+        legal = self.legal(moves)
+
+        rows = self.rows[legal]
+        cells = moves[legal]
+        blanks = self.blank[legal]
+        self.tiles[rows, blanks] = self.tiles[rows, cells]
+        self.tiles[rows, cells] = puzzle_state.BLANK
+        self.blank[legal] = cells
+        return legal
+
+    def step(self, moves):
+        '''
+        Method -- Applies one move to every board and reports the result
+          Parameters -- moves -- (B,) array of cells (NO_MOVE allowed)
+          Returns -- three (B,) arrays: which boards moved, which are
+            solved, and each board's Manhattan distance
+        '''
+        legal = self.move(moves)
+        return legal, self.solved(), self.manhattan()
+
+    def solved(self):
+        '''
+        Method -- Returns a (B,) boolean array of the boards that are solved
+        '''
+        return np.all(self.tiles == self.goal, axis = 1)
+
+    def manhattan(self):
+        '''
+        Method -- Returns a (B,) int array with each board's Manhattan distance
+        '''
+        cells = np.arange(self.number)
+        return self.distance[self.tiles, cells].sum(axis = 1)
+
+    def random_moves(self, rng = None):
+        '''
+        Method -- Draws one legal move per board, uniformly among the
+            tiles next to its blank
+          Parameters -- rng -- optional numpy.random.Generator
+          Returns -- (B,) int array of cells
+        '''
+        if rng is None:
+            rng = np.random.default_rng()
+        counts = self.neighbour_count[self.blank]
+        choice = (rng.random(self.size) * counts).astype(int)
+        return self.neighbours[self.blank, choice]
+
+    def states(self):
+        '''
+        Method -- Returns every board as a list of tuples of tile numbers
+        '''
+        return [tuple(row) for row in self.tiles.tolist()]
+
+    def ranks(self):
+        '''
+        Method -- Returns a (B,) int64 array with each board's rank
+        '''
+        return rank_boards(self.tiles)
+
+
+'''
+General Functions - Ranking and drawing whole batches of boards
+'''
+
+def rank_boards(tiles):
+    '''
+    Function -- Ranks many boards at once, giving the same numbers as
+            state_rank.rank(). Each cell's Lehmer digit is counted for
+            every board in one comparison against the cells after it.
+        Parameters -- tiles -- a (B, N) array of boards, N at most
+                      MAX_RANK_CELLS
+        Returns -- a (B,) int64 array of ranks
+    '''
+    tiles = np.asarray(tiles).reshape(len(tiles), -1)
+    number = tiles.shape[1]
+    if number > MAX_RANK_CELLS:
+        raise ValueError(f"Batch ranks only go up to {MAX_RANK_CELLS} cells")
+    if not np.all(np.sort(tiles, axis = 1) == np.arange(number)):
+        raise ValueError(f"Every board must be a permutation of 0 to "
+                         f"{number - 1}")
+
+    ranks = np.zeros(tiles.shape[0], dtype = np.int64)
+    for cell in range(number - 1):
+        digits = (tiles[:, cell + 1:] < tiles[:, cell:cell + 1]).sum(axis = 1)
+        ranks += digits * state_rank.FACTORIALS[number - 1 - cell]
+    return ranks
+
+
+def unrank_boards(ranks, number):
+    '''
+    Function -- Rebuilds many boards from their ranks at once, the inverse
+            of rank_boards(). Each cell takes the digit-th value not used
+            yet, found for every board with one running count.
+        Parameters -- ranks -- a (B,) array of ranks, from 0 to number! - 1,
+                      number -- the number (int) of cells on each board
+        Returns -- a (B, number) uint8 array of boards
+    '''
+    if number > MAX_RANK_CELLS:
+        raise ValueError(f"Batch ranks only go up to {MAX_RANK_CELLS} cells")
+    ranks = np.array(ranks, dtype = np.int64)
+    if np.any(ranks < 0) or np.any(ranks >= state_rank.FACTORIALS[number]):
+        raise ValueError(f"Ranks must be from 0 to {number}! - 1")
+
+    rows = np.arange(ranks.shape[0])
+    unused = np.ones((ranks.shape[0], number), dtype = bool)
+    tiles = np.empty((ranks.shape[0], number), dtype = np.uint8)
+    for cell in range(number):
+        place = state_rank.FACTORIALS[number - 1 - cell]
+        digits, ranks = np.divmod(ranks, place)
+        # The value whose count of unused values so far is digit + 1
+        found = unused & (np.cumsum(unused, axis = 1) == digits[:, None] + 1)
+        values = np.argmax(found, axis = 1)
+        tiles[:, cell] = values
+        unused[rows, values] = False
+    return tiles
+
+
+def random_solvable_boards(count, columns, rng = None):
+    '''
+    Function -- Draws many boards uniformly from every solvable board of
+            their size, the same way state_rank.random_solvable() does:
+            random ranks are unranked, and boards state_rank.is_solvable()
+            turns down, checked row by row, have two tiles away from the
+            blank swapped.
+        Parameters -- count -- how many boards (int) to draw,
+                      columns -- the number (int) of columns on each board,
+                      rng -- optional numpy.random.Generator
+        Returns -- a (count, columns * columns) uint8 array of boards
+    '''
+    if rng is None:
+        rng = np.random.default_rng()
+    number = columns * columns
+    tiles = unrank_boards(
+        rng.integers(0, state_rank.FACTORIALS[number], count), number)
+
+    wrong = np.array([index for index in range(count)
+                      if not state_rank.is_solvable(tiles[index], columns)],
+                     dtype = np.int64)
+    blank = np.argmax(tiles == puzzle_state.BLANK, axis = 1)
+
+    first = np.where(blank[wrong] > 1, 0, 2)
+    second = first + 1
+    swapped = tiles[wrong, first]
+    tiles[wrong, first] = tiles[wrong, second]
+    tiles[wrong, second] = swapped
+    return tiles
@@ -0,0 +1,231 @@
+'''
+Bryan Dumond
+CS 5001 - Fall 2021
+Final Project - 15 Sliding Puzzle Game (Batch Solver)
+
+Solves a whole file of boards offline across every core. Boards are read
+one per line as tile numbers separated by spaces or commas, 0 for the
+blank ("#" starts a comment). Results are streamed as JSON lines in input
+order, so the output file doubles as a checkpoint: a crashed run started
+again with --resume skips every board that already has a result.
+
+    python puzzle_game.py solve boards.txt -o results.jsonl --timeout 30
+'''
+
+import argparse, json, math, multiprocessing, os, sys
+
+import puzzle_solver
+
+
+'''
+Constants -- All constants used by the batch solver stored here
+'''
+
+DEFAULT_TIMEOUT = 60.0  # seconds per board
+
+_worker_settings = None  # (heuristic name, timeout, include moves)
+_worker_heuristics = {}  # columns -> heuristic, one set per worker process
+
+
+'''
+General Functions - Reading boards, solving them in workers, writing results
+'''
+
+def parse_board(line):
+    '''
+    Function -- Reads one board from a line of text
+        Parameters -- line (str) of tile numbers, 0 for the blank
+        Returns -- the board (tuple of ints), or None for a blank or
+            comment line. Raises ValueError if the line is not a square
+            board holding each tile exactly once.
+    '''
+    text = line.split("#")[0].replace(",", " ").strip()
+    if text == "":
+        return None
+
+    state = tuple(int(number) for number in text.split())
+    columns = math.isqrt(len(state))
+    if columns * columns != len(state) or sorted(state) != list(range(len(state))):
+        raise ValueError(f"'{line.strip()}' is not a square board")
+    return state
+
+
+def read_boards(address):
+    '''
+    Function -- Reads every board in a file. Lines that cannot be parsed
+            are kept as their error text so they still get a result line.
+        Parameters -- address (str) of the board file
+        Returns -- a list (list) of boards (tuple) or error messages (str)
+    '''
+    boards = []
+    with open(address, mode = "r") as board_file:
+        for line in board_file:
+            try:
+                state = parse_board(line)
+            except ValueError as error:
+                boards.append(str(error))
+                continue
+            if state is not None:
+                boards.append(state)
+    return boards
+
+
+def init_worker(heuristic_name, timeout, include_moves):
+    '''
+    Function -- Process pool initializer: remembers the run settings in
+            each worker so they are not pickled with every board
+        Parameters -- heuristic_name (str), timeout (float seconds) and
+                      include_moves (bool)
+    '''
+    global _worker_settings
+    _worker_settings = (heuristic_name, timeout, include_moves)
+
+
+def solve_one(task):
+    '''
+    Function -- Solves a single board inside a worker process. Each
+            worker loads its heuristic once per board size and reuses it.
+        Parameters -- task -- a tuple of the board's input position (int)
+            and the board (tuple) or parse error (str)
+        Returns -- a result dictionary (dict) ready to be written as JSON
+    '''
+    index, state = task
+    heuristic_name, timeout, include_moves = _worker_settings
+    result = {"index": index, "length": None, "nodes": 0, "time": 0.0}
+
+    if isinstance(state, str):
+        result["status"] = "invalid"
+        result["error"] = state
+        return result
+
+    result["state"] = list(state)
+    columns = math.isqrt(len(state))
+    if not puzzle_solver.is_solvable(state, columns):
+        result["status"] = "unsolvable"
+        return result
+
+    if columns not in _worker_heuristics:
+        _worker_heuristics[columns] = puzzle_solver.make_heuristic(
+            heuristic_name, columns)
+
+    solution = puzzle_solver.ida_star(state, columns,
+                                      _worker_heuristics[columns],
+                                      time_limit = timeout)
+    result["nodes"] = solution.nodes
+    result["time"] = round(solution.elapsed, 4)
+    if solution.moves is None:
+        result["status"] = "timeout"
+    else:
+        result["status"] = "solved"
+        result["length"] = len(solution.moves)
+        if include_moves:
+            result["moves"] = solution.moves
+    return result
+
+
+def completed_count(address):
+    '''
+    Function -- Counts the results already written by an earlier run and
+            cuts off a half-written last line if the run crashed mid-write
+        Parameters -- address (str) of the results file
+        Returns -- number (int) of boards that can be skipped
+    '''
+    if not os.path.exists(address):
+        return 0
+
+    count = 0
+    good_bytes = 0
+    with open(address, mode = "rb") as results_file:
+        for line in results_file:
+            try:
+                json.loads(line)
+            except ValueError:
+                break
+            if not line.endswith(b"\n"):
+                break
+            count += 1
+            good_bytes += len(line)
+
+    with open(address, mode = "r+b") as results_file:
+        results_file.truncate(good_bytes)
+    return count
+
+
+def solve_corpus(boards, output, workers = None, timeout = DEFAULT_TIMEOUT,
+                 heuristic_name = puzzle_solver.PATTERN_DATABASE,
+                 include_moves = False, skip = 0):
+    '''
+    Function -- Solves boards across a process pool and writes one JSON
+            line per board, in input order, as soon as each is ready
+        Parameters -- boards (list) from read_boards(), output (an open
+                      text file), workers (int, default every core),
+                      timeout (float seconds per board), heuristic_name
+                      (str), include_moves (bool) and skip (int) boards
+                      already done by an earlier run
+        Returns -- number (int) of boards solved in this run
+    '''
+    tasks = [(index, boards[index]) for index in range(skip, len(boards))]
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    solved = 0
+    with multiprocessing.Pool(workers, initializer = init_worker,
+                              initargs = (heuristic_name, timeout,
+                                          include_moves)) as pool:
+        # imap keeps input order while later boards are already solving
+        for result in pool.imap(solve_one, tasks, chunksize = 1):
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+            if result["status"] == "solved":
+                solved += 1
+    return solved
+
+
+def main(argv = None):
+    '''
+    Function -- Command-line entry point of the batch solver
+        Parameters -- argv -- list (list) of argument strings, defaults
+            to the ones the program was started with
+    '''
+    parser = argparse.ArgumentParser(
+        prog = "puzzle_game.py solve",
+        description = "Solve a file of boards optimally across all cores.")
+    parser.add_argument("boards", help = "file with one board per line")
+    parser.add_argument("-o", "--output",
+                        help = "JSON lines results file (default stdout)")
+    parser.add_argument("-w", "--workers", type = int,
+                        help = "worker processes (default: every core)")
+    parser.add_argument("-t", "--timeout", type = float,
+                        default = DEFAULT_TIMEOUT,
+                        help = "seconds allowed per board")
+    parser.add_argument("--heuristic", default = puzzle_solver.PATTERN_DATABASE,
+                        choices = (puzzle_solver.LINEAR_CONFLICT,
+                                   puzzle_solver.PATTERN_DATABASE))
+    parser.add_argument("--moves", action = "store_true",
+                        help = "include the solution moves in each result")
+    parser.add_argument("--resume", action = "store_true",
+                        help = "keep results already in the output file")
+    args = parser.parse_args(argv)
+
+    boards = read_boards(args.boards)
+
+    if args.output is None:
+        output = sys.stdout
+        skip = 0
+    else:
+        skip = completed_count(args.output) if args.resume else 0
+        output = open(args.output, mode = "a" if args.resume else "w")
+
+    try:
+        solved = solve_corpus(boards, output, args.workers, args.timeout,
+                              args.heuristic, args.moves, skip)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(f"Solved {solved} of {len(boards) - skip} boards "
+          f"({skip} done by an earlier run)", file = sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+'''
+Bryan Dumond
+CS 5001 - Fall 2021
+Final Project - 15 Sliding Puzzle Game (Exact Distance Tables)
+
+For boards up to 3x3 every solvable arrangement fits in memory (12 for
+2x2, 181,440 for 3x3), so one breadth-first search back from the solved
+board records how many moves each one needs. The table holds one byte
+per permutation rank (see state_rank.py) and is written to disk once.
+With it, the fewest moves for a board, the best next move and a whole
+shortest solution are lookups instead of searches.
+
+Run this file directly to build the tables ahead of time.
+'''
+
+import os, time
+from collections import deque
+
+import puzzle_state, state_rank
+from pattern_database import DATABASE_DIR, UNSEEN, load_table
+
+
+'''
+Constants -- All constants used by the distance tables stored here
+'''
+
+MAX_COLUMNS = 3  # A 4x4 table would need 16! entries
+
+
+'''
+Classes - A distance table, usable as a perfect solver heuristic
+'''
+
+class ExactDistanceHeuristic:
+    '''
+    Class --- The exact number of moves every board of one size needs.
+        It also works as a heuristic for puzzle_solver.ida_star(): being
+        exact, IDA* walks straight down a shortest path and never has to
+        search.
+    '''
+
+    def __init__(self, columns, directory = DATABASE_DIR, build = True):
+        '''
+        Attributes -- takes in the number (int) of columns (at most
+            MAX_COLUMNS), the directory holding the tables and whether a
+            missing table may be built (bool). Raises FileNotFoundError if
+            the table is missing and build is False.
+        '''
+        if columns > MAX_COLUMNS:
+            raise ValueError(f"Exact tables only go up to "
+                             f"{MAX_COLUMNS}x{MAX_COLUMNS} boards")
+        self.columns = columns
+        self.neighbours = puzzle_state.neighbour_table(columns)
+
+        path = table_path(columns, directory)
+        if not os.path.exists(path):
+            if build == False:
+                raise FileNotFoundError(path)
+            build_table(columns, path)
+        self.table = load_table(path)
+
+    def distance(self, tiles):
+        '''
+        Method -- Returns the fewest moves (int) that solve a board, or
+            UNSEEN if it cannot be solved
+          Parameters -- tiles -- the board (sequence of tile numbers)
+        '''
+        return self.table[state_rank.rank(tiles)]
+
+    def estimate(self, tiles):
+        '''
+        Method -- Heuristic estimate for ida_star(): the exact distance
+        '''
+        return self.table[state_rank.rank(tiles)]
+
+    def delta(self, tiles, tile, source, target):
+        '''
+        Method -- Change in the estimate after tile slid from source to
+            target; tiles is the board after the move
+        '''
+        after = self.table[state_rank.rank(tiles)]
+        tiles[source] = tile
+        tiles[target] = puzzle_state.BLANK
+        before = self.table[state_rank.rank(tiles)]
+        tiles[target] = tile
+        tiles[source] = puzzle_state.BLANK
+        return after - before
+
+    def best_move(self, tiles):
+        '''
+        Method -- Finds a move that brings a board one step closer to solved
+          Parameters -- tiles -- the board (sequence of tile numbers)
+          Returns -- the cell (int) of the tile to slide, or None if the
+            board is already solved or cannot be solved
+        '''
+        tiles = list(tiles)
+        distance = self.table[state_rank.rank(tiles)]
+        if distance == 0 or distance == UNSEEN:
+            return None
+
+        blank = tiles.index(puzzle_state.BLANK)
+        for cell in self.neighbours[blank]:
+            tiles[blank] = tiles[cell]
+            tiles[cell] = puzzle_state.BLANK
+            closer = self.table[state_rank.rank(tiles)] == distance - 1
+            tiles[cell] = tiles[blank]
+            tiles[blank] = puzzle_state.BLANK
+            if closer:
+                return cell
+        return None
+
+    def solution(self, tiles):
+        '''
+        Method -- Follows best_move() down to the solved board
+          Parameters -- tiles -- the board (sequence of tile numbers)
+          Returns -- a shortest solution (list of cells), or None if the
+            board cannot be solved
+        '''
+        if self.distance(tiles) == UNSEEN:
+            return None
+
+        board = puzzle_state.PuzzleState(tiles, self.columns)
+        moves = []
+        cell = self.best_move(board.tiles)
+        while cell is not None:
+            board.move(cell)
+            moves.append(cell)
+            cell = self.best_move(board.tiles)
+        return moves
+
+
+'''
+General Functions - Building and finding the tables
+'''
+
+def table_path(columns, directory = DATABASE_DIR):
+    '''
+    Function -- Builds the file name a board size's table is stored under
+        Parameters -- columns (int) and the directory (str) tables live in
+        Returns -- a file path (str)
+    '''
+    return os.path.join(directory, f"exact_{columns}x{columns}.bin")
+
+
+def build_table(columns, path):
+    '''
+    Function -- Runs a breadth-first search back from the solved board
+            over every arrangement that can reach it, storing each one's
+            distance at its rank. Arrangements of the wrong parity are
+            never reached and keep UNSEEN.
+        Parameters -- columns (int) and the path (str) the finished table
+                      is written to
+        Returns -- the finished table (bytearray)
+    '''
+    start_time = time.perf_counter()
+
+    number = columns * columns
+    neighbours = puzzle_state.neighbour_table(columns)
+    rank = state_rank.rank
+
+    table = bytearray([UNSEEN]) * state_rank.FACTORIALS[number]
+    goal = puzzle_state.goal_tiles(number)
+    table[rank(goal)] = 0
+
+    queue = deque([(goal, number - 1)])
+    while queue:
+        tiles, blank = queue.popleft()
+        distance = table[rank(tiles)] + 1
+        for cell in neighbours[blank]:
+            child = list(tiles)
+            child[blank] = child[cell]
+            child[cell] = puzzle_state.BLANK
+            index = rank(child)
+            if table[index] == UNSEEN:
+                table[index] = distance
+                queue.append((child, cell))
+
+    directory = os.path.dirname(path)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+    with open(path + ".tmp", mode = "wb") as table_file:
+        table_file.write(table)
+    os.replace(path + ".tmp", path)
+
+    print(f"Built {path} in {time.perf_counter() - start_time:.1f}s")
+    return table
+
+
+if __name__ == "__main__":
+    for columns in range(2, MAX_COLUMNS + 1):
+        ExactDistanceHeuristic(columns)
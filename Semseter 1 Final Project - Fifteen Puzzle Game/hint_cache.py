@@ -0,0 +1,130 @@
+'''
+Bryan Dumond
+CS 5001 - Fall 2021
+Final Project - 15 Sliding Puzzle Game (Hint Cache)
+
+Remembers the best next move for boards the solver has already seen. A
+solution of n moves gives the answer for every board along it, not just
+the first: the board after the first move is n - 1 moves from solved and
+its best move is the second one, and so on. All of them are stored, so
+asking for hint after hint down a solution never runs the solver again.
+
+Answers are kept in an SQLite file ("hints.db") keyed by the board's
+bytes, one byte per cell, with a small least recently used table in
+memory in front of it.
+'''
+
+import sqlite3
+from collections import OrderedDict
+
+import puzzle_state
+
+
+'''
+Constants -- All constants used by the hint cache stored here
+'''
+
+HINT_DATABASE = "hints.db"
+
+MEMORY_ENTRIES = 4096  # boards kept in memory in front of the file
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hints (
+    state BLOB PRIMARY KEY,
+    distance INTEGER NOT NULL,
+    move INTEGER
+) WITHOUT ROWID;
+"""
+
+
+'''
+Classes - The cache
+'''
+
+class HintCache:
+    '''
+    Class --- Best next moves by board. An entry is the number of moves
+        left to solve the board and the cell of the tile to move next
+        (None for a solved board).
+    '''
+
+    def __init__(self, address = HINT_DATABASE, memory_entries = MEMORY_ENTRIES):
+        '''
+        Attributes -- takes in the path (str) of the hint database and how
+            many entries (int) to keep in memory
+        '''
+        self.connection = sqlite3.connect(address)
+        self.connection.executescript(SCHEMA)
+        self.memory_entries = memory_entries
+        self.recent = OrderedDict()  # board bytes -> (distance, move)
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def lookup(self, state):
+        '''
+        Method -- Finds the stored answer for a board
+          Parameters -- state -- the board (tuple of tile numbers, 0 = blank)
+          Returns -- a tuple of the moves left (int) and the next move's
+            cell (int, None once solved), or None if it is not stored
+        '''
+        key = bytes(state)
+        if key in self.recent:
+            self.recent.move_to_end(key)
+            self.memory_hits += 1
+            return self.recent[key]
+
+        row = self.connection.execute(
+            "SELECT distance, move FROM hints WHERE state = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.disk_hits += 1
+        self.remember(key, row[0], row[1])
+        return row[0], row[1]
+
+    def store_solution(self, state, columns, moves):
+        '''
+        Method -- Stores the answer for every board along an optimal
+            solution, in one transaction
+          Parameters -- state -- the start board (tuple), columns (int),
+                        moves -- the solution (list of cells) from the solver
+        '''
+        board = puzzle_state.PuzzleState(state, columns)
+        rows = []
+        for step in range(len(moves) + 1):
+            move = moves[step] if step < len(moves) else None
+            key = board.key()
+            rows.append((key, len(moves) - step, move))
+            self.remember(key, len(moves) - step, move)
+            if move is not None:
+                board.move(move)
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO hints (state, distance, move) "
+                "VALUES (?, ?, ?)", rows)
+
+    def remember(self, key, distance, move):
+        '''
+        Method -- Puts an entry in the in-memory table, dropping the least
+            recently used one once the table is full
+        '''
+        self.recent[key] = (distance, move)
+        self.recent.move_to_end(key)
+        if len(self.recent) > self.memory_entries:
+            self.recent.popitem(last = False)
+
+    def close(self):
+        '''
+        Method -- Closes the database connection
+        '''
+        self.connection.close()
+
+    def __str__(self):
+        '''
+        Method -- Returns a one-line summary (str) of the cache's use
+        '''
+        return (f"Hints: {self.memory_hits} from memory, {self.disk_hits} "
+                f"from disk, {self.misses} solved")
@@ -0,0 +1,152 @@
+'''
+Bryan Dumond
+CS 5001 - Fall 2021
+Final Project - 15 Sliding Puzzle Game (Image Registry)
+
+Every GIF the game shows goes through one registry, so each is decoded by
+screen.addshape() once and reused on every later board load or message.
+Turtle keeps registered shapes for the life of the screen, clearscreen()
+included, so the registry does the same until the decoded images pass a
+byte budget. Past it, the least recently used images that are not on
+screen are dropped.
+'''
+
+
+'''
+Constants -- All constants used by the image registry stored here
+'''
+
+DEFAULT_BUDGET = 8 * 1024 * 1024  # bytes of decoded images kept
+
+BYTES_PER_PIXEL = 4  # Tk holds decoded images as 32-bit pixels
+
+GIF_HEADER_SIZE = 10  # "GIF89a", then width and height, 2 bytes each
+
+
+'''
+Classes - The registry
+'''
+
+class ImageRegistry:
+    '''
+    Class --- The GIF shapes registered with a turtle Screen, kept in least
+        to most recently used order. Images are pinned while a turtle
+        shows them and only unpinned images can be evicted.
+    '''
+
+    def __init__(self, screen, budget = DEFAULT_BUDGET):
+        '''
+        Attributes -- takes in the turtle Screen to register shapes on and
+            the budget (int) of decoded bytes to keep
+        '''
+        self.screen = screen
+        self.budget = budget
+        self.sizes = {}  # address -> decoded bytes, oldest use first
+        self.pins = {}  # address -> number of turtles showing it
+        self.total = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def acquire(self, address):
+        '''
+        Method -- Makes sure a GIF is registered as a shape and pins it
+            until release() is called for it
+          Parameters -- address (str) of the GIF file
+          Returns -- the shape name (str) to give turtle.shape()
+        '''
+        if address in self.sizes:
+            self.hits += 1
+            # Re-inserting moves it to the most recently used end
+            self.sizes[address] = self.sizes.pop(address)
+        else:
+            self.misses += 1
+            self.screen.addshape(address)
+            self.sizes[address] = decoded_size(address)
+            self.total += self.sizes[address]
+
+        self.pins[address] = self.pins.get(address, 0) + 1
+        self.evict()
+        return address
+
+    def release(self, address):
+        '''
+        Method -- Unpins a GIF once a turtle stops showing it
+          Parameters -- address (str) of the GIF file
+        '''
+        if self.pins.get(address, 0) > 1:
+            self.pins[address] -= 1
+        else:
+            self.pins.pop(address, None)
+        self.evict()
+
+    def release_all(self):
+        '''
+        Method -- Unpins every GIF, for when the screen has been cleared
+            and no turtle is left to show them
+        '''
+        self.pins.clear()
+        self.evict()
+
+    def evict(self):
+        '''
+        Method -- Drops least recently used, unpinned shapes until the
+            registry is back under its budget
+        '''
+        if self.total <= self.budget:
+            return
+
+        for address in list(self.sizes):
+            if self.total <= self.budget:
+                break
+            if address in self.pins:
+                continue
+            self.total -= self.sizes.pop(address)
+            self.evictions += 1
+            forget_shape(self.screen, address)
+
+    def __str__(self):
+        '''
+        Method -- Returns a one-line summary (str) of the registry's use
+        '''
+        return (f"Images: {len(self.sizes)} cached ({self.total} bytes) | "
+                f"{self.hits} hits, {self.misses} misses, "
+                f"{self.evictions} evictions")
+
+
+'''
+General Functions - Sizing an image without decoding it, dropping a shape
+'''
+
+def decoded_size(address):
+    '''
+    Function -- Works out how many bytes a GIF takes once decoded from the
+            width and height in its header
+        Parameters -- address (str) of the GIF file
+        Returns -- size (int) in bytes, 0 if the header cannot be read
+    '''
+    try:
+        with open(address, mode = "rb") as image_file:
+            header = image_file.read(GIF_HEADER_SIZE)
+    except OSError:
+        return 0
+
+    if len(header) < GIF_HEADER_SIZE:
+        return 0
+    width = int.from_bytes(header[6:8], "little")
+    height = int.from_bytes(header[8:10], "little")
+    return width * height * BYTES_PER_PIXEL
+
+
+def forget_shape(screen, address):
+    '''
+    Function -- Lets turtle free a registered shape's decoded image.
+            Turtle has no public call for this, so the screen's shape
+            table is reached with getattr(); on a turtle without one the
+            shape just stays registered. That is harmless either way, as
+            addshape() replaces a shape registered under the same name.
+        Parameters -- screen (turtle Screen) and address (str) of the GIF
+    '''
+    shapes = getattr(screen, "_shapes", None)
+    if isinstance(shapes, dict):
+        shapes.pop(address, None)
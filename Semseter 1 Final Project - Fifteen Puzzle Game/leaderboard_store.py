@@ -0,0 +1,249 @@
+'''
+Bryan Dumond
+CS 5001 - Fall 2021
+Final Project - 15 Sliding Puzzle Game (Leaderboard Store)
+
+Keeps the leaderboard in an SQLite database instead of a text file. Every
+score records the player, the puzzle, the move limit and when it was
+played, and the table is indexed so the best K scores, overall, for one
+puzzle or for one puzzle and move limit, are read straight off an index instead of sorting
+every entry ever written. An old "leaderboard.txt" is imported the first
+time the database is opened, and can also be streamed for its top K
+entries in constant memory until it is migrated.
+'''
+
+import heapq, os, sqlite3
+from datetime import datetime
+
+
+'''
+Constants -- All constants used by the leaderboard store stored here
+'''
+
+DATABASE_FILE = "leaderboard.db"
+
+LEGACY_FILE = "leaderboard.txt"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    score INTEGER NOT NULL,
+    player TEXT NOT NULL,
+    puzzle TEXT,
+    move_limit INTEGER,
+    played_at TEXT
+);
+CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score, id);
+CREATE INDEX IF NOT EXISTS scores_by_puzzle
+    ON scores (puzzle, move_limit, score, id);
+CREATE INDEX IF NOT EXISTS scores_by_puzzle_any_limit
+    ON scores (puzzle, score, id);
+CREATE TABLE IF NOT EXISTS settings (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+'''
+Classes - The store itself
+'''
+
+class LeaderboardStore:
+    '''
+    Class --- An open leaderboard database. Scores come back in the same
+        [score, player] lists the text leaderboard used, lowest score
+        first, ties in the order they were recorded.
+    '''
+
+    def __init__(self, address = DATABASE_FILE, legacy_address = LEGACY_FILE):
+        '''
+        Attributes -- takes in the database file path and the path of an
+            old text leaderboard to import (str, may not exist). The
+            import only ever happens once per database.
+        '''
+        self.address = address
+        self.connection = sqlite3.connect(address)
+        self.connection.executescript(SCHEMA)
+
+        if self.get_setting("legacy_imported") is None:
+            if legacy_address is not None and os.path.exists(legacy_address):
+                self.import_legacy(legacy_address)
+            self.set_setting("legacy_imported", str(datetime.now()))
+
+    def get_setting(self, name):
+        '''
+        Method -- Returns a stored setting (str), or None if it is not set
+        '''
+        row = self.connection.execute(
+            "SELECT value FROM settings WHERE name = ?", (name,)).fetchone()
+        return None if row is None else row[0]
+
+    def set_setting(self, name, value):
+        '''
+        Method -- Stores a setting (str) under name (str)
+        '''
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO settings (name, value) VALUES (?, ?)",
+                (name, value))
+
+    def add_score(self, player, score, puzzle = None, move_limit = None,
+                  played_at = None):
+        '''
+        Method -- Records one winning score
+          Parameters -- player (str), score (int), puzzle name (str),
+            move_limit (int) and played_at (datetime, default now)
+        '''
+        if played_at is None:
+            played_at = datetime.now()
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO scores (score, player, puzzle, move_limit, "
+                "played_at) VALUES (?, ?, ?, ?, ?)",
+                (score, player, puzzle, move_limit, str(played_at)))
+
+    def top_scores(self, k, puzzle = None, move_limit = None):
+        '''
+        Method -- Reads the best k scores, overall or filtered by puzzle
+            and/or move limit. A filter left as None matches any value, so
+            puzzle alone gives that puzzle's best at every move limit. The
+            queries walk an index from its lowest score and stop after k
+            rows.
+          Parameters -- k (int), puzzle name (str or None) and move_limit
+            (int or None); leave both as None for the overall board
+          Returns -- a nested list of [score (int), player (str)]
+        '''
+        filters = []
+        values = []
+        if puzzle is not None:
+            filters.append("puzzle = ?")
+            values.append(puzzle)
+        if move_limit is not None:
+            filters.append("move_limit = ?")
+            values.append(move_limit)
+
+        query = "SELECT score, player FROM scores "
+        if filters:
+            query += "WHERE " + " AND ".join(filters) + " "
+        rows = self.connection.execute(query + "ORDER BY score, id LIMIT ?",
+                                       values + [k])
+        return [[score, player] for score, player in rows]
+
+    def best_score(self, puzzle = None, move_limit = None):
+        '''
+        Method -- Returns the lowest score (int) recorded, filtered as for
+            top_scores(), or None if there are none
+        '''
+        best = self.top_scores(1, puzzle, move_limit)
+        return best[0][0] if best else None
+
+    def count(self):
+        '''
+        Method -- Returns the number (int) of scores in the store
+        '''
+        return self.connection.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def import_legacy(self, legacy_address):
+        '''
+        Method -- Copies every "score : name" line of an old text
+            leaderboard into the store in a single transaction. Those
+            entries have no puzzle, move limit or date.
+          Parameters -- legacy_address (str) of the text leaderboard
+          Returns -- number (int) of entries imported
+        '''
+        def entries(leaderboard_file):
+            for entry in leaderboard_file:
+                parsed = parse_legacy_entry(entry)
+                if parsed is not None:
+                    yield parsed[0], parsed[1]
+
+        before = self.count()
+        with open(legacy_address, 'r') as leaderboard_file:
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT INTO scores (score, player) VALUES (?, ?)",
+                    entries(leaderboard_file))
+        imported = self.count() - before
+        print(f"Imported {imported} scores from {legacy_address}")
+        return imported
+
+    def close(self):
+        '''
+        Method -- Closes the database connection
+        '''
+        self.connection.close()
+
+
+'''
+General Functions - Legacy text leaderboards and placements
+'''
+
+def parse_legacy_entry(entry):
+    '''
+    Function -- Reads one "score : name" line of a text leaderboard
+        Parameters -- entry (str) line from the file
+        Returns -- a [score (int), player (str)] list, or None if the line
+            is corrupt (wrong shape or a score that is not a number)
+    '''
+    parts = entry.split(' : ')
+    if len(parts) != 2:
+        return None
+    try:
+        score = int(parts[0])
+    except ValueError:
+        return None
+    return [score, parts[1].strip("\n")]
+
+
+def read_legacy_top_k(legacy_address, k):
+    '''
+    Function -- Streams a text leaderboard line by line and keeps only the
+            best k entries, so memory stays O(k) however long the file
+            grows. Ties keep file order, as a stable sort would. A heap
+            holds the current top k with its worst entry on top, so each
+            line costs at most one O(log k) replacement.
+        Parameters -- legacy_address (str) of the file, k (int) entries
+        Returns -- a tuple of the best entries (nested list of [score,
+            player], lowest score first) and the number (int) of corrupt
+            lines that were skipped. Raises FileNotFoundError if the file
+            is missing.
+    '''
+    # Heap keys are negated so the worst (highest score, latest line) is first
+    heap = []
+    corrupt = 0
+    with open(legacy_address, 'r') as leaderboard_file:
+        line_number = 0
+        for entry in leaderboard_file:
+            line_number += 1
+            parsed = parse_legacy_entry(entry)
+            if parsed is None:
+                if entry.strip() != "":
+                    corrupt += 1
+                continue
+
+            key = (-parsed[0], -line_number, parsed[1])
+            if len(heap) < k:
+                heapq.heappush(heap, key)
+            elif key > heap[0]:
+                heapq.heapreplace(heap, key)
+
+    heap.sort(reverse = True)
+    return [[-score, player] for score, line, player in heap], corrupt
+
+
+def leaderboard_placements(sorted_lb):
+    '''
+    Function -- Numbers the places on a sorted leaderboard. Equal scores
+            share a place and the next score takes the following number.
+        Parameters -- sorted_lb -- nested list of [score, player], lowest first
+        Returns -- a list (list) of placements (int), one per entry
+        Ex: [[3, "Sean"], [3, "Ana"], [7, "Nancy"]] --> [1, 1, 2]
+    '''
+    placements = []
+    placement = 0
+    for i in range(len(sorted_lb)):
+        if i == 0 or sorted_lb[i-1][0] != sorted_lb[i][0]:
+            placement += 1
+        placements.append(placement)
+    return placements
@@ -0,0 +1,242 @@
+'''
+Bryan Dumond
+CS 5001 - Fall 2021
+Final Project - 15 Sliding Puzzle Game (Parallel Solver)
+
+Spreads a single IDA* search over several processes. For every bound the
+tree is cut a few moves below the start board; each subtree goes to a
+worker that searches it with the same bound. The first worker to reach
+the goal raises a shared flag and the others stop within a few thousand
+nodes. Every solution found under a bound is that bound's length, so the
+answer is still a shortest one.
+
+Run this file directly to compare it with the serial solver:
+
+    python parallel_solver.py [boards] [workers]
+'''
+
+import multiprocessing, os, sys, time
+
+import puzzle_solver, puzzle_state
+
+
+'''
+Constants -- All constants used by the parallel solver stored here
+'''
+
+TASKS_PER_WORKER = 8  # Subtrees per worker, so fast ones can take more
+
+MAX_SPLIT_DEPTH = 12
+
+BENCHMARK_SEED = 5001
+
+_worker_heuristic_name = None
+_worker_heuristics = {}  # columns -> heuristic, built once per process
+_worker_stop = None  # Shared flag raised by whichever worker finds the goal
+
+
+'''
+General Functions - Splitting the tree, searching subtrees, benchmarking
+'''
+
+def split_tree(state, columns, count):
+    '''
+    Function -- Expands the start board level by level until there are
+            at least count boards to hand out. Moves straight back to the
+            previous cell are skipped, as in the search itself.
+        Parameters -- state (tuple) start board, columns (int), count (int)
+                      of subtrees wanted
+        Returns -- a tuple of the frontier, a list of move lists (list)
+            from the start board, and a solution (list) if the goal came
+            up while expanding (otherwise None)
+    '''
+    neighbours = puzzle_state.neighbour_table(columns)
+    goal = puzzle_state.goal_tiles(columns * columns)
+
+    if tuple(state) == goal:
+        return [], []
+
+    # Each entry: (moves so far, blank cell, previous blank cell, board)
+    frontier = [([], state.index(puzzle_state.BLANK), None, list(state))]
+    depth = 0
+    while len(frontier) < count and depth < MAX_SPLIT_DEPTH:
+        next_frontier = []
+        for moves, blank, previous, tiles in frontier:
+            for cell in neighbours[blank]:
+                if cell == previous:
+                    continue
+                child = tiles[:]
+                child[blank] = child[cell]
+                child[cell] = puzzle_state.BLANK
+                if tuple(child) == goal:
+                    return [], moves + [cell]
+                next_frontier.append((moves + [cell], cell, blank, child))
+        frontier = next_frontier
+        depth += 1
+
+    return [moves for moves, blank, previous, tiles in frontier], None
+
+
+def init_worker(heuristic_name, stop):
+    '''
+    Function -- Process pool initializer: keeps the heuristic name and
+            the shared stop flag in each worker
+        Parameters -- heuristic_name (str), stop (multiprocessing.Value)
+    '''
+    global _worker_heuristic_name, _worker_stop
+    _worker_heuristic_name = heuristic_name
+    _worker_stop = stop
+
+
+def search_subtree(task):
+    '''
+    Function -- Searches one subtree under the current bound inside a
+            worker process
+        Parameters -- task -- a tuple of the start board (tuple), columns
+            (int), the moves (list) down to the subtree and the bound (int)
+        Returns -- a tuple of the outcome, the full solution (list) when
+            the goal was found, and the number (int) of nodes expanded
+    '''
+    state, columns, prefix, bound = task
+    if _worker_stop.value:
+        return puzzle_solver.STOPPED, None, 0
+
+    if columns not in _worker_heuristics:
+        _worker_heuristics[columns] = puzzle_solver.make_heuristic(
+            _worker_heuristic_name, columns)
+
+    tiles = list(state)
+    blank = tiles.index(puzzle_state.BLANK)
+    previous = None
+    for cell in prefix:
+        tiles[blank] = tiles[cell]
+        tiles[cell] = puzzle_state.BLANK
+        previous, blank = blank, cell
+
+    result, path, nodes = puzzle_solver.bounded_search(
+        tiles, columns, _worker_heuristics[columns], bound,
+        moves_made = len(prefix), previous = previous, stop = _worker_stop)
+
+    if result == puzzle_solver.FOUND:
+        _worker_stop.value = 1
+        return result, prefix + path, nodes
+    return result, None, nodes
+
+
+def parallel_ida_star(state, columns, workers = None,
+                      heuristic_name = puzzle_solver.PATTERN_DATABASE,
+                      pool = None):
+    '''
+    Function -- Finds a shortest solution for a board with IDA*, running
+            the subtrees of every pass in parallel
+        Parameters -- state -- tuple of tile numbers (0 = blank),
+                      columns -- the number (int) of columns on the board,
+                      workers -- number (int) of processes, default every core,
+                      heuristic_name -- name (str) for make_heuristic(),
+                      pool -- optional (pool, stop flag) tuple from
+                        create_pool() to reuse across boards
+        Returns -- a SolverResult object (nodes summed over all workers)
+    '''
+    start_time = time.perf_counter()
+
+    if not puzzle_solver.is_solvable(state, columns):
+        raise ValueError("Board cannot be solved: wrong permutation parity")
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    prefixes, moves = split_tree(state, columns, workers * TASKS_PER_WORKER)
+    if moves is not None:
+        return puzzle_solver.SolverResult(moves, 0,
+                                          time.perf_counter() - start_time)
+
+    own_pool = pool is None
+    if own_pool:
+        pool = create_pool(workers, heuristic_name)
+    process_pool, stop = pool
+
+    heuristic = puzzle_solver.make_heuristic(heuristic_name, columns)
+    bound = heuristic.estimate(list(state))
+    nodes = 0
+    try:
+        while moves is None:
+            stop.value = 0
+            tasks = [(tuple(state), columns, prefix, bound)
+                     for prefix in prefixes]
+
+            next_bound = float("inf")
+            for result, path, task_nodes in process_pool.imap_unordered(
+                    search_subtree, tasks):
+                nodes += task_nodes
+                if result == puzzle_solver.FOUND and moves is None:
+                    moves = path
+                elif result >= 0 and result < next_bound:
+                    next_bound = result
+            bound = next_bound
+    finally:
+        if own_pool:
+            process_pool.terminate()
+
+    return puzzle_solver.SolverResult(moves, nodes,
+                                      time.perf_counter() - start_time)
+
+
+def create_pool(workers = None,
+                heuristic_name = puzzle_solver.PATTERN_DATABASE):
+    '''
+    Function -- Starts worker processes for parallel_ida_star() so that
+            several boards can share them
+        Parameters -- workers (int, default every core), heuristic_name (str)
+        Returns -- a tuple of the process pool and its shared stop flag.
+            Call terminate() on the pool when finished.
+    '''
+    if workers is None:
+        workers = os.cpu_count() or 1
+    stop = multiprocessing.Value("b", 0)
+    process_pool = multiprocessing.Pool(workers, initializer = init_worker,
+                                        initargs = (heuristic_name, stop))
+    return process_pool, stop
+
+
+def benchmark(count = 5, workers = None, seed = BENCHMARK_SEED,
+              heuristic_name = puzzle_solver.PATTERN_DATABASE):
+    '''
+    Function -- Solves the same seeded 4x4 boards serially and in
+            parallel, printing each board's times and speed-up
+        Parameters -- count (int) boards, workers (int, default every
+                      core), seed (int) and heuristic_name (str)
+        Returns -- a list (list) of speed-ups (float), one per board
+    '''
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    heuristic = puzzle_solver.make_heuristic(heuristic_name, 4)
+    pool = create_pool(workers, heuristic_name)
+    speed_ups = []
+    try:
+        boards = puzzle_state.generate_scrambles(count, 16, seed)
+        for state in boards:
+            serial = puzzle_solver.ida_star(state, 4, heuristic)
+            parallel = parallel_ida_star(state, 4, workers, heuristic_name,
+                                         pool)
+            if len(serial.moves) != len(parallel.moves):
+                raise RuntimeError("Parallel solution is not optimal")
+
+            speed_up = serial.elapsed / max(parallel.elapsed, 1e-9)
+            speed_ups.append(speed_up)
+            print(f"{len(serial.moves):3} moves | serial {serial.elapsed:7.2f}s"
+                  f" | parallel {parallel.elapsed:7.2f}s"
+                  f" | speed-up {speed_up:5.2f}x")
+    finally:
+        pool[0].terminate()
+
+    if speed_ups:
+        print(f"Mean speed-up with {workers} workers: "
+              f"{sum(speed_ups) / len(speed_ups):.2f}x")
+    return speed_ups
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    benchmark(count, workers)
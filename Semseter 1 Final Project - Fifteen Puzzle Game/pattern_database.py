@@ -0,0 +1,287 @@
+'''
+Bryan Dumond
+CS 5001 - Fall 2021
+Final Project - 15 Sliding Puzzle Game (Pattern Databases)
+
+Builds additive disjoint pattern databases for the solver. Tiles are split
+into groups; for each group a breadth-first search from the solved board
+records the fewest moves of that group's tiles needed to put them home.
+Tables are written to disk once, one byte per entry, and memory-mapped on
+later runs so they load instantly and are shared between processes.
+
+Run this file directly to build the default 4x4 tables ahead of time.
+'''
+
+import mmap, os, time
+from collections import deque
+
+import puzzle_solver
+
+
+'''
+Constants -- All constants used for building and loading tables stored here
+'''
+
+DATABASE_DIR = "Databases"
+
+# 6-6-3 split of the 15 tiles of a 4x4 board into compact regions. Six
+# tile tables are 16 MB each and take a couple of minutes to build; the
+# 5-5-5 split builds in seconds but leaves the search far more work.
+PARTITION_6_6_3 = ((1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4))
+PARTITION_5_5_5 = ((1, 2, 3, 5, 6), (4, 7, 8, 11, 12), (9, 10, 13, 14, 15))
+
+DEFAULT_PARTITION = PARTITION_6_6_3
+
+UNSEEN = 255
+
+BITS_PER_CELL = 4  # Cell numbers packed in nibbles (boards up to 4x4)
+
+
+'''
+Classes - The heuristic the solver plugs in
+'''
+
+class PatternDatabaseHeuristic:
+    '''
+    Class --- Additive pattern-database heuristic. The estimate is the
+        sum of one table lookup per tile group. Table indices pack the
+        cells of a group's tiles in 4 bits each, so a slide only changes
+        one index by a fixed amount and can be followed incrementally.
+        The same tables are also looked up for the board mirrored along
+        its main diagonal (which needs exactly as many moves), and the
+        larger of the two sums is used.
+    '''
+
+    def __init__(self, columns, partition = DEFAULT_PARTITION,
+                 directory = DATABASE_DIR, build = True):
+        '''
+        Attributes -- takes in the number (int) of columns, the partition
+            (tuple of tuples of tile numbers), the directory holding the
+            tables and whether missing tables may be built (bool). Raises
+            FileNotFoundError if a table is missing and build is False.
+        '''
+        self.columns = columns
+        self.partition = partition
+        self.tables = []
+        self.index = [0] * len(partition)
+        self.mirror_index = [0] * len(partition)
+        self.total = 0
+        self.mirror_total = 0
+
+        # pattern_of[tile] / shift_of[tile] locate a tile inside an index
+        number = columns * columns
+        self.pattern_of = [None] * number
+        self.shift_of = [0] * number
+
+        # Mirroring swaps rows and columns; tile t becomes mirror_tile[t]
+        self.mirror_cell = [(cell % columns) * columns + cell // columns
+                            for cell in range(number)]
+        self.mirror_tile = [puzzle_solver.BLANK] * number
+        for tile in range(1, number):
+            self.mirror_tile[tile] = self.mirror_cell[tile - 1] + 1
+
+        for p in range(len(partition)):
+            tiles = partition[p]
+            path = table_path(columns, tiles, directory)
+            if not os.path.exists(path):
+                if build == False:
+                    raise FileNotFoundError(path)
+                build_table(columns, tiles, path)
+            self.tables.append(load_table(path))
+
+            for i in range(len(tiles)):
+                self.pattern_of[tiles[i]] = p
+                self.shift_of[tiles[i]] = BITS_PER_CELL * i
+
+    def estimate(self, tiles):
+        '''
+        Method -- Estimates the number of moves left for a whole board and
+            remembers each group's table index for later delta() calls
+          Parameters -- tiles -- a list or tuple of tile numbers
+          Returns -- the estimate (int)
+        '''
+        self.index = [0] * len(self.partition)
+        self.mirror_index = [0] * len(self.partition)
+        for cell in range(len(tiles)):
+            tile = tiles[cell]
+            if tile == puzzle_solver.BLANK:
+                continue
+            if self.pattern_of[tile] is not None:
+                self.index[self.pattern_of[tile]] += cell << self.shift_of[tile]
+            mirror = self.mirror_tile[tile]
+            if self.pattern_of[mirror] is not None:
+                self.mirror_index[self.pattern_of[mirror]] += (
+                    self.mirror_cell[cell] << self.shift_of[mirror])
+
+        self.total = 0
+        self.mirror_total = 0
+        for p in range(len(self.partition)):
+            self.total += self.tables[p][self.index[p]]
+            self.mirror_total += self.tables[p][self.mirror_index[p]]
+        return max(self.total, self.mirror_total)
+
+    def delta(self, tiles, tile, source, target):
+        '''
+        Method -- Moves the tile inside its group's index and returns how
+            the estimate changed
+          Parameters -- tiles -- the board after the slide, tile -- the
+            tile number that moved, source/target -- cell numbers (int)
+          Returns -- the change (int) to add to the previous estimate
+        '''
+        before = max(self.total, self.mirror_total)
+
+        p = self.pattern_of[tile]
+        if p is not None:
+            table = self.tables[p]
+            old = self.index[p]
+            new = old + ((target - source) << self.shift_of[tile])
+            self.index[p] = new
+            self.total += table[new] - table[old]
+
+        mirror = self.mirror_tile[tile]
+        p = self.pattern_of[mirror]
+        if p is not None:
+            table = self.tables[p]
+            old = self.mirror_index[p]
+            new = old + ((self.mirror_cell[target] - self.mirror_cell[source])
+                         << self.shift_of[mirror])
+            self.mirror_index[p] = new
+            self.mirror_total += table[new] - table[old]
+
+        return max(self.total, self.mirror_total) - before
+
+    def undo(self, tile, source, target):
+        '''
+        Method -- Reverses a delta() call when the search backs up
+          Parameters -- the same tile and source/target cells (int)
+            that were passed to delta()
+        '''
+        p = self.pattern_of[tile]
+        if p is not None:
+            table = self.tables[p]
+            new = self.index[p]
+            old = new - ((target - source) << self.shift_of[tile])
+            self.index[p] = old
+            self.total += table[old] - table[new]
+
+        mirror = self.mirror_tile[tile]
+        p = self.pattern_of[mirror]
+        if p is not None:
+            table = self.tables[p]
+            new = self.mirror_index[p]
+            old = new - ((self.mirror_cell[target] - self.mirror_cell[source])
+                         << self.shift_of[mirror])
+            self.mirror_index[p] = old
+            self.mirror_total += table[old] - table[new]
+
+
+'''
+General Functions - Building, saving and loading tables
+'''
+
+def table_path(columns, tiles, directory = DATABASE_DIR):
+    '''
+    Function -- Builds the file name a group's table is stored under
+        Parameters -- columns (int), tiles (tuple of tile numbers) and
+                      the directory (str) tables live in
+        Returns -- a file path (str)
+    '''
+    tile_names = "-".join(str(tile) for tile in tiles)
+    return os.path.join(directory, f"pdb_{columns}x{columns}_{tile_names}.bin")
+
+
+def build_table(columns, tiles, path):
+    '''
+    Function -- Runs a 0-1 breadth-first search backwards from the solved
+            board over (group tile cells, blank cell) states. Sliding a
+            group tile costs one move, sliding any other tile is free,
+            which is what makes tables of disjoint groups addable. The
+            smallest cost over all blank cells is stored per index.
+        Parameters -- columns (int), tiles (tuple of tile numbers) and
+                      the path (str) the finished table is written to
+        Returns -- the finished table (bytearray)
+    '''
+    start_time = time.perf_counter()
+
+    number = columns * columns
+    count = len(tiles)
+    neighbours = puzzle_solver.neighbour_table(columns)
+    shifts = [BITS_PER_CELL * i for i in range(count)]
+
+    # State key = (group index << 4) | blank cell, cost kept per key
+    cost = bytearray([UNSEEN]) * (1 << (BITS_PER_CELL * (count + 1)))
+
+    start_index = 0
+    for i in range(count):
+        start_index += (tiles[i] - 1) << shifts[i]
+    start_key = (start_index << BITS_PER_CELL) | (number - 1)
+    cost[start_key] = 0
+
+    queue = deque([start_key])
+    while queue:
+        key = queue.popleft()
+        blank = key & 15
+        index = key >> BITS_PER_CELL
+        current = cost[key]
+
+        cells = [(index >> shift) & 15 for shift in shifts]
+        for cell in neighbours[blank]:
+            if cell in cells:
+                # Group tile slides into the blank: costs a move
+                shift = shifts[cells.index(cell)]
+                next_key = (((index + ((blank - cell) << shift))
+                             << BITS_PER_CELL) | cell)
+                if cost[next_key] > current + 1:
+                    cost[next_key] = current + 1
+                    queue.append(next_key)
+            else:
+                next_key = (index << BITS_PER_CELL) | cell
+                if cost[next_key] > current:
+                    cost[next_key] = current
+                    queue.appendleft(next_key)
+
+    # Collapse the blank cell away: keep the cheapest entry per index
+    table = bytearray([UNSEEN]) * (1 << (BITS_PER_CELL * count))
+    for index in range(len(table)):
+        key = index << BITS_PER_CELL
+        table[index] = min(cost[key:key + number])
+
+    # Write under a temporary name first so no one maps a half-written table
+    directory = os.path.dirname(path)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+    with open(path + ".tmp", mode = "wb") as table_file:
+        table_file.write(table)
+    os.replace(path + ".tmp", path)
+
+    print(f"Built {path} in {time.perf_counter() - start_time:.1f}s")
+    return table
+
+
+def load_table(path):
+    '''
+    Function -- Memory-maps a table file read-only. Pages are shared with
+            every other process mapping the same file.
+        Parameters -- path (str) of the table file
+        Returns -- an mmap object that can be indexed like a bytearray
+    '''
+    with open(path, mode = "rb") as table_file:
+        return mmap.mmap(table_file.fileno(), 0, access = mmap.ACCESS_READ)
+
+
+def build_default_tables(directory = DATABASE_DIR):
+    '''
+    Function -- Builds every table of the default 4x4 partition that is
+            not on disk yet
+        Parameters -- directory (str) the tables are written to
+    '''
+    for tiles in DEFAULT_PARTITION:
+        path = table_path(4, tiles, directory)
+        if os.path.exists(path):
+            print(f"{path} already built")
+        else:
+            build_table(4, tiles, path)
+
+
+if __name__ == "__main__":
+    build_default_tables()
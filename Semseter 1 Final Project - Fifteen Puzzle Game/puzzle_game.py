@@ -9,9 +9,14 @@ with the press of a button! Meant to show off proficiency with Classes, lists, d
 and functions.
 '''
 
-import turtle, random, os
+import turtle, random, os, sys, math
 from datetime import datetime
 
+import puzzle_solver, puzzle_state, batch_solver, leaderboard_store
+import puzzle_manifest, image_registry, turtle_pool, render_scheduler
+import tile_animator, solver_service, hint_cache, scramble_pool
+import reduction_solver, replay_log
+
 
 '''
 Constants -- All constants used throughout the program stored here
@@ -25,23 +30,73 @@ TILE_BORDER = 5
 TILE_START_X = -385
 TILE_START_Y = 325
 
-TILE_MIN_SIZE = 50
+TILE_MIN_SIZE = 30
 TILE_MAX_SIZE = 110
 
-VALID_BOARD_SIZES = [4, 9, 16]
+BOARD_AREA_SIZE = 475  # Width and height the grid of cells may fill
+
+MAX_COLUMNS = 10
+VALID_BOARD_SIZES = [columns * columns for columns in range(2, MAX_COLUMNS + 1)]
 
 THUMB_X = 390
 THUMB_Y = 400
 
 LOWER_MOVE_BOUND = 5
-UPPER_MOVE_BOUND = 200
+UPPER_MOVE_BOUND = 5000  # A 10x10 board takes well over a thousand moves
 
 SPLASH_TIMER = 4000  # milliseconds
 
+FRAME_TIME = 16  # milliseconds between frames of a tile slide
+SLIDE_TIME = 120  # milliseconds for a tile to slide into its new cell
+
 MSG_TIMER = 5000
 
 WARNING = 3
 
+LEADERBOARD_ROWS = 17
+
+# "sqlite" keeps scores in leaderboard.db, "text" in the old leaderboard.txt
+LEADERBOARD_BACKEND = "sqlite"
+
+# Hard 4x4 boards can take 4 million nodes with the pattern database; past
+# this Reset and Hint fall back to the reduction solver's longer solution
+SOLVER_NODE_LIMIT = 10000000
+
+SOLVER_POLL_TIME = 100  # milliseconds between checks on a background solve
+
+FEASIBILITY_NODE_LIMIT = 500  # Move limit check at load, a few milliseconds
+
+# Boards drawn from a scramble pool need this share of the move limit
+SCRAMBLE_BAND = (0.3, 0.5)
+
+# Hint button, drawn with a turtle next to the Reset button
+HINT_X = -60
+HINT_Y = -375
+HINT_WIDTH = 80
+HINT_HEIGHT = 60
+HINT_COLOR = "gold"
+
+# puzzle_solver.LINEAR_CONFLICT or puzzle_solver.PATTERN_DATABASE
+SOLVER_HEURISTIC = puzzle_solver.PATTERN_DATABASE
+
+puzzle_manifest_cache = None  # Opened on first use by get_manifest()
+
+image_cache = None  # Created on first use by get_images()
+
+turtles = None  # Created on first use by get_turtles()
+
+renderer = None  # Created on first use by get_renderer()
+
+animator = None  # Created on first use by get_animator()
+
+solver = None  # Created on first use by get_solver()
+
+hints = None  # Opened on first use by get_hints()
+
+board_heuristics = {}  # (name, columns) -> heuristic, for the main thread
+
+scramble_pools = {}  # columns -> ScramblePool, opened by get_scramble_pool()
+
 '''
 Classes - Two classes total used for this program: Board and Tile.
 '''
@@ -63,23 +118,20 @@ class Tile:
         '''
     
         self.address = address
+        self.number = number
         self.name = f"Tile {number}"
-        self.turtle = turtle.Turtle()
+        self.blank = self.address.endswith("blank.gif")
+        self.turtle = get_turtles().get()
         self.turtle.hideturtle()
+        self.drawn_at = None  # Coordinates the turtle was last drawn at
 
     def is_blank(self):
         '''
         Method --- Returns a boolean (bool) telling user whether
-            or not this tile is the blank one
+            or not this tile is the blank one (worked out once at init)
         '''
-        
-        temp_string = self.address[-1:-10:-1]
-        temp_string_reversed = temp_string[::-1]
-            
-        if temp_string_reversed == "blank.gif":
-            return True
-        else:
-            return False
+
+        return self.blank
             
     def set_coordinates(self, x_y_tuple):
         '''
@@ -115,14 +167,42 @@ class Tile:
         self.turtle.penup()
         self.turtle.goto(self.coordinates)
         self.turtle.showturtle()
-  
-        self.turtle.onclick(self.process_click)
+        self.drawn_at = self.coordinates
+
+    def move_to_cell(self):
+        '''
+        Method -- moves an already drawn Tile image to its new coordinates,
+            cancelling any slide it was still doing
+        '''
+        get_animator().stop(self.name)
+        self.turtle.showturtle()
+        self.turtle.goto(self.coordinates)
+        self.drawn_at = self.coordinates
+
+    def slide_to_cell(self):
+        '''
+        Method -- starts the Tile image sliding from where it was last
+            drawn to its new coordinates. The slide runs on a timer, so
+            this returns straight away.
+        '''
+        self.turtle.showturtle()
+        get_animator().slide(self.name, self.turtle, self.drawn_at,
+                             self.coordinates)
+        self.drawn_at = self.coordinates
+
+    def is_dirty(self):
+        '''
+        Method -- Returns a boolean (bool) telling whether the Tile has
+            moved (or was never drawn) since it was last drawn
+        '''
+        return self.drawn_at != self.coordinates
 
         
     def process_click(self, x, y):
         '''
         Callback --- Allows Tile objects to be clicked on, which
-            activates the Board class' switch_tiles method.
+            activates the Board class' switch_tiles method. Called by
+            click_board() once it has worked out which Tile was hit.
         '''
 
         global game_board
@@ -155,35 +235,55 @@ class Board:
     Class --- The main processor of everything that happens on the 16-cell
         game board itself. Knows how to process .puz file data, draw cells,
         move Tiles, shuffle the board, draw to the screen, update score,
-        solve the puzzle, and much more
+        solve the puzzle, and much more. The game logic itself lives in a
+        puzzle_state.PuzzleState; the nested list of Tiles is the view
+        of it that gets drawn.
     '''
 
-    def __init__(self, address, move_limit):
+    def __init__(self, address, move_limit, seed = None, replay = None):
         '''
         Init -- Takes in the address of the puz file that will be used
             to create a game board. Also the given move limit specificed
-            by the user in order to check win states
+            by the user in order to check win states, an optional
+            shuffle seed (int) to recreate a particular board, and an
+            optional replay_log.ReplayReader to show a recorded game
+            instead of playing a new one
         '''
 
-        dictionary = generate_dict(address)
+        # Fields and file checks come from the manifest cache, which only
+        # touches the .puz file and image folder again if they changed
+        self.manifest = get_manifest().lookup(address)
+        dictionary = self.manifest["fields"]
 
         self.name = dictionary["name"]
+        self.puz_file = address
         self.number = int(dictionary["number"])
-
-        # Directory info for puz / images to be used
-        self.current_dir = os.listdir()
-        self.images_dir = os.listdir("Images")
         
         self.size = int(dictionary["size"])
         self.thumb_address = dictionary["thumbnail"]
     
-        self.columns = int(self.number ** 0.5)
+        self.columns = math.isqrt(self.number)
         self.rows = self.columns  # Because it's a square
 
         self.player_moves = 0
         self.move_limit = move_limit
         self.moves_left = self.move_limit - self.player_moves
 
+        self.heuristic_name = SOLVER_HEURISTIC
+        self.hint_marker = None  # Turtle outlining the hinted tile
+
+        self.replay = replay
+        self.recorder = None  # ReplayWriter for the game being played
+
+        # Filled in by check_move_limit() once the board is shuffled
+        self.fewest_moves = None
+        self.optimal_moves = None
+
+        # Seed is always kept so a shuffled board can be recreated later
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+
         
         self.tile_list = []
         for i in range(self.number):
@@ -195,6 +295,14 @@ class Board:
             address = self.tile_list[i].address
             self.address_list.append(address)
         self.address_list.append(self.thumb_address)
+
+        # Tile objects looked up by the number the state engine uses
+        self.tiles_by_value = [None] * self.number
+        for tile in self.tile_list:
+            if tile.is_blank() == True:
+                self.tiles_by_value[puzzle_state.BLANK] = tile
+            elif tile.number < self.number:
+                self.tiles_by_value[tile.number] = tile
         
 
 
@@ -206,16 +314,36 @@ class Board:
     def setup_new_board(self):
         '''
         Helper Method -- convenient way to launch all of the 
-            board setup functions once the .puz is validated
+            board setup functions once the .puz is validated. Everything
+            is drawn in one frame, so the screen is only updated once.
         '''
         
-        self.load_tiles()
-        self.draw_cells()
-        self.create_solved_board()
-        self.create_shuffled_board()
-        self.draw_board_tiles()
-        self.draw_thumbnail()
-        self.display_current_score()
+        with get_renderer().frame():
+            self.load_tiles()
+            self.draw_cells()
+            if self.replay is None:
+                self.create_shuffled_board()
+                feasible = self.check_move_limit()
+            else:
+                self.state = puzzle_state.PuzzleState(self.replay.initial,
+                                                      self.columns)
+                self.update_board_view()
+                feasible = True
+            self.draw_board_tiles()
+            self.draw_thumbnail()
+            self.display_current_score()
+
+        # A replay is only watched, so it takes no clicks and is not recorded
+        if self.replay is not None:
+            return
+
+        # One click handler for the whole screen instead of one per Tile
+        screen.onscreenclick(click_board)
+        self.start_recording()
+
+        # Once the board is on screen, end a game that cannot be won
+        if feasible == False:
+            screen.ontimer(self.end_hopeless_game, 0)
 
 
     def validate_puzz_file(self):
@@ -235,7 +363,15 @@ class Board:
             error = f"Tile Size '{self.size}' is invalid"                                        
             valid = False
 
-        elif self.name not in self.images_dir:
+        # The cells are laid out from the tile size, so big boards need
+        # small tiles to fit in the play area
+        elif ((self.size + TILE_MARGIN) * self.columns - TILE_MARGIN >
+              BOARD_AREA_SIZE):
+            error = (f"Tile Size '{self.size}' is too big for a "
+                     f"{self.columns}x{self.columns} board")
+            valid = False
+
+        elif self.manifest["image_dir"] == False:
             error = f"Image directory '{self.name}' does not exist"
             valid = False
 
@@ -260,84 +396,118 @@ class Board:
              returned to the validate function so that it can be error logged
         '''
 
-        # Get string lists of all file paths that the board will use
-        curr_dir = os.listdir()
-        img_dir = os.listdir("Images")
-        tile_dir = os.listdir(f"Images/{self.name}")
-
-        # Find the indices that reveal folder holding tile images
-        ind1 = curr_dir.index("Images")
-        ind2 = img_dir.index(f"{self.name}")
-
-        # Build list of all potential file paths of that folder
-        curr_addresses = []
-        for i in range(len(tile_dir)):
-            tile_str = f"{curr_dir[ind1]}/{img_dir[ind2]}/{tile_dir[i]}"
-            curr_addresses.append(tile_str)
-
-        # Check to see if all puz file addresses are in actual file path list
-        for address in self.address_list:
-            if address in curr_addresses:
-                continue
-            else:
-                return address      
-        return None
+        # The manifest checked every path against one listing of the folder
+        return self.manifest["missing"]
         
 
     def load_tiles(self):
         '''
-        Method -- adds tile images to Screen's shape library
+        Method -- adds tile images to Screen's shape library. Images
+            already decoded for an earlier board are reused.
         '''
-        global screen
         for each in self.tile_list:
-            screen.addshape(each.address)
+            get_images().acquire(each.address)
 
-    def create_solved_board(self):
+    def update_board_view(self):
         '''
-        Method -- creates a separate nested list of Tile objects
-            representing the winning configuration. Current board (represented
-            by another nested list) will be compared to this
+        Method -- Rebuilds the nested list of Tile objects from the state
+            engine, after the state was changed without going through
+            switch_tiles()
         '''
 
-        self.solved_board = []
+        self.board = []
         for i in range(self.rows):
             temp_list = []
             for j in range(self.columns):
-                tile = self.tile_list[(i * self.columns) + j]
-                temp_list.append(tile)
-            self.solved_board.append(temp_list)
-                    
-    def solve_board(self):
+                value = self.state.tiles[(i * self.columns) + j]
+                temp_list.append(self.tiles_by_value[value])
+            self.board.append(temp_list)
+
+        self.set_tile_data()
+
+    def board_state(self):
         '''
-        Method -- solves the current nested list game board (invoked by pressing
-            the reset button on Turtle screen) 
+        Method -- Returns the board as the tuple of tile numbers the solver
+            works on (0 stands for the blank), read left to right, top to
+            bottom
         '''
 
-        for i in range(self.rows):
-            for j in range(self.columns):
-                self.board[i][j] = self.tile_list[(i * self.columns) + j]
+        return self.state.to_tuple()
+
+    def check_move_limit(self):
+        '''
+        Method -- Checks whether the shuffled board can be solved within
+            the move limit. A small IDA* search gives a lower bound on the
+            moves needed, and the exact number when it finishes in time.
+            Boards up to 3x3 are looked up in the exact distance tables
+            once they are built, so for them the answer is then exact.
+          Returns -- feasible -- a boolean (bool) that is False only when
+            the board certainly needs more moves than the limit allows
+        '''
+        state = self.board_state()
+        if not puzzle_solver.is_solvable(state, self.columns):
+            return True
+
+        heuristic = get_heuristic(self.heuristic_name, self.columns)
+        self.fewest_moves, self.optimal_moves = puzzle_solver.solution_bounds(
+            state, self.columns, heuristic, FEASIBILITY_NODE_LIMIT)
+
+        if self.fewest_moves > self.move_limit:
+            print(f"Move limit: {self.move_limit} is not enough, this board "
+                  f"needs at least {self.fewest_moves} moves")
+            return False
+
+        if self.optimal_moves is not None:
+            print(f"Move limit: {self.move_limit} is enough, this board can "
+                  f"be solved in {self.optimal_moves} moves")
+        else:
+            print(f"Move limit: {self.move_limit} may be enough, this board "
+                  f"needs at least {self.fewest_moves} moves")
+        return True
+
+    def end_hopeless_game(self):
+        '''
+        Callback Method -- Ends the round as a loss straight away when
+            check_move_limit() found the board cannot be solved in time,
+            unless another board has been loaded since
+        '''
+        if self is game_board:
+            print("You lose! The move limit is too low for this board.")
+            end_round(False, self.player_moves)
 
-        self.set_tile_data()
-        
-    
     def create_shuffled_board(self):
         '''
         Method -- creates the initial game board list whenever a new .puz
             file is loaded. It is a nested list representing what a 2D grid
-            would look like
+            would look like. When a scramble pool has been built for this
+            size, a board needing SCRAMBLE_BAND of the move limit is drawn
+            from it; otherwise the shuffle comes from the board's seed.
+            Either way it is always solvable.
         '''
 
-        shuffled_indices = create_shuffled_indices(self.tile_list)
+        low, high = SCRAMBLE_BAND
+        pooled = get_scramble_pool(self.columns).draw_band(
+            int(self.move_limit * low), int(self.move_limit * high),
+            random.Random(self.seed))
 
-        self.board = []
-        for i in range(self.rows):
-            temp_list = []
-            for j in range(self.columns):
-                tile = self.tile_list[shuffled_indices.pop()]
-                temp_list.append(tile)
-            self.board.append(temp_list)
+        if pooled is not None:
+            values, length = pooled
+            print(f"Scramble: drawn from the pool, {length} moves to solve")
+        else:
+            shuffled_indices = puzzle_state.shuffled_indices(self.number,
+                                                             self.columns,
+                                                             self.seed)
 
-        self.set_tile_data()
+            # Index number - 1 is the blank, which the state engine calls 0
+            values = []
+            for index in shuffled_indices:
+                if index == self.number - 1:
+                    values.append(puzzle_state.BLANK)
+                else:
+                    values.append(index + 1)
+        self.state = puzzle_state.PuzzleState(values, self.columns)
+
+        self.update_board_view()
 
     def draw_cells(self):
         '''
@@ -346,7 +516,7 @@ class Board:
             tiles onto the board. Draws from top left to bottom right of grid.
         '''
              
-        self.outline = turtle.Turtle()
+        self.outline = get_turtles().get()
         self.outline.speed(0)
         self.outline.hideturtle()
         self.outline.penup()
@@ -393,16 +563,26 @@ class Board:
             tells each tile to redraw itself at its new saved location. Score is
             also re-drawn to reflect update.
           Parameters -- tile_1, tile_2 -- two Tile objects whose turtle objects
-             will be used to redraw their new positions on screen.
+             will be used to redraw their new positions on screen. They slide
+             there on a timer, so clicks are taken while they move.
         '''
-        # Update Tiles
-        switched_tiles = tile_1, tile_2
+        renderer = get_renderer()
+        with renderer.frame():
+            self.clear_hint()
+
+            # Update Tiles
+            switched_tiles = tile_1, tile_2
 
-        for each in switched_tiles:
-            each.turtle.showturtle()
-            each.turtle.goto(each.coordinates)
+            for each in switched_tiles:
+                each.slide_to_cell()
 
-        # Update Text
+            # Update Text
+            renderer.mark("score", self.draw_score)
+
+    def draw_score(self):
+        '''
+        Method -- re-draws the moves made and moves left text after a move
+        '''
         self.moves_made_display.clear()
         self.moves_made_display.write(f"Moves Made: {self.player_moves} ",
                                       move = False, align = "left",
@@ -428,7 +608,7 @@ class Board:
             terminates
         '''
 
-        self.moves_left_display = turtle.Turtle()
+        self.moves_left_display = get_turtles().get()
 
         self.moves_left_display.penup()
         self.moves_left_display.hideturtle()
@@ -438,7 +618,7 @@ class Board:
                                       move = False, align = "left",
                                       font=('Arial', 26, 'normal'))
 
-        self.moves_made_display = turtle.Turtle()
+        self.moves_made_display = get_turtles().get()
 
         self.moves_made_display.penup()
         self.moves_made_display.hideturtle()
@@ -453,13 +633,19 @@ class Board:
         Method -- Tells Tile objects to draw themselves in the coordinates
             that they have saved after board shuffle. Should appear on screen
             in "random" order (it is just the order that the tiles are listed
-            in the .puz file)
+            in the .puz file). Only tiles that moved since they were last
+            drawn are touched, all in one frame.
         '''
+        renderer = get_renderer()
         
         # Tiles drawn in "random" order is visually fitting for puzzle game
-        for i in range(len(self.tile_list)):
-            tile = self.tile_list[i]
-            tile.draw()
+        with renderer.frame():
+            for i in range(len(self.tile_list)):
+                tile = self.tile_list[i]
+                if tile.drawn_at is None:
+                    renderer.mark(tile.name, tile.draw)
+                elif tile.is_dirty() == True:
+                    renderer.mark(tile.name, tile.move_to_cell)
 
 
     def set_tile_data(self):
@@ -482,7 +668,9 @@ class Board:
             If move is valid, Tile object indexes on self.board list are
             updated, and functions are called to both change the Tile object
             metadata, update teh score, re-draw the screen, and check
-            for a win/loss.
+            for a win/loss. The state engine moves the blank and updates
+            its misplaced-tile count as part of the switch, so finding the
+            blank and checking for a win are O(1) on any board size.
           Parameter -- tile -- A Tile Object that was clicked and will be
             compared to a blank tile.
         '''
@@ -497,6 +685,8 @@ class Board:
         if self.check_valid_switch(clicked_index , blank_index) == True:
 
             # First perform all the BTS logic to switch the tiles
+            self.state.move(tile.cell)
+            self.record_moves([tile.cell])
             switched_out = self.board[blank.index_r][blank.index_c]
             
             self.board[blank.index_r][blank.index_c] = tile
@@ -515,6 +705,76 @@ class Board:
             
             self.check_end()
 
+    def find_clicked_cell(self, x, y):
+        '''
+        Method -- Works out which cell of the grid a click landed in with
+            a little arithmetic on the grid's position and spacing, the
+            same layout draw_cells() uses
+          Parameters -- x, y -- screen coordinates (float) of the click
+          Returns -- the cell number (int), or None if the click missed
+            every cell (outside the grid or in the margin between cells)
+        '''
+        step = self.size + TILE_MARGIN
+        row, down = divmod(TILE_START_Y - y, step)
+        column, across = divmod(x - TILE_START_X, step)
+
+        if row < 0 or row >= self.rows or column < 0 or column >= self.columns:
+            return None
+        if down > self.size or across > self.size:
+            return None
+        return int(row) * self.columns + int(column)
+
+    def apply_moves(self, moves, scored = True):
+        '''
+        Method -- Plays a whole sequence of moves at once, for solver
+            playback, replays and scripted games. All moves are checked
+            first, then made on the state engine, and the board is redrawn,
+            the score updated and the end of the game checked only once.
+            As with clicking, the game ends on the move that solves the
+            board or uses the last move allowed; later moves are not made.
+          Parameters -- moves -- a string of move letters ("UULDRR", the
+            way the tile slides) or a list (list) of cells,
+            scored -- False to play the moves without counting them,
+            recording them or ending the game, as Reset does
+          Returns -- the number (int) of moves made. Raises ValueError,
+            with the board unchanged, if any move cannot be made.
+        '''
+        cells = puzzle_state.moves_to_cells(moves, self.state.blank,
+                                            self.columns)
+
+        played = 0
+        for cell in cells:
+            self.state.move(cell)
+            played += 1
+            if scored == True and (self.state.is_solved() == True or
+                    self.player_moves + played == self.move_limit):
+                break
+        if played == 0:
+            return 0
+
+        # Unscored moves are not the player's and would pass for theirs in
+        # the replay, which cannot skip them, so the replay ends here
+        if scored == True:
+            self.record_moves(cells[:played])
+        else:
+            self.stop_recording()
+
+        if scored == True:
+            self.player_moves += played
+            self.moves_left -= played
+            print(f"You have made {played} moves!")
+
+        with get_renderer().frame():
+            self.clear_hint()
+            self.update_board_view()
+            self.draw_board_tiles()
+            if scored == True:
+                get_renderer().mark("score", self.draw_score)
+
+        if scored == True:
+            self.check_end()
+        return played
+
     def check_valid_switch(self, clicked_index, blank_index):
         '''
         Method -- Analyzes the index locations of the clicked
@@ -544,32 +804,31 @@ class Board:
         '''
         global screen
         
+        solved = self.state.is_solved()
+
         if self.player_moves == self.move_limit:
-            if self.board != self.solved_board:
+            if solved == False:
                 print("You lose!")
                 end_round(False, self.player_moves)
             else:
                 print("You win!")
                 end_round(True, self.player_moves)
                 
-        elif self.board == self.solved_board:
+        elif solved == True:
             print("You win!")
             end_round(True, self.player_moves)
         
 
     def find_blank_tile(self):
         '''
-        Method -- searches the nested list board for the
-            Tile containing the metadata for being blank.
-            Tile object is returned if True
+        Method -- looks up the Tile sitting in the state engine's
+            blank cell
           Return -- Tile object that holds the blank tile
             data in the nested list board.
         '''
-        
-        for row in self.board:
-            for tile in row:
-                if tile.is_blank() == True:
-                    return tile
+
+        row, column = divmod(self.state.blank, self.columns)
+        return self.board[row][column]
     
     def update_switched_tile_data(self, tile_1, tile_2):
         '''
@@ -608,31 +867,199 @@ class Board:
     def reset_board(self):
         '''
         Method -- Invoked by pressing the Reset button on the Turtle Screen.
-            Modifies the nested list board object to have all its Tiles be
-            in solved orientation, and then calls the draw_board_tiles
-            function to let Tiles draw their new locations on screen
+            Starts the solver on a background thread; finish_reset() puts
+            all the Tiles in solved orientation once it is done, so the
+            window keeps responding while the board is solved
         '''
         try:
-            self.solve_board()
-            self.draw_board_tiles()
+            state = self.board_state()
             
         # If user tries to "reset" an empty screen, do nothing
         except AttributeError:
-            pass
+            return
+
+        print("Solver: working in the background...")
+        get_solver().submit(state, self.columns, self.heuristic_name,
+                            SOLVER_NODE_LIMIT, self.finish_reset,
+                            report_solver_progress)
+
+    def show_hint(self):
+        '''
+        Method -- Outlines the tile to move next on a shortest solution
+            (on boards wider than 4x4, on the reduction solver's).
+            Boards seen before are answered from the hint cache straight
+            away; anything else is solved in the background first.
+        '''
+        try:
+            state = self.board_state()
+        except AttributeError:
+            return
+
+        if self.state.is_solved() == True:
+            return
+
+        answer = get_hints().lookup(state)
+        if answer is not None:
+            self.draw_hint(answer[1], answer[0])
+            return
+
+        print("Hint: working in the background...")
+        get_solver().submit(state, self.columns, self.heuristic_name,
+                            SOLVER_NODE_LIMIT, self.finish_hint,
+                            report_solver_progress)
+
+    def finish_hint(self, job):
+        '''
+        Callback Method -- Called on the main thread when the background
+            solve started by show_hint() is done. Stores the answer for
+            every board along the solution, then shows the first move.
+          Parameters -- job -- the finished solver_service.SolverJob
+        '''
+        if self is not game_board or self.board_state() != job.state:
+            print("Hint: board changed, result discarded")
+            return
+
+        if job.result is None or job.result.moves is None:
+            print("Hint: no solution found")
+            return
+
+        # Only shortest solutions go in the cache; reduction is quick anyway
+        if job.result.optimal == True:
+            get_hints().store_solution(job.state, self.columns,
+                                       job.result.moves)
+        self.draw_hint(job.result.moves[0], len(job.result.moves))
+
+    def draw_hint(self, cell, distance):
+        '''
+        Method -- Outlines the tile in a cell in HINT_COLOR
+          Parameters -- cell (int) of the tile to move, distance (int)
+            moves left to solve the board
+        '''
+        print(f"Hint: move the tile in cell {cell} ({distance} moves to go)")
+        self.clear_hint()
+        self.hint_marker = get_turtles().get()
+
+        x, y = self.cell_coordinates[cell]
+        half = self.size / 2
+        marker = self.hint_marker
+        with get_renderer().frame():
+            marker.hideturtle()
+            marker.penup()
+            marker.goto(x - half, y + half)
+            marker.color(HINT_COLOR)
+            marker.width(TILE_BORDER)
+            marker.pendown()
+            for k in range(4):
+                marker.forward(self.size)
+                marker.right(90)
+            marker.penup()
+
+    def clear_hint(self):
+        '''
+        Method -- Removes the hint outline, if one is showing
+        '''
+        if self.hint_marker is not None:
+            get_turtles().release(self.hint_marker)
+            self.hint_marker = None
+
+    def finish_reset(self, job):
+        '''
+        Callback Method -- Called on the main thread when the background
+            solve started by reset_board() is done. The solution is played
+            through apply_moves() without counting as the player's moves;
+            if there is none (an unsolvable shuffle) the tiles are put
+            straight back into solved position. A result for a board that
+            has since changed is thrown away.
+          Parameters -- job -- the finished solver_service.SolverJob
+        '''
+        if self is not game_board or self.board_state() != job.state:
+            print("Solver: board changed, result discarded")
+            return
+
+        if job.result is not None and job.result.moves is not None:
+            report_solution(job.state, self.columns, job.result)
+            self.apply_moves(job.result.moves, scored = False)
+        else:
+            print("Solver: no solution found, unscrambling instead")
+            self.state = puzzle_state.solved_state(self.columns)
+
+            # The jump is not a move, so the replay cannot follow it
+            self.stop_recording()
+            with get_renderer().frame():
+                self.clear_hint()
+                self.update_board_view()
+                self.draw_board_tiles()
+
+    def start_recording(self):
+        '''
+        Method -- Starts writing the game's replay file, headed with the
+            .puz file, seed, move limit and shuffled board
+        '''
+        path = replay_log.replay_path(self.puz_file)
+        try:
+            self.recorder = replay_log.ReplayWriter(
+                path, self.puz_file, self.seed, self.move_limit,
+                self.board_state(), self.columns)
+            print(f"Replay: recording to {path}")
+        except OSError as error:
+            print(f"Replay: not recorded ({error})")
+
+    def record_moves(self, cells):
+        '''
+        Method -- Adds moves just made to the replay, if one is recording
+          Parameters -- cells (list) of the tiles that slid into the blank
+        '''
+        if self.recorder is not None:
+            for cell in cells:
+                self.recorder.record(cell)
+
+    def stop_recording(self):
+        '''
+        Method -- Finishes the replay file, if one is recording. Safe to
+            call more than once.
+        '''
+        if self.recorder is not None:
+            self.recorder.close()
+            print(f"Replay: {self.recorder.count} moves saved to "
+                  f"{self.recorder.path}")
+            self.recorder = None
+
+    def show_replay_move(self, move):
+        '''
+        Method -- Shows a replay's board as it was after a given move,
+            read from the nearest checkpoint in the replay file
+          Parameters -- move (int), from 0 to the replay's last move
+        '''
+        self.state = puzzle_state.PuzzleState(self.replay.state_at(move),
+                                              self.columns)
+        self.player_moves = move
+        self.moves_left = self.move_limit - move
+
+        with get_renderer().frame():
+            self.update_board_view()
+            self.draw_board_tiles()
+            get_renderer().mark("score", self.draw_score)
 
     def erase_board(self):
         '''
         Method -- Hides the turtles of all Tile objects and the thumnbail
-            on screen, and erases Tile outlines and score display
+            on screen, and erases Tile outlines and score display. The
+            turtles go back to the pool for the next board.
         '''
-        for i in range(len(self.tile_list)):
-            tile = self.tile_list[i]
-            tile.turtle.hideturtle()
-            
-        self.thumb.hideturtle()
-        self.outline.clear()
-        self.moves_made_display.clear()
-        self.moves_left_display.clear()        
+        self.stop_recording()
+        get_animator().finish_all()
+        with get_renderer().frame():
+            self.clear_hint()
+            for i in range(len(self.tile_list)):
+                tile = self.tile_list[i]
+                get_turtles().release(tile.turtle)
+                get_images().release(tile.address)
+                
+            get_turtles().release(self.thumb)
+            get_images().release(self.thumb_address)
+            get_turtles().release(self.outline)
+            get_turtles().release(self.moves_made_display)
+            get_turtles().release(self.moves_left_display)
             
 
 '''
@@ -640,44 +1067,188 @@ General Functions - These are functions outside of the Game and Tile classes tha
         deal with logic outside of the tile board itself.
 '''
 
-def generate_dict(address):
+def click_board(x, y):
     '''
-    Function -- Reads in a .puz file and organizes its data into a dictionary
-            (dict) that is passed into a Board object for processing
-        Parameters -- A str representing a file path
-        Returns -- a puzzle dictionary (dict)
+    Callback Function -- The screen's only click handler for the board.
+        Finds the cell under the click and passes its Tile to the board,
+        the same amount of work for any size of board. The Hint button,
+        being drawn rather than an image, is hit-tested here too.
     '''
-    puzzle_dict = {}
-    
-    with open(address, mode = 'r') as puzzle_data:
-        for line in puzzle_data:
-            temp_puz_list = line.split(": ")
-                
-            puzzle_dict[temp_puz_list[0]] = temp_puz_list[1].strip("\n")
-    return puzzle_dict
+    if (abs(x - HINT_X) <= HINT_WIDTH / 2 and
+            abs(y - HINT_Y) <= HINT_HEIGHT / 2):
+        return press_hint(x, y)
 
-        
-def create_shuffled_indices(lst):
+    try:
+        cell = game_board.find_clicked_cell(x, y)
+        if cell is not None:
+            row, column = divmod(cell, game_board.columns)
+            game_board.board[row][column].process_click(x, y)
+
+    # Clicks while there is no playable board (e.g. a bad .puz) do nothing
+    except (AttributeError, NameError):
+        pass
+
+
+def report_solver_progress(job):
     '''
-    Function -- Creates a list (list) of numbers from 0 to the length of
-            list that is passed in in random order, and returns it to sender
-        Parameters - A list of objects
-        Returns - A list of shuffled integers (int)
+    Callback Function -- Shows how far a background solve has got, each
+        time the solver service finds it searching a new depth
+        Parameters -- job -- the running solver_service.SolverJob
     '''
-    
-    shuffled_indices = []
+    if job.bound is not None:
+        print(f"Solver: searching {job.bound} moves deep, "
+              f"{job.nodes} positions so far")
 
-    index = random.randint(0, len(lst) - 1)
 
-    while len(shuffled_indices) != len(lst):
-        if index not in shuffled_indices:
-            shuffled_indices.append(index)
+def report_solution(state, columns, result):
+    '''
+    Function -- Prints what the solver found for a board. A solution that
+        may not be shortest (the reduction solver's) is also measured
+        against the board's lower bound, to show how far off it could be.
+        Parameters -- state (tuple) of the board solved, columns (int) and
+            the puzzle_solver.SolverResult
+    '''
+    print(f"Solver: {result}")
+    if result.optimal == False:
+        reduction_solver.report(state, columns, result)
+
+
+def get_hints():
+    '''
+    Function -- Returns the hint cache, opening its database the first
+            time a hint is asked for
+        Returns -- a hint_cache.HintCache object
+    '''
+    global hints
+    if hints is None:
+        hints = hint_cache.HintCache()
+    return hints
+
+
+def get_heuristic(name, columns):
+    '''
+    Function -- Returns the solver heuristic for a board size, building it
+            only the first time. Only for the main thread: background
+            solves build their own, as some heuristics keep state. Tables
+            are never built here; the linear conflict stand-in used until
+            then is not kept, so a table a background solve has built
+            since is picked up on the next board.
+        Parameters -- name (str) for puzzle_solver.make_heuristic() and
+                      columns (int)
+        Returns -- a heuristic object
+    '''
+    if (name, columns) in board_heuristics:
+        return board_heuristics[(name, columns)]
+
+    heuristic = puzzle_solver.make_heuristic(name, columns)
+    if (name == puzzle_solver.LINEAR_CONFLICT or not
+            isinstance(heuristic, puzzle_solver.ManhattanLinearConflict)):
+        board_heuristics[(name, columns)] = heuristic
+    return heuristic
+
+
+def get_scramble_pool(columns):
+    '''
+    Function -- Returns the scramble pool for a board size. The pool
+            files are listed again on every call (one directory listing),
+            so boards generated while the game runs, or files replaced,
+            are seen by the next board load.
+        Parameters -- columns (int)
+        Returns -- a scramble_pool.ScramblePool object
+    '''
+    if columns not in scramble_pools:
+        scramble_pools[columns] = scramble_pool.ScramblePool(columns)
+    else:
+        scramble_pools[columns].refresh()
+    return scramble_pools[columns]
+
+
+def get_manifest():
+    '''
+    Function -- Returns the game's .puz manifest cache, opening the saved
+            one the first time it is needed
+        Returns -- a puzzle_manifest.PuzzleManifest object
+    '''
+    global puzzle_manifest_cache
+    if puzzle_manifest_cache is None:
+        puzzle_manifest_cache = puzzle_manifest.PuzzleManifest()
+    return puzzle_manifest_cache
+
+
+def get_images():
+    '''
+    Function -- Returns the image registry every GIF is registered
+            through, creating it for the screen the first time
+        Returns -- an image_registry.ImageRegistry object
+    '''
+    global image_cache
+    if image_cache is None:
+        image_cache = image_registry.ImageRegistry(screen)
+    return image_cache
+
+
+def get_turtles():
+    '''
+    Function -- Returns the pool every turtle is taken from, creating it
+            for the screen the first time
+        Returns -- a turtle_pool.TurtlePool object
+    '''
+    global turtles
+    if turtles is None:
+        turtles = turtle_pool.TurtlePool(screen)
+    return turtles
+
+
+def get_renderer():
+    '''
+    Function -- Returns the render scheduler that groups board drawing
+            into frames, creating it for the screen the first time
+        Returns -- a render_scheduler.RenderScheduler object
+    '''
+    global renderer
+    if renderer is None:
+        renderer = render_scheduler.RenderScheduler(screen)
+    return renderer
+
+
+def get_animator():
+    '''
+    Function -- Returns the animator that slides tiles into their new
+            cells, creating it for the screen the first time
+        Returns -- a tile_animator.TileAnimator object
+    '''
+    global animator
+    if animator is None:
+        animator = tile_animator.TileAnimator(screen, get_renderer(),
+                                              FRAME_TIME, SLIDE_TIME)
+    return animator
+
+
+def get_solver():
+    '''
+    Function -- Returns the service that runs the solver in the
+            background, creating it for the screen the first time
+        Returns -- a solver_service.SolverService object
+    '''
+    global solver
+    if solver is None:
+        solver = solver_service.SolverService(screen, SOLVER_POLL_TIME)
+    return solver
+
+
+def clear_screen():
+    '''
+    Function -- Clears every turtle off the screen. The images stay
+            registered for later, but none of them is on screen any more,
+            and the turtles themselves are gone so the pool starts over.
+    '''
+    get_solver().cancel()
+    get_animator().finish_all()
+    screen.clearscreen()
+    get_images().release_all()
+    get_turtles().forget_all()
+
 
-        else:
-            # repeats get reshuffled
-            index = random.randint(0, len(lst) -1) 
-    return shuffled_indices
-    
   
 def draw_outlines(x, y, thickness, color, length, width):
     '''
@@ -690,7 +1261,7 @@ def draw_outlines(x, y, thickness, color, length, width):
                       length - int representing how many units one side should be
                       width - int representing how many unites other side should be
     '''
-    outline = turtle.Turtle()
+    outline = get_turtles().get()
     outline.speed(0)
     outline.hideturtle()
 
@@ -725,6 +1296,36 @@ def create_status_buttons():
     quit_button.onclick(press_quit)
     load_button.onclick(press_load)
     reset_button.onclick(press_reset)
+
+    create_hint_button()
+
+
+def create_hint_button():
+    '''
+    Function -- Draws the Hint button next to the Reset button. There is
+        no image for it, so it is a filled rectangle with its name written
+        on it; click_board() handles clicks on it.
+    '''
+    button = get_turtles().get()
+    button.hideturtle()
+    button.speed(0)
+    button.penup()
+    button.goto(HINT_X - HINT_WIDTH / 2, HINT_Y + HINT_HEIGHT / 2)
+    button.color("black", HINT_COLOR)
+    button.width(3)
+    button.pendown()
+    button.begin_fill()
+    for i in range(2):
+        button.forward(HINT_WIDTH)
+        button.right(90)
+        button.forward(HINT_HEIGHT)
+        button.right(90)
+    button.end_fill()
+    button.penup()
+
+    button.goto(HINT_X, HINT_Y - 12)
+    button.write("Hint", move = False, align = "center",
+                 font = ('Arial', 20, 'bold'))
     
 
 def press_quit(x,y):
@@ -738,14 +1339,27 @@ def press_quit(x,y):
     
     print("\nClicked Quit")
 
-    screen.clearscreen()
+    clear_screen()
     
-    screen.addshape("Resources/quitmsg.gif")
-    quit_msg = turtle.Turtle()
+    get_images().acquire("Resources/quitmsg.gif")
+    quit_msg = get_turtles().get()
     quit_msg.shape("Resources/quitmsg.gif")
+    quit_msg.showturtle()
 
     screen.ontimer(end_game, t = MSG_TIMER)
 
+def press_hint(x,y):
+    '''
+    Callback Function -- Invoked by clicking the Hint button.
+        Returns -- Tells game_board object to call show_hint method
+    '''
+    print("\nClicked Hint")
+    try:
+        return game_board.show_hint()
+    except (AttributeError, NameError):
+        pass
+
+
 def press_reset(x,y):
     '''
     Callback Function -- Invoked by clicking Reset button.
@@ -776,13 +1390,12 @@ def load_new_board():
     global game_board
     global move_limit
 
-    contents = os.listdir()
+    contents = get_manifest().puzzle_files()
     puzz_file_names = []
     
     for each in contents:
-        if each[-1:-5:-1] == ".puz"[::-1]:
-            each += "\n"
-            puzz_file_names.append(each)
+        each += "\n"
+        puzz_file_names.append(each)
 
     files_string = "".join(puzz_file_names)
 
@@ -792,6 +1405,9 @@ def load_new_board():
                                 f"Choices are:\n\n{files_string}")
     try:
         if new_board + "\n" in puzz_file_names:
+
+            # A background solve for the old board is no use any more
+            get_solver().cancel()
             
             # If board is already erased, go straigth to exception
             try:
@@ -821,8 +1437,8 @@ def place_image (address, x, y):
     '''
     global screen
     
-    screen.addshape(address)
-    image = turtle.Turtle()
+    get_images().acquire(address)
+    image = get_turtles().get()
     image.hideturtle()
     image.speed(0)
     image.shape(address)
@@ -838,28 +1454,38 @@ def get_leaderboard():
     Function -- Opens the leaderboard file and reads data into lists with lengths of
             two (one int for score and one str for name), which are then nested into
             one bigger list that will be sorted and printed to the screen. If leaderboard
-            not found, sends error data to error logger function.
+            not found, sends error data to error logger function. With the sqlite
+            backend only the top rows are read, straight off the score index;
+            the text file is streamed keeping only the top rows in memory, and
+            corrupt lines are skipped and logged instead of crashing.
         Returns -- The nest list of leaderboard data (0 = int, 1 = str)
     '''
     
     global screen
+    global score_store
+
+    if LEADERBOARD_BACKEND == "sqlite":
+        score_store = leaderboard_store.LeaderboardStore()
+        return score_store.top_scores(LEADERBOARD_ROWS)
 
     leaderboard_list = []
     
     def dismiss_message(x,y):
-        return leaderboard_error.hideturtle()
+        # Hand clicks back to the board so this only runs once
+        screen.onscreenclick(click_board)
+        get_images().release("Resources/leaderboard_error.gif")
+        return get_turtles().release(leaderboard_error)
 
     try:
-        with open('leaderboard.txt', 'r') as leaderboard_file:
-            for entry in leaderboard_file:
-                temp_leaderboard_list = entry.split(' : ')
-                temp_leaderboard_list[0] = int(temp_leaderboard_list[0])
-                temp_leaderboard_list[1] = temp_leaderboard_list[1].strip("\n")
-                leaderboard_list.append(temp_leaderboard_list)
+        leaderboard_list, corrupt = leaderboard_store.read_legacy_top_k(
+            'leaderboard.txt', LEADERBOARD_ROWS)
+        if corrupt > 0:
+            error_logger(str(datetime.now()) + (f" Error: Skipped {corrupt} corrupt"
+                         " line(s) in 'leaderboard.txt' | LOCATION: get_leaderboard()"))
 
     except FileNotFoundError:
-        screen.addshape("Resources/leaderboard_error.gif")
-        leaderboard_error = turtle.Turtle()
+        get_images().acquire("Resources/leaderboard_error.gif")
+        leaderboard_error = get_turtles().get()
         leaderboard_error.shape("Resources/leaderboard_error.gif")
         
         leaderboard_error.showturtle()
@@ -874,14 +1500,23 @@ def get_leaderboard():
     return leaderboard_list
 
 
-def edit_leaderboard(player, score):
+def edit_leaderboard(player, score, puzzle = None, move_limit = None):
     '''
     Function -- Takes in a player name (str) and score (int) from a player who won
-            and appends it to the leaderboard text file.
-        Parameters -- player_name (str) and player score (int)
+            and appends it to the leaderboard. The sqlite backend also records
+            the puzzle and move limit the score was made with, and says when
+            it beats every earlier score on that puzzle at any move limit.
+        Parameters -- player_name (str), player score (int), puzzle name (str)
+            and move limit (int)
     '''
-    with open('leaderboard.txt', 'a') as leaderboard_file:
-        leaderboard_file.write(f"{score} : {player}\n")
+    if LEADERBOARD_BACKEND == "sqlite":
+        puzzle_best = score_store.best_score(puzzle)
+        score_store.add_score(player, score, puzzle, move_limit)
+        if puzzle is not None and (puzzle_best is None or score < puzzle_best):
+            print(f"New best score for {puzzle}: {score} moves")
+    else:
+        with open('leaderboard.txt', 'a') as leaderboard_file:
+            leaderboard_file.write(f"{score} : {player}\n")
 
     print(f"Added {player} to leaderboard")
 
@@ -908,7 +1543,7 @@ def display_leaderboard(sorted_lb):
         Parameters -- sorted_lb -- a nested list (each nest being a list of score (int,
             index 0) and player (str, index 1)
     '''
-    title = turtle.Turtle()
+    title = get_turtles().get()
     title.speed(0)
     title.hideturtle()
 
@@ -925,16 +1560,12 @@ def display_leaderboard(sorted_lb):
     title.goto(145, 270)
     title.setheading(270)
 
-    placement = 0
-
-    # For aesthetics/clarity, only display the Top 18 on Leaderboard
-    short_lb_list = sorted_lb[:17]
+    # For aesthetics/clarity, only display the Top 17 on Leaderboard
+    short_lb_list = sorted_lb[:LEADERBOARD_ROWS]
+    placements = leaderboard_store.leaderboard_placements(short_lb_list)
 
     for i in range(len(short_lb_list)):
-        if i > 0 and sorted_lb[i-1][0] == sorted_lb[i][0]:
-            placement += 0
-        else:
-            placement += 1
+        placement = placements[i]
         score = sorted_lb[i][0]
         player = sorted_lb[i][1]
         title.write(f"{placement}\t{player} \t{score}",
@@ -955,26 +1586,30 @@ def end_round(winner, score):
     global screen
     global player_name
     global score_to_beat
+    global game_board
+
+    # The round is over, so its replay is complete
+    game_board.stop_recording()
+    clear_screen()
     
-    screen.clearscreen()
-    
-    win_lose_message = turtle.Turtle()
+    win_lose_message = get_turtles().get()
     win_lose_message.hideturtle()
 
     if winner == True:
-        screen.addshape("Resources/winner.gif")
+        get_images().acquire("Resources/winner.gif")
         win_lose_message.shape("Resources/winner.gif")
         win_lose_message.showturtle()
 
         # send name, score to be written on the leaderboard
-        edit_leaderboard(player_name, score)
+        edit_leaderboard(player_name, score, game_board.name,
+                         game_board.move_limit)
         
     elif winner == False:
-        screen.addshape("Resources/Lose.gif")
+        get_images().acquire("Resources/Lose.gif")
         win_lose_message.shape("Resources/Lose.gif")
         win_lose_message.showturtle()
 
-    result_text = turtle.Turtle()
+    result_text = get_turtles().get()
     result_text.hideturtle()
     result_text.penup()
     result_text.color("purple")
@@ -1001,15 +1636,27 @@ def end_game():
     '''
     global screen
 
-    screen.clearscreen()
+    # Quitting mid-game still leaves a complete replay
+    try:
+        game_board.stop_recording()
+    except (AttributeError, NameError):
+        pass
+
+    print(get_images())
+    print(get_turtles())
+    print(get_renderer())
+    print(get_animator())
+    if hints is not None:
+        print(hints)
+    clear_screen()
     
-    screen.addshape("Resources/credits.gif")
+    get_images().acquire("Resources/credits.gif")
 
-    end_credits = turtle.Turtle()
+    end_credits = get_turtles().get()
     end_credits.shape("Resources/credits.gif")
     end_credits.showturtle()
 
-    exit_text = turtle.Turtle()
+    exit_text = get_turtles().get()
     exit_text.hideturtle()
     exit_text.penup()
     exit_text.goto(0, -360)
@@ -1039,15 +1686,20 @@ def invalid_board(error_msg):
         Callback Function -- Called when clicking file_error image in Turtle dispaly.
             Makes the image hide and also calls loading board function again.
         '''
-        return process_error.hideturtle(), load_new_board()
+        get_images().release("Resources/file_error.gif")
+        screen.onscreenclick(click_board)
+        return get_turtles().release(process_error), load_new_board()
     
-    screen.addshape("Resources/file_error.gif")
-    process_error = turtle.Turtle()
+    get_images().acquire("Resources/file_error.gif")
+    process_error = get_turtles().get()
     process_error.shape("Resources/file_error.gif")
     process_error.showturtle()
 
     process_error.onclick(dismiss_error_msg)
 
+    # The board underneath ignores clicks until the message is dismissed
+    screen.onscreenclick(None)
+
 
 def error_logger(error : str):
     '''
@@ -1090,7 +1742,8 @@ def initial_setup():
     try:
         while move_limit < LOWER_MOVE_BOUND or move_limit > UPPER_MOVE_BOUND: 
             move_limit = int(screen.textinput("CS5001 Puzzle Slider - Moves",
-                      "Enter the # of moves allowed [5-200 or default 10] "))
+                      f"Enter the # of moves allowed [{LOWER_MOVE_BOUND}-"
+                      f"{UPPER_MOVE_BOUND} or default 10] "))
     except TypeError:
         
         # Default of 10 if player presses "Cancel"
@@ -1132,15 +1785,84 @@ def main():
     screen.setup(SCREEN_HEIGHT, SCREEN_WIDTH)
     screen.title("CS 5001 Sliding Puzzle Game")
 
-    screen.addshape("Resources/splash_screen.gif")
+    get_images().acquire("Resources/splash_screen.gif")
 
-    splash = turtle.Turtle()
+    splash = get_turtles().get()
     splash.shape("Resources/splash_screen.gif")
+    splash.showturtle()
+
+    def hide_splash():
+        get_images().release("Resources/splash_screen.gif")
+        get_turtles().release(splash)
 
-    screen.ontimer(splash.hideturtle, t=SPLASH_TIMER)
+    screen.ontimer(hide_splash, t=SPLASH_TIMER)
     screen.ontimer(initial_setup, t= SPLASH_TIMER)
 
+
+def watch_replay(path):
+    '''
+    Function -- Command-line entry point for watching a recorded game,
+        e.g. "python puzzle_game.py replay Replays/mario_20211201-120000.replay".
+        The board starts as it was shuffled; Right and Left step one move,
+        Up and Down jump a whole checkpoint block, Home and End go to the
+        start and the finish. Every jump reads one checkpoint from the
+        file, so it takes the same time however long the game was.
+        Parameters -- path (str) of the replay file
+    '''
+    global screen
+    global game_board
+
+    replay = replay_log.ReplayReader(path)
+    print(replay)
+
+    screen = turtle.Screen()
+    screen.setup(SCREEN_HEIGHT, SCREEN_WIDTH)
+    screen.title(f"CS 5001 Sliding Puzzle Game - {replay}")
+
+    draw_outlines(-450, 450, 10, "black", 550, 700)
+    draw_outlines(-450, -315, 10, "black", 875, 115)
+
+    game_board = Board(replay.puz, replay.move_limit, replay.seed, replay)
+    if game_board.valid == False:
+        return
+
+    keys = {"Right": 1, "Left": -1, "Up": replay.interval,
+            "Down": -replay.interval, "Home": -len(replay),
+            "End": len(replay)}
+    for key, moves in keys.items():
+        screen.onkey(lambda moves = moves: step_replay(moves), key)
+    screen.listen()
+
+
+def step_replay(moves):
+    '''
+    Callback Function -- Moves the replay on screen forward or back,
+        stopping at its first and last moves
+        Parameters -- moves (int) to go forward, negative to go back
+    '''
+    last = len(game_board.replay)
+    move = min(max(game_board.player_moves + moves, 0), last)
+    if move != game_board.player_moves:
+        game_board.show_replay_move(move)
+        print(f"Replay: move {move} of {last}")
+
+
+def batch_solve():
+    '''
+    Function -- Command-line entry point for solving a whole file of boards
+        offline across every core, e.g.
+        "python puzzle_game.py solve boards.txt -o results.jsonl".
+        No window is opened; see batch_solver.py for the options.
+    '''
+    batch_solver.main(sys.argv[2:])
+
     
 if __name__ == "__main__":
-    main()
-turtle.done()
+    if sys.argv[1:2] == ["solve"]:
+        batch_solve()
+    elif sys.argv[1:2] == ["replay"] and len(sys.argv) > 2:
+        watch_replay(sys.argv[2])
+        turtle.done()
+    else:
+        main()
+        turtle.done()
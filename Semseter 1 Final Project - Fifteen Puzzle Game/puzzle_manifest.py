@@ -0,0 +1,176 @@
+'''
+Bryan Dumond
+CS 5001 - Fall 2021
+Final Project - 15 Sliding Puzzle Game (Puzzle Manifest)
+
+Reads and checks each .puz file once and remembers the result. An entry
+holds the file's fields, whether its image folder exists and the first
+image path that is missing (if any), keyed by the .puz path and stamped
+with the modification times of the .puz file and its image folder. The
+cache is saved to "puzzle_manifest.json" so later runs start warm, and an
+entry is only rebuilt when one of those times changes. Adding, removing
+or renaming a file in a folder always changes the folder's time.
+'''
+
+import json, os
+
+
+'''
+Constants -- All constants used by the manifest cache stored here
+'''
+
+MANIFEST_FILE = "puzzle_manifest.json"
+
+IMAGE_DIR = "Images"
+
+PUZZLE_EXTENSION = ".puz"
+
+MANIFEST_VERSION = 1  # Bump when the entry layout changes
+
+
+'''
+Classes - The manifest cache
+'''
+
+class PuzzleManifest:
+    '''
+    Class --- Cached, pre-checked data for every .puz file the game has
+        loaded. Each lookup costs two os.stat() calls when nothing has
+        changed, instead of reading the .puz file and listing three
+        directories twice over.
+    '''
+
+    def __init__(self, address = MANIFEST_FILE):
+        '''
+        Attributes -- takes in the path (str) of the saved cache. A
+            missing or unreadable cache just starts empty.
+        '''
+        self.address = address
+        self.entries = {}
+        self.listing = None  # (directory time, list of .puz file names)
+        self.hits = 0
+        self.misses = 0
+
+        try:
+            with open(address, mode = "r") as manifest_file:
+                saved = json.load(manifest_file)
+            if saved.get("version") == MANIFEST_VERSION:
+                self.entries = saved["entries"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            self.entries = {}
+
+    def lookup(self, address):
+        '''
+        Method -- Returns the checked entry for a .puz file, reading and
+            checking it again only if it or its image folder changed
+          Parameters -- address (str) path of the .puz file
+          Returns -- entry (dict) with "fields" (dict of the .puz lines),
+            "image_dir" (bool, whether Images/<name> exists) and "missing"
+            (str of the first missing image path, or None). Raises
+            FileNotFoundError if the .puz file does not exist.
+        '''
+        puz_time = os.stat(address).st_mtime_ns
+        entry = self.entries.get(address)
+        if entry is not None and entry["puz_time"] == puz_time:
+            name = entry["fields"].get("name", "")
+            if entry["image_time"] == folder_time(f"{IMAGE_DIR}/{name}"):
+                self.hits += 1
+                return entry
+
+        self.misses += 1
+        entry = build_entry(address, puz_time)
+        self.entries[address] = entry
+        self.save()
+        return entry
+
+    def puzzle_files(self, directory = "."):
+        '''
+        Method -- Lists the .puz files in a directory, listing it again
+            only when the directory itself has changed
+          Parameters -- directory (str), the current one by default
+          Returns -- a list (list) of .puz file names (str)
+        '''
+        directory_time = folder_time(directory)
+        if self.listing is None or self.listing[0] != directory_time:
+            names = [each for each in os.listdir(directory)
+                     if each.endswith(PUZZLE_EXTENSION)]
+            self.listing = (directory_time, names)
+        return self.listing[1]
+
+    def save(self):
+        '''
+        Method -- Writes the cache to disk. The file is replaced in one
+            step so a crash never leaves half a cache behind. A cache that
+            cannot be written only costs the next run its head start.
+        '''
+        temp_address = self.address + ".tmp"
+        try:
+            with open(temp_address, mode = "w") as manifest_file:
+                json.dump({"version": MANIFEST_VERSION,
+                           "entries": self.entries}, manifest_file)
+            os.replace(temp_address, self.address)
+        except OSError as error:
+            print(f"Could not save {self.address}: {error}")
+
+
+'''
+General Functions - Reading and checking a single .puz file
+'''
+
+def folder_time(address):
+    '''
+    Function -- Returns a folder's modification time in nanoseconds
+        (int), or None if it does not exist
+    '''
+    try:
+        return os.stat(address).st_mtime_ns
+    except OSError:
+        return None
+
+
+def read_puzzle_file(address):
+    '''
+    Function -- Reads in a .puz file and organizes its data into a
+            dictionary (dict) of its "key: value" lines
+        Parameters -- A str representing a file path
+        Returns -- a puzzle dictionary (dict)
+    '''
+    puzzle_dict = {}
+
+    with open(address, mode = 'r') as puzzle_data:
+        for line in puzzle_data:
+            temp_puz_list = line.split(": ")
+
+            puzzle_dict[temp_puz_list[0]] = temp_puz_list[1].strip("\n")
+    return puzzle_dict
+
+
+def build_entry(address, puz_time):
+    '''
+    Function -- Reads a .puz file and checks every image path it names
+            against a single listing of its image folder
+        Parameters -- address (str) of the .puz file and its
+                      modification time (int nanoseconds)
+        Returns -- a manifest entry (dict), see PuzzleManifest.lookup()
+    '''
+    fields = read_puzzle_file(address)
+    name = fields.get("name", "")
+    tile_folder = f"{IMAGE_DIR}/{name}"
+    image_time = folder_time(tile_folder)
+
+    image_dir = image_time is not None and name in os.listdir(IMAGE_DIR)
+    missing = None
+    if image_dir:
+        existing = {f"{tile_folder}/{each}" for each in os.listdir(tile_folder)}
+
+        # Tile images in order, then the thumbnail, as the board uses them
+        paths = [fields.get(str(i+1)) for i in range(int(fields["number"]))]
+        paths.append(fields.get("thumbnail"))
+
+        for path in paths:
+            if path not in existing:
+                missing = path
+                break
+
+    return {"puz_time": puz_time, "image_time": image_time,
+            "fields": fields, "image_dir": image_dir, "missing": missing}
@@ -0,0 +1,447 @@
+'''
+Bryan Dumond
+CS 5001 - Fall 2021
+Final Project - 15 Sliding Puzzle Game (Solver)
+
+Finds shortest move sequences for the sliding puzzle with IDA* search.
+Boards are plain tuples of tile numbers read left to right, top to bottom,
+with 0 standing in for the blank, so nothing here needs a Turtle screen.
+'''
+
+import sys, time
+
+from puzzle_state import BLANK, neighbour_table
+from state_rank import is_solvable  # Parity check, used by every solver
+
+
+'''
+Constants -- All constants used by the solver stored here
+'''
+
+FOUND = -1  # Returned by the search once the goal is reached
+LIMIT_REACHED = -2  # Returned when the node budget or time limit ran out
+STOPPED = -3  # Returned when another worker asked the search to stop
+
+CLOCK_MASK = 4095  # Time limit and stop flag checked every 4096 nodes
+
+# Names accepted by make_heuristic()
+LINEAR_CONFLICT = "linear_conflict"
+PATTERN_DATABASE = "pattern_database"
+
+MAX_OPTIMAL_COLUMNS = 4  # Wider boards are solved by reduction_solver.py
+
+
+'''
+Classes - The search result and the Manhattan/linear-conflict heuristic
+'''
+
+class SearchLimitReached(Exception):
+    '''
+    Exception --- Raised inside the search to unwind it once the node
+        budget or time limit has been spent, or it was told to stop.
+        Carries LIMIT_REACHED or STOPPED as its argument.
+    '''
+
+
+class SolverResult:
+    '''
+    Class --- Holds everything a single solver run reports: the moves
+        found, how many nodes were expanded and how long it took. Moves
+        are the cell numbers (int) of the tiles slid into the blank, in
+        the order they have to be clicked.
+    '''
+
+    def __init__(self, moves, nodes, elapsed, optimal = True):
+        '''
+        Attributes -- moves is a list of cell numbers (or None if the
+            search gave up at its node or time limit), nodes is the number (int)
+            of expanded nodes, elapsed is the search time in seconds and
+            optimal (bool) is False for a solution that may not be shortest
+        '''
+        self.moves = moves
+        self.nodes = nodes
+        self.elapsed = elapsed
+        self.optimal = optimal
+
+    def nodes_per_second(self):
+        '''
+        Method -- Returns the solver throughput (float) of this run
+        '''
+        if self.elapsed == 0:
+            return float(self.nodes)
+        return self.nodes / self.elapsed
+
+    def __str__(self):
+        if self.moves is None:
+            length = "no solution"
+        elif self.optimal == False:
+            length = f"{len(self.moves)} moves (not optimal)"
+        else:
+            length = f"{len(self.moves)} moves"
+        return (f"{length} | {self.nodes} nodes in {self.elapsed:.3f}s "
+                f"({self.nodes_per_second():.0f} nodes/s)")
+
+
+class ManhattanLinearConflict:
+    '''
+    Class --- Admissible heuristic made of the Manhattan distance of every
+        tile plus the linear-conflict penalty of every row and column.
+        Besides estimating a whole board it can tell the search how the
+        estimate changes after a single slide, which is what keeps IDA*
+        fast.
+    '''
+
+    def __init__(self, columns):
+        '''
+        Attributes -- takes in the number (int) of columns on the square
+            board. Distance tables and the per-line conflict caches are
+            built here once.
+        '''
+        self.columns = columns
+        self.number = columns * columns
+
+        # distance[tile][cell] -- Manhattan distance from cell to tile's goal
+        self.distance = [[0] * self.number for tile in range(self.number)]
+        self.goal_row = [0] * self.number
+        self.goal_column = [0] * self.number
+        for tile in range(1, self.number):
+            goal = tile - 1
+            self.goal_row[tile] = goal // columns
+            self.goal_column[tile] = goal % columns
+            for cell in range(self.number):
+                self.distance[tile][cell] = (
+                    abs(cell // columns - goal // columns) +
+                    abs(cell % columns - goal % columns))
+
+        # One cache per row and per column, keyed by the tuple of its tiles
+        self.row_conflicts = [{} for i in range(columns)]
+        self.column_conflicts = [{} for i in range(columns)]
+
+    def line_conflict(self, line, goal_lines, goal_offsets, index):
+        '''
+        Method -- Computes the linear-conflict penalty of one row or
+            column: two moves for every tile that has to leave the line
+            so the rest can pass each other.
+          Parameters -- line (tuple) of tiles in the row/column, the goal
+            line and goal offset tables to use and the line index (int)
+          Returns -- the penalty (int)
+        '''
+        offsets = []
+        for tile in line:
+            if tile != BLANK and goal_lines[tile] == index:
+                offsets.append(goal_offsets[tile])
+
+        # Tiles that can stay form the longest increasing run of offsets
+        longest = [1] * len(offsets)
+        for i in range(len(offsets)):
+            for j in range(i):
+                if offsets[j] < offsets[i] and longest[j] + 1 > longest[i]:
+                    longest[i] = longest[j] + 1
+        keep = max(longest) if longest else 0
+
+        return 2 * (len(offsets) - keep)
+
+    def row_conflict(self, tiles, row):
+        '''
+        Method -- Returns the cached linear-conflict penalty (int) of a row
+        '''
+        start = row * self.columns
+        line = tuple(tiles[start:start + self.columns])
+        cache = self.row_conflicts[row]
+        if line not in cache:
+            cache[line] = self.line_conflict(line, self.goal_row,
+                                             self.goal_column, row)
+        return cache[line]
+
+    def column_conflict(self, tiles, column):
+        '''
+        Method -- Returns the cached linear-conflict penalty (int) of a column
+        '''
+        line = tuple(tiles[column::self.columns])
+        cache = self.column_conflicts[column]
+        if line not in cache:
+            cache[line] = self.line_conflict(line, self.goal_column,
+                                             self.goal_row, column)
+        return cache[line]
+
+    def estimate(self, tiles):
+        '''
+        Method -- Estimates the number of moves left for a whole board
+          Parameters -- tiles -- a list or tuple of tile numbers
+          Returns -- the estimate (int)
+        '''
+        total = 0
+        for cell in range(self.number):
+            tile = tiles[cell]
+            if tile != BLANK:
+                total += self.distance[tile][cell]
+
+        for i in range(self.columns):
+            total += self.row_conflict(tiles, i)
+            total += self.column_conflict(tiles, i)
+        return total
+
+    def delta(self, tiles, tile, source, target):
+        '''
+        Method -- Works out how the estimate changes after a tile slides
+            from source into the blank at target. Only the tile's own goal
+            row (vertical slide) or goal column (horizontal slide) can gain
+            or lose a conflict, so at most one line is looked at.
+          Parameters -- tiles -- the board after the slide, tile -- the
+            tile number that moved, source/target -- cell numbers (int)
+          Returns -- the change (int) to add to the previous estimate
+        '''
+        change = self.distance[tile][target] - self.distance[tile][source]
+        columns = self.columns
+
+        if source - target == columns or target - source == columns:
+            row = self.goal_row[tile]
+            if row == source // columns:
+                # Tile left its goal row
+                position = source
+            elif row == target // columns:
+                # Tile entered its goal row
+                position = target
+            else:
+                return change
+            after = self.row_conflict(tiles, row)
+            saved = tiles[position]
+            tiles[position] = tile if position == source else BLANK
+            before = self.row_conflict(tiles, row)
+            tiles[position] = saved
+        else:
+            column = self.goal_column[tile]
+            if column == source % columns:
+                position = source
+            elif column == target % columns:
+                position = target
+            else:
+                return change
+            after = self.column_conflict(tiles, column)
+            saved = tiles[position]
+            tiles[position] = tile if position == source else BLANK
+            before = self.column_conflict(tiles, column)
+            tiles[position] = saved
+
+        return change + after - before
+
+
+'''
+General Functions - Board helpers and the IDA* search itself
+'''
+
+def make_heuristic(name, columns, build = False):
+    '''
+    Function -- Creates the heuristic the solver should use by name. For
+            boards up to 3x3 PATTERN_DATABASE means the exact distance
+            table, in effect a pattern database of every tile. Neither
+            that table (a few seconds) nor the 4x4 pattern database (a few
+            minutes) is built here unless asked; until a table is on disk
+            Manhattan distance + linear conflict is used instead, with a
+            note on stderr so results written to stdout stay clean.
+        Parameters -- name -- LINEAR_CONFLICT or PATTERN_DATABASE (str),
+                      columns -- the number (int) of columns on the board,
+                      build -- whether a missing exact table may be built
+                        (bool); only worth it off the screen's thread
+        Returns -- a heuristic object for ida_star()
+    '''
+    if name == PATTERN_DATABASE and columns <= 3:
+        import distance_table
+        try:
+            return distance_table.ExactDistanceHeuristic(columns,
+                                                         build = build)
+        except FileNotFoundError as missing:
+            print(f"Distance table '{missing}' not built yet, using "
+                  "linear conflict (run distance_table.py to build it)",
+                  file = sys.stderr)
+    elif name == PATTERN_DATABASE and columns == 4:
+        import pattern_database
+        try:
+            return pattern_database.PatternDatabaseHeuristic(columns,
+                                                             build = False)
+        except FileNotFoundError as missing:
+            print(f"Pattern database '{missing}' not built yet, using "
+                  "linear conflict (run pattern_database.py to build it)",
+                  file = sys.stderr)
+    elif name not in (LINEAR_CONFLICT, PATTERN_DATABASE):
+        raise ValueError(f"Unknown heuristic '{name}'")
+
+    return ManhattanLinearConflict(columns)
+
+
+def bounded_search(tiles, columns, heuristic, bound, moves_made = 0,
+                   previous = None, max_nodes = None, deadline = None,
+                   stop = None, tick = None):
+    '''
+    Function -- Runs one depth-first pass of IDA*: every path is followed
+            until moves made + estimate goes over the bound. ida_star()
+            runs one pass per bound; the parallel solver runs one per
+            subtree, starting part-way down with moves_made > 0.
+        Parameters -- tiles -- the board (list, changed in place and put
+                        back unless a solution is found),
+                      columns -- the number (int) of columns on the board,
+                      heuristic -- object with estimate() and delta(),
+                      bound -- the largest total (int) allowed this pass,
+                      moves_made -- moves (int) already made to get here,
+                      previous -- cell (int) the blank just left, or None,
+                      max_nodes -- optional node budget (int),
+                      deadline -- optional time.perf_counter() value,
+                      stop -- optional shared flag with a .value that
+                        another process or thread sets to end the pass early,
+                      tick -- optional function called with the nodes (int)
+                        expanded so far each time the clock is checked
+        Returns -- a tuple of the outcome, the moves (list) from tiles to
+            the goal, and the number (int) of nodes expanded. The outcome
+            is FOUND, LIMIT_REACHED, STOPPED or else the smallest total
+            (int) that went over the bound.
+    '''
+    neighbours = neighbour_table(columns)
+    delta = heuristic.delta
+    undo = getattr(heuristic, "undo", None)
+    path = []
+    nodes = 0
+    limit = max_nodes if max_nodes is not None else float("inf")
+
+    def search(blank, moves_made, estimate, previous):
+        nonlocal nodes
+        total = moves_made + estimate
+        if total > bound:
+            return total
+        if estimate == 0:
+            return FOUND
+
+        nodes += 1
+        if nodes > limit:
+            raise SearchLimitReached(LIMIT_REACHED)
+        if nodes & CLOCK_MASK == 0:
+            if deadline is not None and time.perf_counter() > deadline:
+                raise SearchLimitReached(LIMIT_REACHED)
+            if stop is not None and stop.value:
+                raise SearchLimitReached(STOPPED)
+            if tick is not None:
+                tick(nodes)
+
+        minimum = float("inf")
+        for cell in neighbours[blank]:
+            if cell == previous:
+                continue
+
+            tile = tiles[cell]
+            tiles[blank] = tile
+            tiles[cell] = BLANK
+            path.append(cell)
+
+            result = search(cell, moves_made + 1,
+                            estimate + delta(tiles, tile, cell, blank),
+                            blank)
+            if result == FOUND:
+                return FOUND
+
+            path.pop()
+            tiles[cell] = tile
+            tiles[blank] = BLANK
+            if undo is not None:
+                undo(tile, cell, blank)
+            if result < minimum:
+                minimum = result
+        return minimum
+
+    estimate = heuristic.estimate(tiles)
+    try:
+        result = search(tiles.index(BLANK), moves_made, estimate, previous)
+    except SearchLimitReached as reason:
+        return reason.args[0], None, nodes
+
+    if result != FOUND:
+        return result, None, nodes
+    return FOUND, path, nodes
+
+
+def ida_star(state, columns, heuristic = None, max_nodes = None,
+             time_limit = None, stop = None, progress = None, tick = None):
+    '''
+    Function -- Finds a shortest solution for a board using iterative
+            deepening A*. Each pass is a depth-first search cut off once
+            moves made + heuristic estimate goes over the current bound.
+        Parameters -- state -- tuple of tile numbers (0 = blank),
+                      columns -- the number (int) of columns on the board,
+                      heuristic -- object with estimate() and delta()
+                        methods, plus undo() if it keeps its own state
+                        (defaults to ManhattanLinearConflict),
+                      max_nodes -- optional node budget (int); the search
+                        gives up with moves = None once it is spent,
+                      time_limit -- optional limit in seconds (float),
+                        handled the same way,
+                      stop -- optional flag with a .value; setting it ends
+                        the search within a few thousand nodes, again
+                        with moves = None,
+                      progress -- optional function called after every
+                        pass with the next bound (int) and nodes so far (int),
+                      tick -- optional function called with the nodes (int)
+                        so far every few thousand nodes, mid-pass included
+        Returns -- a SolverResult object
+    '''
+    start_time = time.perf_counter()
+
+    if not is_solvable(state, columns):
+        raise ValueError("Board cannot be solved: wrong permutation parity")
+
+    if heuristic is None:
+        heuristic = ManhattanLinearConflict(columns)
+
+    deadline = None
+    if time_limit is not None:
+        deadline = start_time + time_limit
+
+    tiles = list(state)
+    bound = heuristic.estimate(tiles)
+    nodes = 0
+    moves = None
+    pass_tick = None
+    if tick is not None:
+        pass_tick = lambda pass_nodes: tick(nodes + pass_nodes)
+    while True:
+        budget = None if max_nodes is None else max_nodes - nodes
+        result, path, pass_nodes = bounded_search(tiles, columns, heuristic,
+                                                  bound, max_nodes = budget,
+                                                  deadline = deadline,
+                                                  stop = stop, tick = pass_tick)
+        nodes += pass_nodes
+        if result == FOUND:
+            moves = path
+            break
+        if result == LIMIT_REACHED or result == STOPPED:
+            break
+        bound = result
+        if progress is not None:
+            progress(bound, nodes)
+
+    return SolverResult(moves, nodes, time.perf_counter() - start_time)
+
+
+def solution_bounds(state, columns, heuristic = None, max_nodes = None):
+    '''
+    Function -- Works out how few moves a board could possibly be solved
+            in, spending at most a small node budget. Every IDA* pass that
+            finishes proves no solution is shorter than the next bound, so
+            even an unfinished search gives a lower bound at least as good
+            as the heuristic's; a finished one gives the exact optimum.
+        Parameters -- state -- tuple of tile numbers (0 = blank),
+                      columns -- the number (int) of columns on the board,
+                      heuristic -- as for ida_star(),
+                      max_nodes -- optional node budget (int)
+        Returns -- a tuple of the lower bound (int) and the optimal number
+            of moves (int), or None for the optimum if the budget ran out
+    '''
+    if heuristic is None:
+        heuristic = ManhattanLinearConflict(columns)
+
+    passes = []
+    result = ida_star(state, columns, heuristic, max_nodes = max_nodes,
+                      progress = lambda bound, nodes: passes.append(bound))
+    if result.moves is not None:
+        return len(result.moves), len(result.moves)
+
+    if passes:
+        return passes[-1], None
+    return heuristic.estimate(list(state)), None
@@ -0,0 +1,338 @@
+'''
+Bryan Dumond
+CS 5001 - Fall 2021
+Final Project - 15 Sliding Puzzle Game (Board State)
+
+Turtle-free board engine. A PuzzleState packs a board into a bytearray of
+tile numbers plus the blank's cell, and can list, make and undo moves and
+check for a win without creating any objects, so games can be simulated,
+solved and tested without a screen. Shuffles here always come out solvable
+and are reproducible from a seed.
+'''
+
+import math, random
+
+import state_rank
+
+
+'''
+Constants -- All constants used for board states stored here
+'''
+
+BLANK = 0
+
+BITS_PER_CELL = 4  # pack() fits boards of up to 16 cells in one int
+
+# Move letters name the way a tile slides into the blank: "U" moves the
+# tile below the blank up. Values are (row, column) steps from the blank.
+MOVE_LETTERS = {"U": (1, 0), "D": (-1, 0), "L": (0, 1), "R": (0, -1)}
+
+_neighbour_tables = {}  # columns -> neighbour table, shared by every state
+
+
+'''
+Classes - The packed board state
+'''
+
+class PuzzleState:
+    '''
+    Class --- A board with no graphics attached. Tiles are numbered 1 to
+        number - 1 in solved order with 0 for the blank, stored one byte
+        per cell, left to right and top to bottom. A move is named by the
+        cell of the tile that slides into the blank. Tile n belongs in
+        cell n - 1, and a count of tiles out of place is kept up to date
+        on every move so a win can be spotted without looking at the board.
+    '''
+
+    def __init__(self, tiles, columns):
+        '''
+        Attributes -- takes in the tile numbers (any sequence of ints) and
+            the number (int) of columns on the square board
+        '''
+        self.columns = columns
+        self.number = columns * columns
+        self.tiles = bytearray(tiles)
+        self.blank = self.tiles.index(BLANK)
+        self.neighbours = neighbour_table(columns)
+
+        self.misplaced = 0
+        for cell in range(self.number):
+            tile = self.tiles[cell]
+            if tile != BLANK and tile != cell + 1:
+                self.misplaced += 1
+
+    def legal_moves(self):
+        '''
+        Method -- Returns the cells (tuple of ints) whose tiles can slide
+            into the blank. The tuple is shared, not built per call.
+        '''
+        return self.neighbours[self.blank]
+
+    def can_move(self, cell):
+        '''
+        Method -- Returns a boolean (bool) telling whether the tile at cell
+            is next to the blank
+        '''
+        return cell in self.neighbours[self.blank]
+
+    def move(self, cell):
+        '''
+        Method -- Slides the tile at cell into the blank. The move is not
+            checked; call can_move() first for untrusted input.
+          Returns -- the cell (int) the blank was in, which is the move
+            that undoes this one
+        '''
+        tiles = self.tiles
+        blank = self.blank
+        tile = tiles[cell]
+        tiles[blank] = tile
+        tiles[cell] = BLANK
+        self.blank = cell
+
+        # Only the moved tile can change from home to away or back
+        self.misplaced += (tile != blank + 1) - (tile != cell + 1)
+        return blank
+
+    def play(self, moves):
+        '''
+        Method -- Makes a whole sequence of moves. Every move is checked
+            before any is made, so a bad sequence leaves the board as it was.
+          Parameters -- moves -- a string of move letters or a list of
+            cells, see moves_to_cells()
+          Returns -- the cells (list) that were moved
+        '''
+        cells = moves_to_cells(moves, self.blank, self.columns)
+        for cell in cells:
+            self.move(cell)
+        return cells
+
+    def undo(self, previous):
+        '''
+        Method -- Takes back a move, given the cell move() returned
+        '''
+        self.move(previous)
+
+    def is_solved(self):
+        '''
+        Method -- Returns a boolean (bool) telling whether every tile is home
+        '''
+        return self.misplaced == 0
+
+    def to_tuple(self):
+        '''
+        Method -- Returns the board as a tuple of tile numbers, the format
+            used by the solver
+        '''
+        return tuple(self.tiles)
+
+    def key(self):
+        '''
+        Method -- Returns an immutable copy (bytes) of the board, usable as
+            a dictionary key for any board size
+        '''
+        return bytes(self.tiles)
+
+    def pack(self):
+        '''
+        Method -- Packs a board of up to 16 cells into one int, 4 bits per
+            cell (a 4x4 board fits in 64 bits)
+          Returns -- the packed board (int)
+        '''
+        packed = 0
+        for cell in range(self.number):
+            packed |= self.tiles[cell] << (BITS_PER_CELL * cell)
+        return packed
+
+    def rank(self):
+        '''
+        Method -- Returns the board's permutation rank (int), a stable ID
+            from 0 to number! - 1 for boards of any size (see state_rank.py)
+        '''
+        return state_rank.rank(self.tiles)
+
+    def copy(self):
+        '''
+        Method -- Returns a new PuzzleState with the same tiles
+        '''
+        return PuzzleState(self.tiles, self.columns)
+
+    def __eq__(self, other):
+        '''
+        EQ Method -- Two states are equal if their tiles are in the same
+            cells. Returns a boolean (bool).
+        '''
+        return self.columns == other.columns and self.tiles == other.tiles
+
+    def __str__(self):
+        rows = []
+        for row in range(self.columns):
+            start = row * self.columns
+            line = self.tiles[start:start + self.columns]
+            rows.append(" ".join(f"{tile:2}" for tile in line))
+        return "\n".join(rows)
+
+
+'''
+General Functions - Board helpers, shuffling and scramble generation
+'''
+
+def goal_tiles(number):
+    '''
+    Function -- Builds the solved board for a puzzle with the given number
+            of cells: tiles 1 to number - 1 in order, blank in the last cell
+        Parameters -- number -- the number (int) of cells on the board
+        Returns -- the solved board (tuple)
+    '''
+    return tuple(range(1, number)) + (BLANK,)
+
+
+def solved_state(columns):
+    '''
+    Function -- Creates a PuzzleState in the solved position
+        Parameters -- columns -- the number (int) of columns on the board
+        Returns -- a PuzzleState object
+    '''
+    return PuzzleState(goal_tiles(columns * columns), columns)
+
+
+def unpack(packed, columns):
+    '''
+    Function -- Rebuilds a PuzzleState from an int made by pack()
+        Parameters -- packed (int) board and columns (int)
+        Returns -- a PuzzleState object
+    '''
+    tiles = [(packed >> (BITS_PER_CELL * cell)) & 15
+             for cell in range(columns * columns)]
+    return PuzzleState(tiles, columns)
+
+
+def from_rank(index, columns):
+    '''
+    Function -- Rebuilds a PuzzleState from its rank()
+        Parameters -- index (int) rank and columns (int)
+        Returns -- a PuzzleState object
+    '''
+    return PuzzleState(state_rank.unrank(index, columns * columns), columns)
+
+
+def neighbour_table(columns):
+    '''
+    Function -- Lists, for every cell on a square board, the cells that
+            share an edge with it (the tiles that could slide into it).
+            Tables are built once per board width and then shared.
+        Parameters -- columns -- the number (int) of columns on the board
+        Returns -- a list (list) of tuples of cell numbers, indexed by cell
+    '''
+    if columns in _neighbour_tables:
+        return _neighbour_tables[columns]
+
+    table = []
+    for cell in range(columns * columns):
+        row, column = divmod(cell, columns)
+        cells = []
+        if row > 0:
+            cells.append(cell - columns)
+        if row < columns - 1:
+            cells.append(cell + columns)
+        if column > 0:
+            cells.append(cell - 1)
+        if column < columns - 1:
+            cells.append(cell + 1)
+        table.append(tuple(cells))
+
+    _neighbour_tables[columns] = table
+    return table
+
+
+def moves_to_cells(moves, blank, columns):
+    '''
+    Function -- Turns a move sequence into the cells to move, checking
+            that every move is legal from where the blank will be by then
+        Parameters -- moves -- a string of letters from MOVE_LETTERS (e.g.
+                        "UULDRR", either case) or a list of cells (int),
+                      blank -- the cell (int) the blank starts in,
+                      columns -- the number (int) of columns on the board
+        Returns -- a list (list) of cells (int). Raises ValueError naming
+            the first move that cannot be made.
+    '''
+    neighbours = neighbour_table(columns)
+    cells = []
+    for step, move in enumerate(moves):
+        if isinstance(move, str):
+            if move.upper() not in MOVE_LETTERS:
+                raise ValueError(f"Move {step + 1} '{move}' is not one of "
+                                 f"{''.join(MOVE_LETTERS)}")
+            rows, across = MOVE_LETTERS[move.upper()]
+            row, column = divmod(blank, columns)
+            row += rows
+            column += across
+            if row < 0 or row >= columns or column < 0 or column >= columns:
+                raise ValueError(f"Move {step + 1} '{move}' runs off the board")
+            cell = row * columns + column
+        else:
+            cell = move
+            if cell not in neighbours[blank]:
+                raise ValueError(f"Move {step + 1} (cell {cell}) is not next "
+                                 f"to the blank in cell {blank}")
+        cells.append(cell)
+        blank = cell
+    return cells
+
+
+def shuffled_indices(number, columns, seed = None, rng = None):
+    '''
+    Function -- Creates a random, solvable ordering of the indices 0 to
+            number - 1 in linear time. Index number - 1 is the blank. A
+            Fisher-Yates shuffle gives a uniformly random order; if
+            state_rank.is_solvable() finds it could never be solved, two
+            non-blank entries are swapped to fix the parity.
+        Parameters -- number -- the number (int) of cells on the board,
+                      columns -- the number (int) of columns on the board,
+                      seed -- optional seed (int) for a reproducible shuffle,
+                      rng -- optional random.Random to draw from instead
+        Returns -- A list (list) of shuffled integers (int), one per cell
+    '''
+    if rng is None:
+        rng = random.Random(seed)
+    draw = rng.randrange
+
+    indices = list(range(number))
+    for i in range(number - 1, 0, -1):
+        j = draw(i + 1)
+        indices[i], indices[j] = indices[j], indices[i]
+
+    blank = number - 1
+    tiles = [BLANK if index == blank else index + 1 for index in indices]
+    if not state_rank.is_solvable(tiles, columns):
+        first, second = (0, 1) if indices.index(blank) > 1 else (2, 3)
+        indices[first], indices[second] = indices[second], indices[first]
+
+    return indices
+
+
+def shuffled_state(number, columns, seed = None, rng = None):
+    '''
+    Function -- Creates a random solvable board in the solver's format:
+            tile numbers 1 to number - 1 with 0 for the blank
+        Parameters -- same as shuffled_indices()
+        Returns -- the board (tuple)
+    '''
+    indices = shuffled_indices(number, columns, seed, rng)
+    blank = number - 1
+    return tuple(BLANK if index == blank else index + 1 for index in indices)
+
+
+def generate_scrambles(count, number, seed = None):
+    '''
+    Function -- Generator that yields count random solvable boards, all
+            drawn from one seeded random stream so the whole batch can be
+            reproduced
+        Parameters -- count -- how many boards (int) to make,
+                      number -- the number (int) of cells on each board,
+                      seed -- optional seed (int) for the batch
+        Returns -- yields boards (tuple) one at a time
+    '''
+    rng = random.Random(seed)
+    columns = math.isqrt(number)
+    for i in range(count):
+        yield shuffled_state(number, columns, rng = rng)
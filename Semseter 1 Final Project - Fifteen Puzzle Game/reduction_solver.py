@@ -0,0 +1,365 @@
+'''
+Bryan Dumond
+CS 5001 - Fall 2021
+Final Project - 15 Sliding Puzzle Game (Reduction Solver)
+
+Solves boards of any size, quickly but not optimally, the way people do:
+finish the top row, then the left column, and carry on with the smaller
+board that is left until only 3x3 remains, which the exact distance
+table finishes in the fewest moves. Placed tiles are never touched
+again, so the work grows polynomially with the board instead of
+exponentially like IDA*.
+
+Most tiles are walked to their cell one step at a time, the blank going
+round the tile to the cell in front of it. The last two tiles of a row
+(or column) cannot be placed that way without undoing the row, so they
+are brought into a small window at its end and finished by a breadth-
+first search over where the two tiles and the blank are. Every result is
+reported against the linear conflict lower bound.
+
+Run this file directly to time it on random boards of every size:
+
+    python reduction_solver.py [boards]
+'''
+
+import random, sys, time
+from collections import deque
+
+import distance_table, puzzle_solver, puzzle_state, state_rank
+
+
+'''
+Constants -- All constants used by the reduction solver stored here
+'''
+
+EXACT_COLUMNS = 3  # The last block is finished from the exact table
+
+BENCHMARK_SEED = 5001
+
+
+'''
+Classes - A board being reduced
+'''
+
+class ReductionSolver:
+    '''
+    Class --- One board being solved by reduction. The board is changed
+        in place as moves are made; moves are named by the cell of the
+        tile that slides into the blank, as everywhere else.
+    '''
+
+    def __init__(self, state, columns):
+        '''
+        Attributes -- takes in the board (tuple of tile numbers, 0 =
+            blank) and the number (int) of columns
+        '''
+        self.columns = columns
+        self.number = columns * columns
+        self.tiles = list(state)
+        self.blank = self.tiles.index(puzzle_state.BLANK)
+        self.neighbours = puzzle_state.neighbour_table(columns)
+        self.locked = [False] * self.number
+        self.moves = []
+
+    def cell(self, row, column):
+        '''
+        Method -- Returns the cell number (int) at a row and column
+        '''
+        return row * self.columns + column
+
+    def slide(self, cell):
+        '''
+        Method -- Slides the tile in cell into the blank
+        '''
+        self.tiles[self.blank] = self.tiles[cell]
+        self.tiles[cell] = puzzle_state.BLANK
+        self.moves.append(cell)
+        self.blank = cell
+
+    def path(self, start, target, avoid = None):
+        '''
+        Method -- Finds a shortest route between two cells that stays off
+            locked cells and the avoid cell
+          Parameters -- start, target (int) cells and avoid (int or None)
+          Returns -- the cells (list) after start up to and including
+            target, or None if target cannot be reached
+        '''
+        came_from = {start: None}
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            if cell == target:
+                route = []
+                while cell != start:
+                    route.append(cell)
+                    cell = came_from[cell]
+                route.reverse()
+                return route
+            for step in self.neighbours[cell]:
+                if (step not in came_from and self.locked[step] == False and
+                        step != avoid):
+                    came_from[step] = cell
+                    queue.append(step)
+        return None
+
+    def move_blank(self, target, avoid = None):
+        '''
+        Method -- Walks the blank to a cell without crossing the avoid cell
+          Returns -- a boolean (bool) telling whether the blank got there
+        '''
+        route = self.path(self.blank, target, avoid)
+        if route is None:
+            return False
+        for cell in route:
+            self.slide(cell)
+        return True
+
+    def move_tile(self, tile, target):
+        '''
+        Method -- Walks a tile to a cell one step at a time, bringing the
+            blank round to the cell in front of it for every step. If the
+            blank is ever boxed in, the rest is left to search_tile().
+          Parameters -- tile (int) number and target (int) cell
+        '''
+        position = self.tiles.index(tile)
+        while position != target:
+            step = self.path(position, target)[0]
+            if self.move_blank(step, avoid = position) == False:
+                self.search_tile(tile, target)
+                return
+            self.slide(position)
+            position = step
+
+    def search_tile(self, tile, target):
+        '''
+        Method -- Moves a tile to a cell with a breadth-first search over
+            where the tile and the blank are, which finds a way whenever
+            one exists. Only needed when locked tiles box the blank in.
+          Parameters -- tile (int) number and target (int) cell
+        '''
+        start = (self.tiles.index(tile), self.blank)
+        came_from = {start: None}
+        queue = deque([start])
+        while queue:
+            position, blank = queue.popleft()
+            if position == target:
+                break
+            for cell in self.neighbours[blank]:
+                if self.locked[cell] == True:
+                    continue
+                moved = blank if cell == position else position
+                if (moved, cell) not in came_from:
+                    came_from[(moved, cell)] = (position, blank)
+                    queue.append((moved, cell))
+        else:
+            raise ValueError(f"Tile {tile} cannot reach cell {target}")
+
+        route = []
+        node = (position, blank)
+        while came_from[node] is not None:
+            route.append(node[1])
+            node = came_from[node]
+        for cell in reversed(route):
+            self.slide(cell)
+
+    def finish_pair(self, first, second, window):
+        '''
+        Method -- Puts the last two tiles of a line in place with a
+            breadth-first search over the cells of the two tiles and the
+            blank, all kept inside a small window of unlocked cells
+          Parameters -- first, second (int) the cells the two tiles belong
+                        in, window -- the cells (set) the search may use
+        '''
+        tile_1, tile_2 = first + 1, second + 1
+        start = (self.tiles.index(tile_1), self.tiles.index(tile_2),
+                 self.blank)
+        came_from = {start: None}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            place_1, place_2, blank = node
+            if place_1 == first and place_2 == second:
+                break
+            for cell in self.neighbours[blank]:
+                if cell not in window:
+                    continue
+                moved_1 = blank if cell == place_1 else place_1
+                moved_2 = blank if cell == place_2 else place_2
+                child = (moved_1, moved_2, cell)
+                if child not in came_from:
+                    came_from[child] = node
+                    queue.append(child)
+        else:
+            raise ValueError(f"Cells {first} and {second} cannot be finished")
+
+        route = []
+        while came_from[node] is not None:
+            route.append(node[2])
+            node = came_from[node]
+        for cell in reversed(route):
+            self.slide(cell)
+
+    def solve_line(self, line, staging, window):
+        '''
+        Method -- Places every tile of one row or column and locks them.
+            All but the last two are walked straight to their cells; the
+            last two are first walked to staging cells in the window, with
+            the blank after them, and then finished by finish_pair().
+          Parameters -- line -- the cells (list) of the row or column in
+                          order, ending at the board's edge,
+                        staging -- three cells (tuple) inside the window
+                          for the two tiles and then the blank; the first
+                          must not be next to a corner of what is left,
+                          or locking it there would leave a dead end a
+                          tile could be trapped in,
+                        window -- the cells (set) finish_pair() may use
+        '''
+        for cell in line[:-2]:
+            self.move_tile(cell + 1, cell)
+            self.locked[cell] = True
+
+        first, second = line[-2], line[-1]
+        if self.tiles[first] != first + 1 or self.tiles[second] != second + 1:
+            self.move_tile(first + 1, staging[0])
+            self.locked[staging[0]] = True
+            self.move_tile(second + 1, staging[1])
+            self.locked[staging[1]] = True
+            self.move_blank(staging[2])
+            self.locked[staging[0]] = False
+            self.locked[staging[1]] = False
+            self.finish_pair(first, second, window)
+
+        self.locked[first] = True
+        self.locked[second] = True
+
+    def solve_block(self, top):
+        '''
+        Method -- Finishes the last block of up to 3x3 cells, from top
+            down, in the fewest moves with the exact distance table. Its
+            tiles are renumbered as a small board of their own.
+          Parameters -- top (int) row and column where the block starts
+        '''
+        size = self.columns - top
+        if size < 2:
+            return
+        cells = [self.cell(top + row, top + column)
+                 for row in range(size) for column in range(size)]
+        local = {cell: index for index, cell in enumerate(cells)}
+
+        small = []
+        for cell in cells:
+            tile = self.tiles[cell]
+            small.append(puzzle_state.BLANK if tile == puzzle_state.BLANK
+                         else local[tile - 1] + 1)
+
+        table = distance_table.ExactDistanceHeuristic(size)
+        for move in table.solution(small):
+            self.slide(cells[move])
+
+    def solve(self):
+        '''
+        Method -- Reduces the board row and column at a time down to the
+            last 3x3 block and finishes that exactly
+          Returns -- the moves (list of cells) made
+        '''
+        last = self.columns - 1
+        for top in range(self.columns - EXACT_COLUMNS):
+            # Top row of what is left, staged in the rows just under it
+            row = [self.cell(top, column) for column in range(top, last + 1)]
+            window = {row[-2], row[-1]}
+            for down in (1, 2):
+                for column in (last - 2, last - 1, last):
+                    window.add(self.cell(top + down, column))
+            self.solve_line(row, (self.cell(top + 2, last - 1),
+                                  self.cell(top + 2, last),
+                                  self.cell(top + 1, last - 1)), window)
+
+            # Then its left column, the same way turned on its side
+            column = [self.cell(down, top) for down in range(top + 1, last + 1)]
+            window = {column[-2], column[-1]}
+            for across in (1, 2):
+                for down in (last - 2, last - 1, last):
+                    window.add(self.cell(down, top + across))
+            self.solve_line(column, (self.cell(last - 1, top + 2),
+                                     self.cell(last, top + 2),
+                                     self.cell(last - 1, top + 1)), window)
+
+        self.solve_block(max(self.columns - EXACT_COLUMNS, 0))
+        return self.moves
+
+
+'''
+General Functions - Solving and reporting
+'''
+
+def solve(state, columns):
+    '''
+    Function -- Solves a board of any size by reduction
+        Parameters -- state -- tuple of tile numbers (0 = blank),
+                      columns -- the number (int) of columns on the board
+        Returns -- a puzzle_solver.SolverResult marked not optimal; its
+            node count is the number of moves made, as no search tree is kept
+    '''
+    start_time = time.perf_counter()
+    if not puzzle_solver.is_solvable(state, columns):
+        raise ValueError("Board cannot be solved: wrong permutation parity")
+    moves = ReductionSolver(state, columns).solve()
+    return puzzle_solver.SolverResult(moves, len(moves),
+                                      time.perf_counter() - start_time,
+                                      optimal = False)
+
+
+def lower_bound(state, columns):
+    '''
+    Function -- Returns the linear conflict estimate (int) for a board, a
+            number of moves no solution can beat
+    '''
+    return puzzle_solver.ManhattanLinearConflict(columns).estimate(list(state))
+
+
+def report(state, columns, result = None):
+    '''
+    Function -- Measures a reduction solution against the lower bound and
+            prints how they compare, solving the board first unless a
+            solution is passed in
+        Parameters -- state (tuple), columns (int) and an optional
+                      SolverResult already found for the board
+        Returns -- a tuple of the SolverResult and the lower bound (int)
+    '''
+    if result is None:
+        result = solve(state, columns)
+    bound = lower_bound(state, columns)
+    ratio = len(result.moves) / bound if bound else 1.0
+    print(f"Reduction: {len(result.moves)} moves against a lower bound of "
+          f"{bound} ({ratio:.2f}x) in {result.elapsed * 1000:.1f} ms")
+    return result, bound
+
+
+def benchmark(count = 20, seed = BENCHMARK_SEED):
+    '''
+    Function -- Solves count random boards of every size from 2x2 to
+            10x10 and prints the mean time and length against the bound
+        Parameters -- count (int) boards per size and seed (int)
+    '''
+    rng = random.Random(seed)
+    for columns in range(2, 11):
+        elapsed = 0.0
+        length = 0
+        bound = 0
+        for i in range(count):
+            state = state_rank.random_solvable(columns, rng = rng)
+            result = solve(state, columns)
+            board = puzzle_state.PuzzleState(state, columns)
+            board.play(result.moves)
+            if board.is_solved() == False:
+                raise AssertionError(f"Not solved: {state}")
+            elapsed += result.elapsed
+            length += len(result.moves)
+            bound += lower_bound(state, columns)
+        print(f"{columns}x{columns}: {elapsed / count * 1000:7.2f} ms, "
+              f"{length / count:7.1f} moves, lower bound {bound / count:6.1f}"
+              f" ({length / bound:.2f}x)")
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
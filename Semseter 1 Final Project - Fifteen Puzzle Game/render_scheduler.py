@@ -0,0 +1,93 @@
+'''
+Bryan Dumond
+CS 5001 - Fall 2021
+Final Project - 15 Sliding Puzzle Game (Render Scheduler)
+
+Groups drawing into frames. Inside a frame turtle animation is off, so
+every step a turtle takes only changes data; the screen is redrawn once
+when the outermost frame ends. Things that need redrawing are marked
+under a key, and a key marked twice in one frame is only drawn once.
+'''
+
+from contextlib import contextmanager
+
+
+'''
+Classes - The scheduler
+'''
+
+class RenderScheduler:
+    '''
+    Class --- Collects the drawing for a turtle Screen into frames. Frames
+        can be nested; only the outermost one redraws the screen.
+    '''
+
+    def __init__(self, screen):
+        '''
+        Attributes -- takes in the turtle Screen to draw on
+        '''
+        self.screen = screen
+        self.depth = 0
+        self.tracing = None  # Tracer setting to put back after the frame
+        self.dirty = {}  # key -> function that redraws it, in mark order
+        self.frames = 0
+        self.drawn = 0
+        self.merged = 0
+
+    @contextmanager
+    def frame(self):
+        '''
+        Method -- Context manager for one frame: "with scheduler.frame():".
+            Dirty items are drawn and the screen updated when it ends.
+        '''
+        if self.depth == 0:
+            self.tracing = self.screen.tracer()
+            self.screen.tracer(0)
+        self.depth += 1
+        try:
+            yield self
+        finally:
+            self.depth -= 1
+            if self.depth == 0:
+                self.flush()
+
+    def mark(self, key, draw):
+        '''
+        Method -- Marks something as needing a redraw in this frame. Outside
+            a frame it is drawn straight away, in a frame of its own.
+          Parameters -- key -- anything hashable naming what changed,
+                        draw -- function that redraws it
+        '''
+        if self.depth == 0:
+            with self.frame():
+                self.mark(key, draw)
+            return
+
+        if key in self.dirty:
+            self.merged += 1
+        self.dirty[key] = draw
+
+    def flush(self):
+        '''
+        Method -- Draws every dirty item, then redraws the screen once and
+            puts animation back the way it was
+        '''
+        try:
+            while self.dirty:
+                dirty = self.dirty
+                self.dirty = {}
+                for draw in dirty.values():
+                    draw()
+                    self.drawn += 1
+        finally:
+            self.dirty = {}
+            self.frames += 1
+            self.screen.update()
+            self.screen.tracer(self.tracing)
+
+    def __str__(self):
+        '''
+        Method -- Returns a one-line summary (str) of the scheduler's use
+        '''
+        return (f"Frames: {self.frames} drawn | {self.drawn} items redrawn, "
+                f"{self.merged} merged into an earlier mark")
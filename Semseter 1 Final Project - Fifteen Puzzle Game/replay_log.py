@@ -0,0 +1,278 @@
+'''
+Bryan Dumond
+CS 5001 - Fall 2021
+Final Project - 15 Sliding Puzzle Game (Replay Log)
+
+Records every move of a game to a small binary file as it is played, so
+the game can be watched again later. A move only ever takes the blank
+one step up, down, left or right, so it is stored in 2 bits, four moves
+to a byte. The file starts with a header naming the .puz file, the
+shuffle seed, the move limit and the starting board. Moves follow in
+fixed-size blocks, each starting with a checkpoint of the board as it
+was before the block's first move. Any move can then be reached by
+reading one checkpoint and replaying at most one block, without going
+back to the start.
+
+    python replay_log.py FILE [MOVE]
+
+prints the header and the board after MOVE (default: the last move);
+"python puzzle_game.py replay FILE" opens it in the game window.
+'''
+
+import os, struct, sys, time
+from datetime import datetime
+
+import puzzle_state
+
+
+'''
+Constants -- All constants used by the replay log stored here
+'''
+
+REPLAY_DIR = "Replays"
+
+MAGIC = b"PZRP"
+VERSION = 1
+
+# magic, version, columns, checkpoint interval, seed, move limit, move
+# count and the length of the .puz name that follows
+HEADER = struct.Struct("<4sBBHIIIH")
+COUNT_OFFSET = 16  # Where the move count sits, filled in on close()
+OPEN_COUNT = 0xFFFFFFFF  # Move count of a file that was never closed
+
+CHECKPOINT_INTERVAL = 64  # moves per block, a multiple of 4
+
+MOVE_CODES = "UDLR"  # Move letter by 2-bit code, see puzzle_state.MOVE_LETTERS
+
+CODE_OF_STEP = {step: MOVE_CODES.index(letter)
+                for letter, step in puzzle_state.MOVE_LETTERS.items()}
+
+
+'''
+Classes - Writing and reading replays
+'''
+
+class ReplayWriter:
+    '''
+    Class --- A replay being recorded. Moves are written as soon as four
+        of them fill a byte, so a game that crashes loses at most three.
+    '''
+
+    def __init__(self, path, puz, seed, move_limit, initial, columns,
+                 interval = CHECKPOINT_INTERVAL):
+        '''
+        Attributes -- takes in the path (str) to write to, the .puz file
+            name (str), the shuffle seed (int), the move limit (int), the
+            starting board (tuple of tile numbers, 0 = blank), the number
+            (int) of columns and the moves (int) between checkpoints
+        '''
+        self.path = path
+        self.interval = interval
+        self.state = puzzle_state.PuzzleState(initial, columns)
+        self.count = 0
+        self.pending = 0  # Moves waiting for their byte to fill up
+        self.pending_count = 0
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        name = puz.encode("utf-8")
+        self.replay_file = open(path, mode = "wb")
+        self.replay_file.write(HEADER.pack(MAGIC, VERSION, columns, interval,
+                                           seed, move_limit, OPEN_COUNT,
+                                           len(name)))
+        self.replay_file.write(name)
+        self.replay_file.write(self.state.key())
+        self.replay_file.flush()
+
+    def record(self, cell):
+        '''
+        Method -- Adds one move to the replay
+          Parameters -- cell (int) of the tile that slid into the blank
+        '''
+        columns = self.state.columns
+        blank = self.state.blank
+        step = (cell // columns - blank // columns,
+                cell % columns - blank % columns)
+
+        if self.count % self.interval == 0:
+            self.replay_file.write(self.state.key())
+        self.state.move(cell)
+
+        self.pending |= CODE_OF_STEP[step] << (2 * self.pending_count)
+        self.pending_count += 1
+        self.count += 1
+        if self.pending_count == 4:
+            self.replay_file.write(bytes((self.pending,)))
+            self.replay_file.flush()
+            self.pending = 0
+            self.pending_count = 0
+
+    def close(self):
+        '''
+        Method -- Writes the last part-filled byte and the move count and
+            closes the file
+        '''
+        if self.replay_file.closed:
+            return
+        if self.pending_count > 0:
+            self.replay_file.write(bytes((self.pending,)))
+        self.replay_file.seek(COUNT_OFFSET)
+        self.replay_file.write(struct.pack("<I", self.count))
+        self.replay_file.close()
+
+
+class ReplayReader:
+    '''
+    Class --- A recorded replay, read from disk a block at a time. The
+        board after any move is worked out from the checkpoint of that
+        move's block.
+    '''
+
+    def __init__(self, path):
+        '''
+        Attributes -- takes in the path (str) of the replay file. Raises
+            ValueError if it is not a replay this version can read.
+        '''
+        self.path = path
+        self.replay_file = open(path, mode = "rb")
+
+        fields = self.replay_file.read(HEADER.size)
+        if len(fields) < HEADER.size:
+            self.replay_file.close()
+            raise ValueError(f"{path} is too short to be a replay")
+        (magic, version, self.columns, self.interval, self.seed,
+         self.move_limit, count, name_length) = HEADER.unpack(fields)
+        if magic != MAGIC or version != VERSION:
+            self.replay_file.close()
+            raise ValueError(f"{path} is not a version {VERSION} replay")
+
+        self.puz = self.replay_file.read(name_length).decode("utf-8")
+        self.number = self.columns * self.columns
+        self.initial = tuple(self.replay_file.read(self.number))
+
+        self.start = HEADER.size + name_length + self.number
+        self.block_size = self.number + self.interval // 4
+
+        # A file that was never closed holds every move in a full byte
+        if count == OPEN_COUNT:
+            count = 0
+            left = os.path.getsize(path) - self.start
+            while left > self.number:
+                count += min(left - self.number, self.interval // 4) * 4
+                left -= self.block_size
+        self.count = count
+
+    def state_at(self, move):
+        '''
+        Method -- Works out the board after a number of moves, from the
+            nearest checkpoint at or before it
+          Parameters -- move (int), from 0 to len(self)
+          Returns -- the board (tuple of tile numbers, 0 = blank)
+        '''
+        if move < 0 or move > self.count:
+            raise ValueError(f"Move {move} is out of range 0 to {self.count}")
+        if move == 0:
+            return self.initial
+
+        block = (move - 1) // self.interval
+        self.replay_file.seek(self.start + block * self.block_size)
+        board = puzzle_state.PuzzleState(
+            self.replay_file.read(self.number), self.columns)
+        board.play(self.read_letters(move - block * self.interval))
+        return board.to_tuple()
+
+    def read_letters(self, count):
+        '''
+        Method -- Reads the first moves of a block as move letters. The
+            file must already be positioned just after the checkpoint.
+          Parameters -- count (int) of moves to read
+          Returns -- a string (str) of move letters
+        '''
+        packed = self.replay_file.read((count + 3) // 4)
+        letters = []
+        for index in range(count):
+            code = packed[index // 4] >> (2 * (index % 4)) & 3
+            letters.append(MOVE_CODES[code])
+        return "".join(letters)
+
+    def moves(self):
+        '''
+        Method -- Returns every move of the replay as a string (str) of
+            move letters
+        '''
+        letters = []
+        for block in range((self.count + self.interval - 1) // self.interval):
+            self.replay_file.seek(self.start + block * self.block_size +
+                                  self.number)
+            letters.append(self.read_letters(
+                min(self.interval, self.count - block * self.interval)))
+        return "".join(letters)
+
+    def close(self):
+        '''
+        Method -- Closes the replay file
+        '''
+        self.replay_file.close()
+
+    def __len__(self):
+        return self.count
+
+    def __str__(self):
+        '''
+        Method -- Returns a one-line summary (str) of the replay
+        '''
+        return (f"Replay of {self.puz}: {self.count} moves, seed {self.seed}, "
+                f"move limit {self.move_limit}")
+
+
+'''
+General Functions - File names and the headless viewer
+'''
+
+def replay_path(puz, directory = REPLAY_DIR):
+    '''
+    Function -- Builds a new replay file name from the .puz name and the
+            current time, numbered if boards were loaded in the same second
+        Parameters -- puz (str) file name and the directory (str)
+        Returns -- a file path (str) that does not exist yet
+    '''
+    name = os.path.splitext(os.path.basename(puz))[0]
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(directory, f"{name}_{stamp}.replay")
+    number = 1
+    while os.path.exists(path):
+        number += 1
+        path = os.path.join(directory, f"{name}_{stamp}_{number}.replay")
+    return path
+
+
+def main(argv = None):
+    '''
+    Function -- Command-line entry point: prints a replay's header and
+            the board after a given move
+        Parameters -- argv -- list (list) of argument strings, defaults
+            to the ones the program was started with
+    '''
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv:
+        print("Usage: python replay_log.py FILE [MOVE]")
+        return
+
+    replay = ReplayReader(argv[0])
+    move = int(argv[1]) if len(argv) > 1 else len(replay)
+
+    start_time = time.perf_counter()
+    state = replay.state_at(move)
+    elapsed = time.perf_counter() - start_time
+
+    print(replay)
+    print(f"Board after move {move} (found in {elapsed * 1000:.2f} ms):")
+    print(puzzle_state.PuzzleState(state, replay.columns))
+    replay.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+'''
+Bryan Dumond
+CS 5001 - Fall 2021
+Final Project - 15 Sliding Puzzle Game (Scramble Pool)
+
+Makes boards of a known difficulty: every board here comes with the
+exact number of moves its shortest solution takes. For boards up to 3x3
+that number is read from the exact distance tables, so boards at any
+distance can be listed outright. 4x4 boards are made by walking randomly
+away from the solved board (or drawing uniformly, for the hardest
+bands), then solved with IDA* across every core; boards outside the band
+or over the node budget are thrown away.
+
+Finished boards are stored by length in the "Databases" folder, one
+fixed-size permutation rank per board (see state_rank.py), so drawing
+one is a single seek and read however big the pool is. The game draws from
+these pools to match boards to the move limit.
+
+    python scramble_pool.py COLUMNS LOW HIGH COUNT [WORKERS]
+
+adds COUNT boards for every length from LOW to HIGH.
+'''
+
+import math, multiprocessing, os, random, sys, time, types
+
+import distance_table, puzzle_solver, puzzle_state, state_rank
+from pattern_database import DATABASE_DIR, UNSEEN
+
+
+'''
+Constants -- All constants used by the scramble pools stored here
+'''
+
+MIN_RECORD_SIZE = 8  # bytes per board up to 4x4, whose ranks fit in 45 bits
+
+DEFAULT_MAX_NODES = 2000000  # Boards needing a bigger search are skipped
+
+UNIFORM_FROM = 44  # Bands this hard draw uniform boards instead of walking
+
+BOARDS_PER_TASK = 8  # Boards asked of a worker at a time
+
+ATTEMPTS_PER_BOARD = 200  # A task gives up after this many misses per board
+
+_worker_settings = None  # (heuristic name, node budget)
+_worker_heuristics = {}  # columns -> heuristic, one set per worker process
+
+
+'''
+Classes - The pool of boards on disk
+'''
+
+class ScramblePool:
+    '''
+    Class --- Every stored board of one size, one file per solution
+        length. The record count of each file is read from its size when
+        the pool is opened or refreshed, so draws never scan a file.
+    '''
+
+    def __init__(self, columns, directory = DATABASE_DIR):
+        '''
+        Attributes -- takes in the number (int) of columns and the
+            directory (str) the pool files live in
+        '''
+        self.columns = columns
+        self.number = columns * columns
+        self.directory = directory
+        self.record_size = record_size(self.number)
+        self.counts = {}  # solution length -> boards stored
+        self.refresh()
+
+    def refresh(self):
+        '''
+        Method -- Reads which lengths are stored, and how many boards of
+            each, from the sizes of the pool files. Files that are not
+            named for a length, or whose size shows a part-written record,
+            are left out rather than misread.
+        '''
+        counts = {}
+        prefix = f"scrambles_{self.columns}x{self.columns}_"
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if not (name.startswith(prefix) and name.endswith(".bin")):
+                    continue
+                length = name[len(prefix):-len(".bin")]
+                size = os.path.getsize(os.path.join(self.directory, name))
+                if (length.isdigit() and size > 0 and
+                        size % self.record_size == 0):
+                    counts[int(length)] = size // self.record_size
+        self.counts = counts
+
+    def path(self, length):
+        '''
+        Method -- Returns the path (str) of the file for one solution length
+        '''
+        return os.path.join(self.directory, f"scrambles_{self.columns}x"
+                                            f"{self.columns}_{length:03}.bin")
+
+    def add(self, length, boards):
+        '''
+        Method -- Appends boards to the file for their solution length
+          Parameters -- length (int) of the boards' shortest solutions,
+                        boards -- list of boards (tuples, 0 = blank)
+        '''
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        records = b"".join(state_rank.rank(tiles).to_bytes(self.record_size,
+                                                           "little")
+                           for tiles in boards)
+        with open(self.path(length), mode = "ab") as pool_file:
+            pool_file.write(records)
+        self.counts[length] = self.counts.get(length, 0) + len(boards)
+
+    def draw(self, length, rng = random):
+        '''
+        Method -- Reads one random board of a given solution length
+          Parameters -- length (int), rng -- optional random.Random
+          Returns -- the board (tuple, 0 = blank), or None if no board of
+            that length is stored
+        '''
+        count = self.counts.get(length, 0)
+        if count == 0:
+            return None
+        with open(self.path(length), mode = "rb") as pool_file:
+            pool_file.seek(rng.randrange(count) * self.record_size)
+            index = int.from_bytes(pool_file.read(self.record_size),
+                                   "little")
+        return state_rank.unrank(index, self.number)
+
+    def draw_band(self, low, high, rng = random):
+        '''
+        Method -- Reads one random board whose shortest solution is from
+            low to high moves, every stored board in the band being
+            equally likely. If the band is empty the hardest stored board
+            under it is used instead.
+          Parameters -- low, high (int) bounds of the band,
+                        rng -- optional random.Random
+          Returns -- a tuple of the board (tuple) and its solution length
+            (int), or None if nothing short enough is stored
+        '''
+        lengths = [length for length in self.counts if low <= length <= high]
+        if not lengths:
+            shorter = [length for length in self.counts if length < low]
+            if not shorter:
+                return None
+            lengths = [max(shorter)]
+
+        pick = rng.randrange(sum(self.counts[length] for length in lengths))
+        for length in sorted(lengths):
+            if pick < self.counts[length]:
+                return self.draw(length, rng), length
+            pick -= self.counts[length]
+
+    def __str__(self):
+        '''
+        Method -- Returns a one-line summary (str) of the stored lengths
+        '''
+        if not self.counts:
+            return f"Scrambles {self.columns}x{self.columns}: none stored"
+        return (f"Scrambles {self.columns}x{self.columns}: "
+                f"{sum(self.counts.values())} boards, lengths "
+                f"{min(self.counts)} to {max(self.counts)}")
+
+
+'''
+General Functions - Record sizes and making boards of a given difficulty
+'''
+
+def record_size(number):
+    '''
+    Function -- Works out how many bytes each stored rank takes for a
+            board size: enough for number! - 1, and never under
+            MIN_RECORD_SIZE so existing 4x4 and smaller pools still read
+        Parameters -- number -- the number (int) of cells on the board
+        Returns -- bytes (int) per board
+    '''
+    return max(MIN_RECORD_SIZE,
+               (math.factorial(number).bit_length() + 7) // 8)
+
+
+def random_walk(columns, length, rng):
+    '''
+    Function -- Walks the blank randomly away from the solved board,
+            never stepping straight back to the cell it just left
+        Parameters -- columns (int), length (int) number of moves and
+                      rng (random.Random)
+        Returns -- the board (tuple, 0 = blank)
+    '''
+    neighbours = puzzle_state.neighbour_table(columns)
+    tiles = list(puzzle_state.goal_tiles(columns * columns))
+    blank = len(tiles) - 1
+    previous = None
+    for step in range(length):
+        choices = [cell for cell in neighbours[blank] if cell != previous]
+        cell = rng.choice(choices)
+        tiles[blank] = tiles[cell]
+        tiles[cell] = puzzle_state.BLANK
+        previous, blank = blank, cell
+    return tuple(tiles)
+
+
+def exact_band(columns, low, high, count, seed = None):
+    '''
+    Function -- Lists boards up to 3x3 by their distance in the exact
+            table and picks count of each length at random
+        Parameters -- columns (int), low, high (int) band of solution
+                      lengths, count (int) boards per length and an
+                      optional seed (int)
+        Returns -- a dictionary (dict) of solution length -> boards (list)
+    '''
+    table = distance_table.ExactDistanceHeuristic(columns).table
+    rng = random.Random(seed)
+    number = columns * columns
+
+    found = {}
+    for index in range(len(table)):
+        distance = table[index]
+        if distance != UNSEEN and low <= distance <= high:
+            found.setdefault(distance, []).append(index)
+
+    boards = {}
+    for length, indices in found.items():
+        picked = rng.sample(indices, min(count, len(indices)))
+        boards[length] = [state_rank.unrank(index, number)
+                          for index in picked]
+    return boards
+
+
+def init_worker(heuristic_name, max_nodes):
+    '''
+    Function -- Process pool initializer: remembers the run settings in
+            each worker so they are not pickled with every task
+        Parameters -- heuristic_name (str) and max_nodes (int)
+    '''
+    global _worker_settings
+    _worker_settings = (heuristic_name, max_nodes)
+
+
+def find_scrambles(task):
+    '''
+    Function -- Makes boards in a band inside a worker process. Walk
+            lengths are drawn from high to three times high with high's
+            parity, since a walk's solution is never longer than the walk
+            and has the same parity.
+        Parameters -- task -- a tuple of columns (int), low and high (int)
+            band, how many boards (int) are wanted and a seed (int)
+        Returns -- a list of (board, solution length) tuples, possibly
+            short if too many attempts missed the band
+    '''
+    columns, low, high, count, seed = task
+    heuristic_name, max_nodes = _worker_settings
+    if columns not in _worker_heuristics:
+        _worker_heuristics[columns] = puzzle_solver.make_heuristic(
+            heuristic_name, columns)
+    heuristic = _worker_heuristics[columns]
+    rng = random.Random(seed)
+
+    found = []
+    for attempt in range(count * ATTEMPTS_PER_BOARD):
+        if high >= UNIFORM_FROM:
+            state = state_rank.random_solvable(columns, rng = rng)
+        else:
+            state = random_walk(columns, high + 2 * rng.randrange(high + 1),
+                                rng)
+
+        # A lower bound already past the band rules the board out cheaply,
+        # and the search stops as soon as its bound passes the band
+        if heuristic.estimate(list(state)) > high:
+            continue
+        stop = types.SimpleNamespace(value = 0)
+        solution = puzzle_solver.ida_star(
+            state, columns, heuristic, max_nodes = max_nodes, stop = stop,
+            progress = lambda bound, nodes: setattr(stop, "value",
+                                                    int(bound > high)))
+        if solution.moves is not None and low <= len(solution.moves) <= high:
+            found.append((state, len(solution.moves)))
+            if len(found) == count:
+                break
+    return found
+
+
+def generate_band(columns, low, high, count, workers = None, seed = None,
+                  heuristic_name = puzzle_solver.PATTERN_DATABASE,
+                  max_nodes = DEFAULT_MAX_NODES):
+    '''
+    Function -- Makes count boards of every solution length from low to
+            high. Boards up to 3x3 come straight from the exact tables;
+            bigger boards are searched for across a process pool until
+            every length has enough or stops turning up.
+        Parameters -- columns (int), low, high (int) band, count (int)
+                      boards per length, workers (int, default every core),
+                      seed (int), heuristic_name (str) and max_nodes (int)
+                      node budget per board
+        Returns -- a dictionary (dict) of solution length -> boards (list)
+    '''
+    if columns <= 3:
+        return exact_band(columns, low, high, count, seed)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    rng = random.Random(seed)
+    boards = {length: [] for length in range(low, high + 1)}
+
+    with multiprocessing.Pool(workers, initializer = init_worker,
+                              initargs = (heuristic_name, max_nodes)) as pool:
+        wanted = [length for length in boards if len(boards[length]) < count]
+        while wanted:
+            # Each length still short gets its own tasks, aimed just at it
+            tasks = []
+            for length in wanted:
+                missing = count - len(boards[length])
+                for start in range(0, missing, BOARDS_PER_TASK):
+                    tasks.append((columns, length, length,
+                                  min(BOARDS_PER_TASK, missing - start),
+                                  rng.randrange(2 ** 32)))
+
+            progress = False
+            for found in pool.imap_unordered(find_scrambles, tasks):
+                for state, length in found:
+                    if len(boards[length]) < count:
+                        boards[length].append(state)
+                        progress = True
+            if progress == False:
+                break
+            wanted = [length for length in boards
+                      if len(boards[length]) < count]
+
+    return {length: found for length, found in boards.items() if found}
+
+
+def main(argv = None):
+    '''
+    Function -- Command-line entry point: fills the pool for one band
+        Parameters -- argv -- list (list) of argument strings, defaults
+            to the ones the program was started with
+    '''
+    if argv is None:
+        argv = sys.argv[1:]
+    if len(argv) < 4:
+        print("Usage: python scramble_pool.py COLUMNS LOW HIGH COUNT [WORKERS]")
+        return
+    columns, low, high, count = (int(value) for value in argv[:4])
+    workers = int(argv[4]) if len(argv) > 4 else None
+
+    start_time = time.perf_counter()
+    pool = ScramblePool(columns)
+    boards = generate_band(columns, low, high, count, workers)
+    for length in sorted(boards):
+        pool.add(length, boards[length])
+        print(f"Length {length}: {len(boards[length])} boards")
+    print(f"{pool} ({time.perf_counter() - start_time:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+'''
+Bryan Dumond
+CS 5001 - Fall 2021
+Final Project - 15 Sliding Puzzle Game (Solver Service)
+
+Runs the solver on a background thread so the turtle window keeps
+drawing and taking clicks while a board is solved. The screen polls the
+job with screen.ontimer() and hands over the result on the main thread,
+where it is safe to draw. Jobs can be cancelled at any time: the search
+checks a stop flag every few thousand nodes and gives up.
+'''
+
+import threading, types
+
+import puzzle_solver, reduction_solver
+
+
+'''
+Constants -- All constants used by the solver service stored here
+'''
+
+DEFAULT_POLL_TIME = 50  # milliseconds between checks on a running job
+
+
+'''
+Classes - A single solve and the service that runs them
+'''
+
+class SolverJob:
+    '''
+    Class --- One board being solved on its own thread. The result is
+        read on the main thread once done() is True.
+    '''
+
+    def __init__(self, state, columns, heuristic_name, max_nodes = None):
+        '''
+        Attributes -- takes in the board (tuple of tile numbers, 0 = blank),
+            the number (int) of columns, the heuristic name (str) for
+            puzzle_solver.make_heuristic() and an optional node budget (int)
+        '''
+        self.state = tuple(state)
+        self.columns = columns
+        self.heuristic_name = heuristic_name
+        self.max_nodes = max_nodes
+
+        self.stop = types.SimpleNamespace(value = 0)
+        self.bound = None
+        self.nodes = 0
+        self.result = None  # SolverResult once finished
+        self.error = None  # ValueError if the board cannot be solved
+        self.finished = False
+
+        self.thread = threading.Thread(target = self.run, daemon = True)
+
+    def start(self):
+        '''
+        Method -- Starts solving on the job's own thread
+        '''
+        self.thread.start()
+
+    def run(self):
+        '''
+        Method -- Body of the job's thread: builds the heuristic (and a
+            missing exact distance table, which would stall the screen's
+            thread) and runs IDA*, keeping track of its progress between
+            passes. Boards too
+            wide for an optimal search, and boards whose search runs out of
+            nodes, are solved by reduction instead.
+        '''
+        try:
+            if self.columns > puzzle_solver.MAX_OPTIMAL_COLUMNS:
+                self.result = reduction_solver.solve(self.state, self.columns)
+                return
+            heuristic = puzzle_solver.make_heuristic(self.heuristic_name,
+                                                     self.columns,
+                                                     build = True)
+            self.result = puzzle_solver.ida_star(self.state, self.columns,
+                                                 heuristic,
+                                                 max_nodes = self.max_nodes,
+                                                 stop = self.stop,
+                                                 progress = self.report,
+                                                 tick = self.count)
+            if self.result.moves is None and self.cancelled() == False:
+                self.result = reduction_solver.solve(self.state, self.columns)
+        except ValueError as error:
+            self.error = error
+        finally:
+            self.finished = True
+
+    def report(self, bound, nodes):
+        '''
+        Method -- Progress callback for ida_star(), run on the job's thread
+        '''
+        self.bound = bound
+        self.nodes = nodes
+
+    def count(self, nodes):
+        '''
+        Method -- Node count callback for ida_star(), run on the job's
+            thread every few thousand nodes so nodes stays current
+        '''
+        self.nodes = nodes
+
+    def cancel(self):
+        '''
+        Method -- Asks the search to stop. The thread ends on its own a few
+            thousand nodes later; its result is never used.
+        '''
+        self.stop.value = 1
+
+    def cancelled(self):
+        '''
+        Method -- Returns a boolean (bool) telling whether cancel() was called
+        '''
+        return self.stop.value == 1
+
+    def done(self):
+        '''
+        Method -- Returns a boolean (bool) telling whether the job has
+            finished, with a result or an error
+        '''
+        return self.finished
+
+
+class SolverService:
+    '''
+    Class --- Runs at most one SolverJob at a time for a turtle Screen.
+        Submitting a new job cancels the one before it.
+    '''
+
+    def __init__(self, screen, poll_time = DEFAULT_POLL_TIME):
+        '''
+        Attributes -- takes in the turtle Screen whose timer polls the job
+            and the time (int milliseconds) between polls
+        '''
+        self.screen = screen
+        self.poll_time = poll_time
+        self.job = None
+        self.on_done = None
+        self.on_progress = None
+        self.reported_bound = None  # Bound last passed to on_progress
+        self.polling = False
+
+    def submit(self, state, columns, heuristic_name, max_nodes = None,
+               on_done = None, on_progress = None):
+        '''
+        Method -- Starts solving a board in the background
+          Parameters -- state, columns, heuristic_name and max_nodes as for
+                          SolverJob,
+                        on_done -- function called on the main thread with
+                          the finished SolverJob,
+                        on_progress -- optional function called on the
+                          main thread with the SolverJob each time a poll
+                          finds the search has moved on to a new bound
+          Returns -- the new SolverJob, which can be cancelled directly
+        '''
+        self.cancel()
+        self.job = SolverJob(state, columns, heuristic_name, max_nodes)
+        self.on_done = on_done
+        self.on_progress = on_progress
+        self.reported_bound = None
+        self.job.start()
+
+        if self.polling == False:
+            self.polling = True
+            self.screen.ontimer(self.poll, self.poll_time)
+        return self.job
+
+    def poll(self):
+        '''
+        Callback Function -- Checks the current job on the main thread,
+            passing on a new bound or the finished job, and keeps polling
+            while there is a job running
+        '''
+        job = self.job
+        if job is None:
+            self.polling = False
+            return
+
+        if job.done() == True:
+            on_done = self.on_done
+            self.job = None
+            self.on_done = None
+            self.on_progress = None
+            self.polling = False
+            if on_done is not None:
+                on_done(job)
+            return
+
+        if self.on_progress is not None and job.bound != self.reported_bound:
+            self.reported_bound = job.bound
+            self.on_progress(job)
+        self.screen.ontimer(self.poll, self.poll_time)
+
+    def cancel(self):
+        '''
+        Method -- Cancels the running job, if there is one. Its callbacks
+            will not be called.
+        '''
+        if self.job is not None:
+            self.job.cancel()
+            self.job = None
+            self.on_done = None
+            self.on_progress = None
+
+    def busy(self):
+        '''
+        Method -- Returns a boolean (bool) telling whether a job is running
+        '''
+        return self.job is not None
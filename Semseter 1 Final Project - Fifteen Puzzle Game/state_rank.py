@@ -0,0 +1,166 @@
+'''
+Bryan Dumond
+CS 5001 - Fall 2021
+Final Project - 15 Sliding Puzzle Game (State Ranking)
+
+Numbers every arrangement of a board's tiles. A board of n cells holds a
+permutation of the n values 0 (the blank) to n - 1, and its rank is that
+permutation's position, from 0 to n! - 1, in sorted order (its Lehmer
+code read as a number in the factorial number system). Ranks index flat
+tables such as the exact distance tables of distance_table.py, and make
+compact, stable IDs for boards of any size.
+
+rank() and unrank() are exact inverses: every permutation of 0 to n - 1
+gets a different rank, and unranking it gives back the same board.
+Anything that is not such a permutation is refused with a ValueError
+instead of quietly getting some other board's rank.
+
+Unranking a random integer gives a uniformly random board, which is how
+random_solvable() draws boards. Batch versions for NumPy arrays live in
+batch_simulator.py.
+'''
+
+import random
+
+
+'''
+Constants -- All constants used for ranking stored here
+'''
+
+MAX_CELLS = 100  # Ranks are Python ints, so any board up to 10x10 works
+
+FACTORIALS = [1]
+for i in range(1, MAX_CELLS + 1):
+    FACTORIALS.append(FACTORIALS[-1] * i)
+
+
+'''
+General Functions - Ranking, unranking and sampling
+'''
+
+def rank(tiles):
+    '''
+    Function -- Works out a board's rank. Each cell's Lehmer digit is the
+            number of smaller values in later cells, which is its value
+            minus the smaller values already seen; a bit mask of the seen
+            values counts those in one step, so ranking takes linear time.
+        Parameters -- tiles -- the board (any sequence of the ints 0 to
+            n - 1, each once; NumPy integers are fine)
+        Returns -- the rank (int), from 0 to n! - 1
+        Ex: (0, 1, 2) --> 0, (2, 1, 0) --> 5
+    '''
+    number = len(tiles)
+    index = 0
+    seen = 0
+    for cell in range(number):
+        tile = int(tiles[cell])
+        if tile < 0 or tile >= number or seen >> tile & 1:
+            raise ValueError(f"Not a permutation of 0 to {number - 1}: "
+                             f"{tuple(tiles)}")
+        smaller_seen = (seen & ((1 << tile) - 1)).bit_count()
+        index += (tile - smaller_seen) * FACTORIALS[number - 1 - cell]
+        seen |= 1 << tile
+    return index
+
+
+def unrank(index, number):
+    '''
+    Function -- Rebuilds the board with a given rank
+        Parameters -- index -- the rank (int), from 0 to number! - 1,
+                      number -- the number (int) of cells on the board
+        Returns -- the board (tuple of ints)
+        Ex: unrank(5, 3) --> (2, 1, 0)
+    '''
+    if index < 0 or index >= FACTORIALS[number]:
+        raise ValueError(f"Rank {index} is out of range for {number} cells")
+
+    values = list(range(number))
+    tiles = []
+    for cell in range(number - 1, -1, -1):
+        digit, index = divmod(index, FACTORIALS[cell])
+        tiles.append(values.pop(digit))
+    return tuple(tiles)
+
+
+def rank_many(boards):
+    '''
+    Function -- Ranks a batch of boards
+        Parameters -- boards -- an iterable of boards (sequences of ints)
+        Returns -- a list of ranks (int), in the same order
+    '''
+    return [rank(tiles) for tiles in boards]
+
+
+def unrank_many(indices, number):
+    '''
+    Function -- Rebuilds a batch of boards from their ranks
+        Parameters -- indices -- an iterable of ranks (int),
+                      number -- the number (int) of cells on each board
+        Returns -- a list of boards (tuple of ints), in the same order
+    '''
+    return [unrank(index, number) for index in indices]
+
+
+def is_solvable(tiles, columns):
+    '''
+    Function -- Checks whether a board can be slid back to solved. The
+            inversion count is the sum of the Lehmer digits; the solved
+            board itself has number - 1 inversions (the blank sits last),
+            and every move changes the inversion parity exactly when it
+            changes the parity of the blank's distance from its home cell.
+            This is the one parity check every module uses.
+        Parameters -- tiles -- the board (sequence of ints, 0 = blank;
+                        NumPy integers are fine),
+                      columns -- the number (int) of columns on the board
+        Returns -- boolean (True/False)
+    '''
+    number = len(tiles)
+    inversions = 0
+    seen = 0
+    for tile in tiles:
+        tile = int(tile)
+        inversions += tile - (seen & ((1 << tile) - 1)).bit_count()
+        seen |= 1 << tile
+
+    blank_cell = list(tiles).index(0)
+    home = number - 1
+    distance = (abs(blank_cell // columns - home // columns) +
+                abs(blank_cell % columns - home % columns))
+    return (inversions - (number - 1) - distance) % 2 == 0
+
+
+def random_solvable(columns, seed = None, rng = None):
+    '''
+    Function -- Draws a board uniformly from every solvable board of its
+            size. A random rank is uniform over all n! boards; when it
+            lands on an unsolvable one, two tiles away from the blank are
+            swapped. That swap pairs each unsolvable board with exactly
+            one solvable board, so every solvable board stays equally
+            likely.
+        Parameters -- columns -- the number (int) of columns on the board,
+                      seed -- optional seed (int) for a reproducible draw,
+                      rng -- optional random.Random to draw from instead
+        Returns -- the board (tuple of ints, 0 = blank)
+    '''
+    if rng is None:
+        rng = random.Random(seed)
+    number = columns * columns
+
+    tiles = list(unrank(rng.randrange(FACTORIALS[number]), number))
+    if not is_solvable(tiles, columns):
+        first, second = (0, 1) if tiles.index(0) > 1 else (2, 3)
+        tiles[first], tiles[second] = tiles[second], tiles[first]
+    return tuple(tiles)
+
+
+def random_solvable_many(count, columns, seed = None):
+    '''
+    Function -- Draws a batch of uniformly random solvable boards from one
+            seeded random stream, so the whole batch can be reproduced
+        Parameters -- count -- how many boards (int) to draw,
+                      columns -- the number (int) of columns on each board,
+                      seed -- optional seed (int) for the batch
+        Returns -- a list of boards (tuple of ints)
+    '''
+    rng = random.Random(seed)
+    return [random_solvable(columns, rng = rng) for i in range(count)]
@@ -0,0 +1,44 @@
+'''
+Bryan Dumond
+CS 5001 - Fall 2021
+Final Project - 15 Sliding Puzzle Game (Test Setup)
+
+Shared setup for the headless modules' tests. The game's modules import
+each other by plain name from the game folder, so that folder goes on
+the path. Tables the tests need are built once per run in a temporary
+"Databases" folder, never the real one.
+
+    python -m pytest tests
+'''
+
+import os, sys
+
+import pytest
+
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GAME_DIR)
+
+
+@pytest.fixture(scope = "session")
+def table_home(tmp_path_factory):
+    '''
+    Fixture -- A temporary folder holding "Databases" with the exact 2x2
+        and 3x3 distance tables built
+    '''
+    import distance_table
+
+    home = tmp_path_factory.mktemp("home")
+    for columns in (2, 3):
+        distance_table.ExactDistanceHeuristic(
+            columns, directory = str(home / "Databases"))
+    return home
+
+
+@pytest.fixture
+def in_table_home(table_home, monkeypatch):
+    '''
+    Fixture -- Runs a test from table_home, so code using the default
+        "Databases" folder finds the prebuilt tables there
+    '''
+    monkeypatch.chdir(table_home)
+    return table_home
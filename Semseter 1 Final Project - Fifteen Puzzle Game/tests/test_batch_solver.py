@@ -0,0 +1,53 @@
+'''
+Bryan Dumond
+CS 5001 - Fall 2021
+Final Project - 15 Sliding Puzzle Game (Batch Solver Tests)
+'''
+
+import io, json, random
+
+import pytest
+
+import batch_solver, distance_table, puzzle_solver, state_rank
+
+
+def test_board_lines_are_parsed():
+    assert batch_solver.parse_board("1, 2, 3, 0  # solved 2x2") == (1, 2,
+                                                                   3, 0)
+    assert batch_solver.parse_board("   # just a comment") is None
+    with pytest.raises(ValueError):
+        batch_solver.parse_board("1 2 3")
+    with pytest.raises(ValueError):
+        batch_solver.parse_board("1 1 2 0")
+
+
+def test_results_are_optimal_and_in_order(table_home):
+    table = distance_table.ExactDistanceHeuristic(
+        3, directory = str(table_home / "Databases"), build = False)
+    rng = random.Random(7)
+    boards = [state_rank.random_solvable(3, rng = rng) for i in range(8)]
+    boards.insert(3, (2, 1, 3, 4, 5, 6, 7, 8, 0))
+    boards.insert(5, "'1 2' is not a square board")
+
+    output = io.StringIO()
+    solved = batch_solver.solve_corpus(
+        boards, output, workers = 2,
+        heuristic_name = puzzle_solver.LINEAR_CONFLICT, include_moves = True)
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+
+    assert solved == 8
+    assert [result["index"] for result in results] == list(range(10))
+    assert results[3]["status"] == "unsolvable"
+    assert results[5]["status"] == "invalid"
+    for result, tiles in zip(results, boards):
+        if result["status"] == "solved":
+            assert result["length"] == table.distance(tiles)
+            assert len(result["moves"]) == result["length"]
+
+
+def test_half_written_results_are_cut_off(tmp_path):
+    results = tmp_path / "results.jsonl"
+    results.write_text('{"index": 0}\n{"index": 1}\n{"ind')
+    assert batch_solver.completed_count(str(results)) == 2
+    assert results.read_text() == '{"index": 0}\n{"index": 1}\n'
+    assert batch_solver.completed_count(str(tmp_path / "none.jsonl")) == 0
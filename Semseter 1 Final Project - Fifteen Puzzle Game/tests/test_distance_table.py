@@ -0,0 +1,68 @@
+'''
+Bryan Dumond
+CS 5001 - Fall 2021
+Final Project - 15 Sliding Puzzle Game (Distance Table Tests)
+'''
+
+import random
+
+import pytest
+
+import distance_table, puzzle_solver, puzzle_state, state_rank
+from pattern_database import UNSEEN
+
+
+@pytest.fixture(scope = "module")
+def exact_3x3(table_home):
+    return distance_table.ExactDistanceHeuristic(
+        3, directory = str(table_home / "Databases"), build = False)
+
+
+def test_only_solvable_boards_are_reached(table_home):
+    for columns in (2, 3):
+        table = bytes(distance_table.ExactDistanceHeuristic(
+            columns, directory = str(table_home / "Databases"),
+            build = False).table)
+        reached = sum(1 for distance in table if distance != UNSEEN)
+        assert reached == state_rank.FACTORIALS[columns * columns] // 2
+        assert table[state_rank.rank(puzzle_state.goal_tiles(
+            columns * columns))] == 0
+
+
+def test_hardest_3x3_boards_take_31_moves(exact_3x3):
+    table = bytes(exact_3x3.table)  # Tables load memory-mapped
+    assert max(distance for distance in table if distance != UNSEEN) == 31
+
+
+def test_missing_table_is_not_built_unless_asked(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        distance_table.ExactDistanceHeuristic(3, directory = str(tmp_path),
+                                              build = False)
+
+
+def test_ida_star_matches_the_table(exact_3x3):
+    rng = random.Random(21)
+    heuristic = puzzle_solver.ManhattanLinearConflict(3)
+    for i in range(40):
+        tiles = state_rank.random_solvable(3, rng = rng)
+        result = puzzle_solver.ida_star(tiles, 3, heuristic)
+        assert len(result.moves) == exact_3x3.distance(tiles)
+
+
+def test_table_solutions_are_shortest_and_solve(exact_3x3):
+    rng = random.Random(22)
+    for i in range(40):
+        tiles = state_rank.random_solvable(3, rng = rng)
+        moves = exact_3x3.solution(tiles)
+        assert len(moves) == exact_3x3.distance(tiles)
+
+        board = puzzle_state.PuzzleState(tiles, 3)
+        board.play(moves)
+        assert board.is_solved() == True
+
+
+def test_unsolvable_boards_have_no_solution(exact_3x3):
+    tiles = (2, 1, 3, 4, 5, 6, 7, 8, 0)
+    assert exact_3x3.distance(tiles) == UNSEEN
+    assert exact_3x3.solution(tiles) is None
+    assert exact_3x3.best_move(tiles) is None
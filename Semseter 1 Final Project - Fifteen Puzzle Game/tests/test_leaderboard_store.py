@@ -0,0 +1,70 @@
+'''
+Bryan Dumond
+CS 5001 - Fall 2021
+Final Project - 15 Sliding Puzzle Game (Leaderboard Store Tests)
+'''
+
+import pytest
+
+import leaderboard_store
+
+
+@pytest.fixture
+def store():
+    scores = leaderboard_store.LeaderboardStore(":memory:", None)
+    scores.add_score("Ana", 10, "mario", 50)
+    scores.add_score("Sean", 8, "mario", 100)
+    scores.add_score("Nancy", 5, "luigi", 50)
+    scores.add_score("Old", 3)
+    scores.add_score("Tie", 8, "mario", 100)
+    yield scores
+    scores.close()
+
+
+def test_overall_board_is_lowest_first_ties_in_order(store):
+    assert store.top_scores(10) == [[3, "Old"], [5, "Nancy"], [8, "Sean"],
+                                    [8, "Tie"], [10, "Ana"]]
+    assert store.top_scores(2) == [[3, "Old"], [5, "Nancy"]]
+
+
+def test_unset_filters_match_any_value(store):
+    assert store.top_scores(10, "mario") == [[8, "Sean"], [8, "Tie"],
+                                             [10, "Ana"]]
+    assert store.top_scores(10, "mario", 50) == [[10, "Ana"]]
+    assert store.top_scores(10, move_limit = 50) == [[5, "Nancy"],
+                                                     [10, "Ana"]]
+    assert store.best_score("mario") == 8
+    assert store.best_score("yoshi") is None
+
+
+def test_legacy_file_is_imported_once(tmp_path):
+    legacy = tmp_path / "leaderboard.txt"
+    legacy.write_text("12 : Ana\nnot a score\n7 : Sean\nx : Bad\n")
+    address = str(tmp_path / "leaderboard.db")
+
+    scores = leaderboard_store.LeaderboardStore(address, str(legacy))
+    assert scores.top_scores(5) == [[7, "Sean"], [12, "Ana"]]
+    scores.close()
+
+    scores = leaderboard_store.LeaderboardStore(address, str(legacy))
+    assert scores.count() == 2
+    scores.close()
+
+
+def test_streamed_top_k_matches_a_full_sort(tmp_path):
+    legacy = tmp_path / "leaderboard.txt"
+    entries = [(score * 7 % 23, f"P{index}")
+               for index, score in enumerate(range(60))]
+    lines = [f"{score} : {player}\n" for score, player in entries]
+    lines.insert(10, "corrupt line\n")
+    legacy.write_text("".join(lines))
+
+    best, corrupt = leaderboard_store.read_legacy_top_k(str(legacy), 15)
+    expected = sorted(entries, key = lambda entry: entry[0])[:15]
+    assert best == [[score, player] for score, player in expected]
+    assert corrupt == 1
+
+
+def test_placements_share_equal_scores():
+    board = [[3, "Sean"], [3, "Ana"], [7, "Nancy"], [9, "Old"]]
+    assert leaderboard_store.leaderboard_placements(board) == [1, 1, 2, 3]
@@ -0,0 +1,91 @@
+'''
+Bryan Dumond
+CS 5001 - Fall 2021
+Final Project - 15 Sliding Puzzle Game (Board State Tests)
+'''
+
+import random
+
+import pytest
+
+import puzzle_state, state_rank
+
+
+def random_walk(state, steps, rng):
+    '''
+    Function -- Makes random legal moves on a state
+        Returns -- the undo cells (list) returned by every move, in order
+    '''
+    undo = []
+    for step in range(steps):
+        undo.append(state.move(rng.choice(state.legal_moves())))
+    return undo
+
+
+def count_misplaced(state):
+    return sum(1 for cell, tile in enumerate(state.tiles)
+               if tile != puzzle_state.BLANK and tile != cell + 1)
+
+
+@pytest.mark.parametrize("columns", [2, 3, 4, 5])
+def test_moves_undo_back_to_the_start(columns):
+    rng = random.Random(columns)
+    state = puzzle_state.PuzzleState(
+        puzzle_state.shuffled_state(columns * columns, columns, seed = 1),
+        columns)
+    start = state.copy()
+
+    undo = random_walk(state, 200, rng)
+    for previous in reversed(undo):
+        state.undo(previous)
+    assert state == start
+    assert state.blank == start.blank
+
+
+@pytest.mark.parametrize("columns", [2, 3, 4, 6])
+def test_misplaced_count_stays_right(columns):
+    rng = random.Random(columns)
+    state = puzzle_state.solved_state(columns)
+    assert state.is_solved() == True
+    for step in range(300):
+        state.move(rng.choice(state.legal_moves()))
+        assert state.misplaced == count_misplaced(state)
+        assert state.is_solved() == (state.to_tuple() ==
+                                     puzzle_state.goal_tiles(state.number))
+
+
+def test_pack_and_rank_round_trip():
+    for seed in range(50):
+        tiles = puzzle_state.shuffled_state(16, 4, seed = seed)
+        state = puzzle_state.PuzzleState(tiles, 4)
+        assert puzzle_state.unpack(state.pack(), 4) == state
+        assert puzzle_state.from_rank(state.rank(), 4) == state
+
+
+def test_play_checks_every_move_first():
+    state = puzzle_state.solved_state(3)
+    with pytest.raises(ValueError):
+        state.play("DDD")  # The third move would leave the board
+    assert state.is_solved() == True
+
+    cells = state.play("DR")
+    assert cells == [5, 4]
+    assert state.blank == 4
+
+
+@pytest.mark.parametrize("columns", [2, 3, 4, 7, 10])
+def test_shuffles_are_solvable_and_reproducible(columns):
+    number = columns * columns
+    for seed in range(40):
+        tiles = puzzle_state.shuffled_state(number, columns, seed = seed)
+        assert sorted(tiles) == list(range(number))
+        assert state_rank.is_solvable(tiles, columns) == True
+        assert tiles == puzzle_state.shuffled_state(number, columns,
+                                                    seed = seed)
+
+
+def test_generate_scrambles_matches_one_stream():
+    rng = random.Random(9)
+    expected = [puzzle_state.shuffled_state(16, 4, rng = rng)
+                for i in range(5)]
+    assert list(puzzle_state.generate_scrambles(5, 16, seed = 9)) == expected
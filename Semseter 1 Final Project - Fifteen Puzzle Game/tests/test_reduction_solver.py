@@ -0,0 +1,49 @@
+'''
+Bryan Dumond
+CS 5001 - Fall 2021
+Final Project - 15 Sliding Puzzle Game (Reduction Solver Tests)
+'''
+
+import random
+
+import pytest
+
+import puzzle_state, reduction_solver, state_rank
+
+
+@pytest.mark.parametrize("columns", [2, 3, 4, 5, 6, 8, 10])
+def test_random_boards_are_solved(in_table_home, columns):
+    rng = random.Random(columns)
+    for i in range(15):
+        tiles = state_rank.random_solvable(columns, rng = rng)
+        result = reduction_solver.solve(tiles, columns)
+        assert result.optimal == False
+        assert len(result.moves) >= reduction_solver.lower_bound(tiles,
+                                                                 columns)
+
+        board = puzzle_state.PuzzleState(tiles, columns)
+        board.play(result.moves)  # Raises if any move is not legal
+        assert board.is_solved() == True
+
+
+def test_small_boards_are_finished_optimally(in_table_home):
+    # Up to 3x3 the whole board is the last block, read from the table
+    import distance_table
+    table = distance_table.ExactDistanceHeuristic(3, build = False)
+    rng = random.Random(3)
+    for i in range(20):
+        tiles = state_rank.random_solvable(3, rng = rng)
+        assert len(reduction_solver.solve(tiles, 3).moves) == \
+            table.distance(tiles)
+
+
+def test_solved_board_needs_no_moves(in_table_home):
+    tiles = puzzle_state.goal_tiles(49)
+    assert reduction_solver.solve(tiles, 7).moves == []
+
+
+def test_unsolvable_boards_are_refused():
+    tiles = list(puzzle_state.goal_tiles(25))
+    tiles[0], tiles[1] = tiles[1], tiles[0]
+    with pytest.raises(ValueError):
+        reduction_solver.solve(tuple(tiles), 5)
@@ -0,0 +1,94 @@
+'''
+Bryan Dumond
+CS 5001 - Fall 2021
+Final Project - 15 Sliding Puzzle Game (Replay Log Tests)
+'''
+
+import random
+
+import pytest
+
+import puzzle_state, replay_log
+
+
+def record_game(path, columns, count, interval = 8, close = True):
+    '''
+    Function -- Records a random game and keeps every board along it
+        Returns -- a tuple of the boards (list, the start first) and the
+            move letters (str) made
+    '''
+    rng = random.Random(count)
+    state = puzzle_state.PuzzleState(
+        puzzle_state.shuffled_state(columns * columns, columns, seed = 4),
+        columns)
+    writer = replay_log.ReplayWriter(str(path), "mario.puz", 4, 150,
+                                     state.to_tuple(), columns, interval)
+    boards = [state.to_tuple()]
+    letters = []
+    for i in range(count):
+        blank = state.blank
+        cell = rng.choice(state.legal_moves())
+        step = (cell // columns - blank // columns,
+                cell % columns - blank % columns)
+        letters.append(replay_log.MOVE_CODES[replay_log.CODE_OF_STEP[step]])
+        writer.record(cell)
+        state.move(cell)
+        boards.append(state.to_tuple())
+    if close == True:
+        writer.close()
+    else:
+        # As if the game crashed: no last byte and no move count written
+        writer.replay_file.close()
+    return boards, "".join(letters)
+
+
+@pytest.mark.parametrize("count", [0, 1, 7, 8, 9, 64, 101])
+def test_every_move_reads_back(tmp_path, count):
+    path = tmp_path / "game.replay"
+    boards, letters = record_game(path, 4, count)
+
+    replay = replay_log.ReplayReader(str(path))
+    assert len(replay) == count
+    assert (replay.puz, replay.seed, replay.move_limit) == ("mario.puz", 4,
+                                                            150)
+    assert replay.moves() == letters
+    for move in range(count + 1):
+        assert replay.state_at(move) == boards[move]
+    with pytest.raises(ValueError):
+        replay.state_at(count + 1)
+    replay.close()
+
+
+def test_moves_are_two_bits_each(tmp_path):
+    path = tmp_path / "game.replay"
+    record_game(path, 3, 64, interval = 64)
+    header = replay_log.HEADER.size + len("mario.puz") + 9
+    # One checkpoint of 9 cells, then 64 moves in 16 bytes
+    assert path.stat().st_size == header + 9 + 16
+
+
+def test_unclosed_file_keeps_its_whole_bytes(tmp_path):
+    path = tmp_path / "crashed.replay"
+    boards, letters = record_game(path, 4, 30, close = False)
+
+    replay = replay_log.ReplayReader(str(path))
+    # Only the last 2 moves were still waiting to fill a byte
+    assert len(replay) == 28
+    assert replay.moves() == letters[:28]
+    assert replay.state_at(28) == boards[28]
+    replay.close()
+
+
+def test_other_files_are_refused(tmp_path):
+    path = tmp_path / "not.replay"
+    path.write_bytes(b"GIF89a" + bytes(40))
+    with pytest.raises(ValueError):
+        replay_log.ReplayReader(str(path))
+
+
+def test_replay_paths_do_not_clash(tmp_path):
+    first = replay_log.replay_path("Images/mario.puz", str(tmp_path))
+    open(first, "w").close()
+    second = replay_log.replay_path("Images/mario.puz", str(tmp_path))
+    assert second != first
+    assert second.startswith(str(tmp_path / "mario_"))
@@ -0,0 +1,88 @@
+'''
+Bryan Dumond
+CS 5001 - Fall 2021
+Final Project - 15 Sliding Puzzle Game (State Ranking Tests)
+'''
+
+import collections, itertools, random
+
+import pytest
+
+import state_rank
+
+
+@pytest.mark.parametrize("number", [1, 2, 3, 4, 5, 6])
+def test_every_permutation_gets_its_own_rank(number):
+    permutations = list(itertools.permutations(range(number)))
+    # itertools lists permutations in sorted order, which is rank order
+    assert [state_rank.rank(tiles) for tiles in permutations] == \
+        list(range(len(permutations)))
+    for index, tiles in enumerate(permutations):
+        assert state_rank.unrank(index, number) == tiles
+
+
+@pytest.mark.parametrize("number", [9, 16, 25, 100])
+def test_big_boards_round_trip(number):
+    rng = random.Random(number)
+    for i in range(50):
+        index = rng.randrange(state_rank.FACTORIALS[number])
+        tiles = state_rank.unrank(index, number)
+        assert state_rank.rank(tiles) == index
+
+
+@pytest.mark.parametrize("tiles", [(0, 0, 1), (0, 1, 3), (-1, 0, 1), (1, 2)])
+def test_non_permutations_are_refused(tiles):
+    with pytest.raises(ValueError):
+        state_rank.rank(tiles)
+
+
+def test_ranks_out_of_range_are_refused():
+    with pytest.raises(ValueError):
+        state_rank.unrank(24, 4)
+    with pytest.raises(ValueError):
+        state_rank.unrank(-1, 4)
+
+
+def test_batches_match_single_calls():
+    boards = state_rank.random_solvable_many(20, 4, seed = 3)
+    ranks = state_rank.rank_many(boards)
+    assert ranks == [state_rank.rank(tiles) for tiles in boards]
+    assert state_rank.unrank_many(ranks, 16) == boards
+
+
+def test_solvability_matches_reachable_boards():
+    # Every 2x2 board the blank can reach from solved, and no other
+    reachable = set()
+    tiles = (1, 2, 3, 0)
+    for step in range(12):
+        reachable.add(tiles)
+        # The blank goes round the 2x2 ring: 3 -> 2 -> 0 -> 1 -> 3
+        blank = tiles.index(0)
+        cell = {3: 2, 2: 0, 0: 1, 1: 3}[blank]
+        moved = list(tiles)
+        moved[blank], moved[cell] = moved[cell], 0
+        tiles = tuple(moved)
+    for tiles in itertools.permutations(range(4)):
+        assert state_rank.is_solvable(tiles, 2) == (tiles in reachable)
+
+
+def test_random_solvable_is_uniform():
+    rng = random.Random(5)
+    counts = collections.Counter(state_rank.random_solvable(2, rng = rng)
+                                 for i in range(12000))
+    assert len(counts) == 12
+    assert all(850 < count < 1150 for count in counts.values())
+    assert all(state_rank.is_solvable(tiles, 2) for tiles in counts)
+
+
+def test_numpy_rows_rank_like_tuples():
+    np = pytest.importorskip("numpy")
+    import batch_simulator
+
+    boards = batch_simulator.random_solvable_boards(
+        200, 4, np.random.default_rng(2))
+    ranks = batch_simulator.rank_boards(boards)
+    for row, index in zip(boards, ranks):
+        assert state_rank.rank(row) == index
+        assert state_rank.is_solvable(row, 4) == True
+    assert (batch_simulator.unrank_boards(ranks, 16) == boards).all()
@@ -0,0 +1,147 @@
+'''
+Bryan Dumond
+CS 5001 - Fall 2021
+Final Project - 15 Sliding Puzzle Game (Tile Animator)
+
+Slides tiles to their new cells a little at a time from screen.ontimer()
+callbacks instead of jumping them there, so the event loop is never held
+up and clicks keep coming in while tiles move. Positions come from the
+clock, not a frame count: when frames run late the slide skips ahead
+rather than falling behind. A tile that is told to move again while it
+is still sliding just turns toward its new cell from where it is.
+'''
+
+import time
+
+
+'''
+Constants -- All constants used by the animator stored here
+'''
+
+DEFAULT_FRAME_TIME = 16  # milliseconds between frames, about 60 a second
+
+DEFAULT_SLIDE_TIME = 120  # milliseconds for one slide
+
+
+'''
+Classes - The animation queue
+'''
+
+class TileAnimator:
+    '''
+    Class --- Every slide in progress, keyed by whatever names the thing
+        moving (a Tile's name). One timer drives all of them and stops
+        when the last slide ends.
+    '''
+
+    def __init__(self, screen, renderer, frame_time = DEFAULT_FRAME_TIME,
+                 slide_time = DEFAULT_SLIDE_TIME):
+        '''
+        Attributes -- takes in the turtle Screen, the RenderScheduler the
+            frames are drawn through, and the frame and slide times (int
+            milliseconds)
+        '''
+        self.screen = screen
+        self.renderer = renderer
+        self.frame_time = frame_time
+        self.slide_time = slide_time
+
+        # key -> [turtle, start (x, y), end (x, y), start time (seconds)]
+        self.slides = {}
+        self.running = False
+        self.last_frame = None
+
+        self.frames = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.total_frame_time = 0.0
+        self.worst_frame_time = 0.0
+
+    def slide(self, key, mover, start, end):
+        '''
+        Method -- Queues a slide, or turns one already in progress toward
+            its new end from wherever it has got to
+          Parameters -- key -- hashable name of what is moving,
+                        mover -- the Turtle to move,
+                        start, end -- (x, y) tuples
+        '''
+        now = time.perf_counter()
+        if key in self.slides:
+            start = self.position(self.slides[key], now)[0]
+            self.coalesced += 1
+        self.slides[key] = [mover, start, end, now]
+
+        if self.running == False:
+            self.running = True
+            self.last_frame = now
+            self.screen.ontimer(self.tick, self.frame_time)
+
+    def position(self, slide, now):
+        '''
+        Method -- Works out where a slide is at a given time
+          Parameters -- slide (list) from self.slides, now (float seconds)
+          Returns -- a tuple of the (x, y) position and a boolean (bool)
+            that is True once the slide has reached its end
+        '''
+        mover, start, end, start_time = slide
+        progress = (now - start_time) * 1000 / self.slide_time
+        if progress >= 1:
+            return end, True
+        return (start[0] + (end[0] - start[0]) * progress,
+                start[1] + (end[1] - start[1]) * progress), False
+
+    def tick(self):
+        '''
+        Callback Function -- Draws one frame of every slide, then asks for
+            the next frame if any slide is still going
+        '''
+        now = time.perf_counter()
+        late = (now - self.last_frame) * 1000 / self.frame_time
+        if late >= 2:
+            self.dropped += int(late) - 1
+        self.last_frame = now
+
+        with self.renderer.frame():
+            for key in list(self.slides):
+                slide = self.slides[key]
+                point, finished = self.position(slide, now)
+                slide[0].goto(point)
+                if finished == True:
+                    del self.slides[key]
+
+        frame_time = time.perf_counter() - now
+        self.frames += 1
+        self.total_frame_time += frame_time
+        self.worst_frame_time = max(self.worst_frame_time, frame_time)
+
+        if self.slides:
+            self.screen.ontimer(self.tick, self.frame_time)
+        else:
+            self.running = False
+
+    def stop(self, key):
+        '''
+        Method -- Drops a slide without moving its turtle any further, for
+            when the caller is about to place it somewhere itself
+        '''
+        self.slides.pop(key, None)
+
+    def finish_all(self):
+        '''
+        Method -- Puts every sliding turtle at its end straight away, for
+            when the board is about to be erased or checked for a win
+        '''
+        with self.renderer.frame():
+            for slide in self.slides.values():
+                slide[0].goto(slide[2])
+        self.slides.clear()
+
+    def __str__(self):
+        '''
+        Method -- Returns a one-line summary (str) of the frame times
+        '''
+        mean = self.total_frame_time / self.frames if self.frames else 0.0
+        return (f"Animation: {self.frames} frames, {mean * 1000:.2f} ms mean"
+                f" / {self.worst_frame_time * 1000:.2f} ms worst | "
+                f"{self.dropped} frames dropped, {self.coalesced} slides "
+                f"coalesced")
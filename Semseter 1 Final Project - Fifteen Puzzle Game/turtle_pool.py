@@ -0,0 +1,86 @@
+'''
+Bryan Dumond
+CS 5001 - Fall 2021
+Final Project - 15 Sliding Puzzle Game (Turtle Pool)
+
+Hands out turtles and takes them back for reuse. Every board load used
+to build a fresh Turtle for each tile, the outline and the score text,
+and erasing a board only hid them, so the Tk canvas kept every one of
+them forever. Turtles given back to the pool are cleared, hidden,
+unbound and set back to the plain "classic" shape, then reset and handed
+to the next board, so the number of turtles stays flat no matter how
+many boards are loaded.
+'''
+
+import turtle
+
+
+'''
+Classes - The pool
+'''
+
+class TurtlePool:
+    '''
+    Class --- Every turtle the game draws with. A turtle from get() looks
+        just like a new one, except that it starts hidden; release() gives
+        it back once it is off screen.
+    '''
+
+    def __init__(self, screen):
+        '''
+        Attributes -- takes in the turtle Screen the turtles live on
+        '''
+        self.screen = screen
+        self.free = []
+        self.in_use = 0
+        self.created = 0
+        self.reused = 0
+
+    def get(self):
+        '''
+        Method -- Hands out a turtle, reusing a released one if there is one
+          Returns -- a Turtle at home, hidden, with the default pen and
+            shape; showturtle() it once it has been placed, so it is never
+            seen at home first
+        '''
+        if self.free:
+            pooled = self.free.pop()
+            pooled.reset()
+            self.reused += 1
+        else:
+            pooled = turtle.Turtle(visible = False)
+            self.created += 1
+        self.in_use += 1
+        return pooled
+
+    def release(self, pooled):
+        '''
+        Method -- Takes a turtle back: its drawings are cleared, it is
+            hidden and its click callback is removed. Its shape goes back
+            to "classic" straight away, as the image registry may drop
+            the GIF it showed while it waits, and turtle looks up every
+            turtle's shape, hidden or not, whenever the screen updates.
+          Parameters -- pooled -- a Turtle from get()
+        '''
+        pooled.hideturtle()
+        pooled.clear()
+        pooled.onclick(None)
+        pooled.shape("classic")
+        self.free.append(pooled)
+        self.in_use -= 1
+
+    def forget_all(self):
+        '''
+        Method -- Drops every turtle after screen.clearscreen(), which
+            deletes them all from the canvas
+        '''
+        self.free = []
+        self.in_use = 0
+
+    def __str__(self):
+        '''
+        Method -- Returns a one-line summary (str) of the pool's use
+        '''
+        return (f"Turtles: {self.in_use} in use, {len(self.free)} free | "
+                f"{self.created} created, {self.reused} reused | "
+                f"{len(self.screen.turtles())} on the screen")